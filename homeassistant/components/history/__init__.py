@@ -21,8 +21,14 @@ from homeassistant.helpers.typing import ConfigType
 import homeassistant.util.dt as dt_util
 
 from . import websocket_api
-from .const import DOMAIN
+from .const import (
+    CONF_RECENT_HISTORY_SIZE,
+    DATA_RECENT_HISTORY,
+    DEFAULT_RECENT_HISTORY_SIZE,
+    DOMAIN,
+)
 from .helpers import entities_may_have_state_changes_after, has_states_before
+from .recent import RecentHistory
 
 CONF_ORDER = "use_include_order"
 
@@ -35,7 +41,12 @@ CONFIG_SCHEMA = vol.Schema(
             cv.deprecated(CONF_EXCLUDE),
             cv.deprecated(CONF_ORDER),
             INCLUDE_EXCLUDE_BASE_FILTER_SCHEMA.extend(
-                {vol.Optional(CONF_ORDER, default=False): cv.boolean}
+                {
+                    vol.Optional(CONF_ORDER, default=False): cv.boolean,
+                    vol.Optional(
+                        CONF_RECENT_HISTORY_SIZE, default=DEFAULT_RECENT_HISTORY_SIZE
+                    ): cv.positive_int,
+                }
             ),
         )
     },
@@ -45,6 +56,15 @@ CONFIG_SCHEMA = vol.Schema(
 
 async def async_setup(hass: HomeAssistant, config: ConfigType) -> bool:
     """Set up the history hooks."""
+    conf = config.get(DOMAIN) or {}
+    # Keeping recent states in memory can be turned off with a size of 0
+    if recent_history_size := conf.get(
+        CONF_RECENT_HISTORY_SIZE, DEFAULT_RECENT_HISTORY_SIZE
+    ):
+        recent_history = hass.data[DATA_RECENT_HISTORY] = RecentHistory(
+            hass, recent_history_size * 1024 * 1024
+        )
+        recent_history.async_setup()
     hass.http.register_view(HistoryPeriodView())
     frontend.async_register_built_in_panel(hass, "history", "history", "hass:chart-box")
     websocket_api.async_setup(hass)
@@ -121,7 +141,7 @@ class HistoryPeriodView(HomeAssistantView):
 
         return cast(
             web.Response,
-            await get_instance(hass).async_add_executor_job(
+            await get_instance(hass).async_add_read_executor_job(
                 self._sorted_significant_states_json,
                 hass,
                 start_time,
@@ -1,7 +1,34 @@
 """History integration constants."""
 
+from __future__ import annotations
+
+from datetime import timedelta
+from typing import TYPE_CHECKING
+
+from homeassistant.util.hass_dict import HassKey
+
+if TYPE_CHECKING:
+    from .recent import RecentHistory
+
 DOMAIN = "history"
 
+DATA_RECENT_HISTORY: HassKey[RecentHistory] = HassKey(f"{DOMAIN}_recent_history")
+
 EVENT_COALESCE_TIME = 0.35
 
 MAX_PENDING_HISTORY_STATES = 2048
+
+CONF_RECENT_HISTORY_SIZE = "recent_history_size"
+
+# The number of recent states kept in memory for each entity
+MAX_RECENT_STATES = 1024
+
+# How many MiB the recent states kept in memory may use by default
+DEFAULT_RECENT_HISTORY_SIZE = 32
+
+# How long recent states are kept in memory
+RECENT_STATES_WINDOW = timedelta(hours=24)
+
+# The number of entities whose history is fetched, serialized and sent
+# in one message when streaming history
+STREAM_CHUNK_ENTITIES = 8
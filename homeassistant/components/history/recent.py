@@ -0,0 +1,469 @@
+"""Keep the recent history of entities in memory."""
+
+from __future__ import annotations
+
+from bisect import bisect_left, bisect_right
+from collections import OrderedDict, deque
+from dataclasses import dataclass
+from datetime import datetime as dt, timedelta
+import math
+from operator import itemgetter
+from typing import Any, NamedTuple, cast
+
+from homeassistant.components.recorder import get_instance, history
+from homeassistant.components.recorder.db_schema import StateAttributes
+from homeassistant.const import (
+    COMPRESSED_STATE_ATTRIBUTES,
+    COMPRESSED_STATE_LAST_CHANGED,
+    COMPRESSED_STATE_LAST_UPDATED,
+    COMPRESSED_STATE_STATE,
+    EVENT_CALL_SERVICE,
+    EVENT_STATE_CHANGED,
+)
+from homeassistant.core import (
+    Event,
+    EventStateChangedData,
+    HomeAssistant,
+    callback,
+    split_entity_id,
+)
+import homeassistant.util.dt as dt_util
+from homeassistant.util.json import JSON_ENCODE_EXCEPTIONS, json_loads_object
+
+from .const import MAX_RECENT_STATES, RECENT_STATES_WINDOW
+
+_LAST_UPDATED_TS = itemgetter(0)
+
+# Approximate size of a recent state without its attributes
+_RECENT_STATE_SIZE = 150
+
+
+class RecentState(NamedTuple):
+    """A state as it is recorded in the database."""
+
+    last_updated_ts: float
+    last_changed_ts: float | None
+    state: str | None
+    shared_attrs: bytes
+
+
+@dataclass(slots=True)
+class _EntityRecentStates:
+    """The recent states of an entity.
+
+    Consecutive states with the same attributes share their shared_attrs,
+    which are only counted once in size.
+    """
+
+    states: deque[RecentState]
+    source_attributes: Any = None
+    source_state_info: Any = None
+    shared_attrs: bytes = b"{}"
+    size: int = 0
+
+    def append(self, recent_state: RecentState) -> int:
+        """Add a state and return the number of bytes it added."""
+        states = self.states
+        size = _RECENT_STATE_SIZE
+        if not states or states[-1].shared_attrs is not recent_state.shared_attrs:
+            size += len(recent_state.shared_attrs)
+        states.append(recent_state)
+        self.size += size
+        return size
+
+    def popleft(self) -> int:
+        """Remove the oldest state and return the number of bytes it freed."""
+        states = self.states
+        removed = states.popleft()
+        size = _RECENT_STATE_SIZE
+        if not states or states[0].shared_attrs is not removed.shared_attrs:
+            size += len(removed.shared_attrs)
+        self.size -= size
+        return size
+
+
+@dataclass(slots=True, frozen=True)
+class RecentStates:
+    """A snapshot of the recent states of entities.
+
+    Every state of an entity recorded since its first recent state is
+    included. The snapshot is taken in the event loop and can be read from
+    any thread.
+    """
+
+    states: dict[str, tuple[RecentState, ...]]
+    oldest_ts: float | None
+
+    def for_entities(self, entity_ids: list[str]) -> RecentStates:
+        """Return the snapshot of some of the entities."""
+        return RecentStates(
+            {entity_id: self.states[entity_id] for entity_id in entity_ids},
+            self.oldest_ts,
+        )
+
+
+class RecentHistory:
+    """Keep the recent states of the recorded entities in memory.
+
+    The states are fed from state changed events, filtered and serialized
+    the same way as the recorder records them, so history requests for
+    recent windows can be answered without querying the database.
+
+    The states use at most about max_size bytes. When they would use more,
+    the entities that have not changed for the longest time are forgotten.
+    """
+
+    def __init__(self, hass: HomeAssistant, max_size: int) -> None:
+        """Initialize the recent history."""
+        self._hass = hass
+        self._max_size = max_size
+        self._size = 0
+        self._entities: OrderedDict[str, _EntityRecentStates] = OrderedDict()
+
+    @callback
+    def async_setup(self) -> None:
+        """Start keeping the recent history."""
+        self._hass.bus.async_listen(EVENT_STATE_CHANGED, self._async_state_changed)
+        self._hass.bus.async_listen(
+            EVENT_CALL_SERVICE,
+            self._async_recorder_service_called,
+            self._async_filter_recorder_service,
+        )
+
+    @callback
+    def _async_filter_recorder_service(self, event_data: dict[str, Any]) -> bool:
+        """Filter service calls to the recorder."""
+        return bool(event_data.get("domain") == "recorder")
+
+    @callback
+    def _async_recorder_service_called(self, event: Event) -> None:
+        """Forget the recent history when recorder data may change."""
+        # Purging, enabling or disabling the recorder can change what the
+        # database holds, start over rather than tracking each change
+        self._async_clear()
+
+    @callback
+    def _async_clear(self) -> None:
+        """Forget all recent states."""
+        self._entities.clear()
+        self._size = 0
+
+    @callback
+    def _async_state_changed(self, event: Event[EventStateChangedData]) -> None:
+        """Add a state change to the recent history."""
+        instance = get_instance(self._hass)
+        if not instance.enabled or not instance.recording:
+            # These states are not recorded, so anything kept before
+            # can no longer be trusted to match the database
+            self._async_clear()
+            return
+        entity_id = event.data["entity_id"]
+        if (
+            # The attributes are serialized differently for each database
+            (dialect := instance.dialect_name) is None
+            or EVENT_STATE_CHANGED in instance.exclude_event_types
+            or (
+                instance.entity_filter is not None
+                and not instance.entity_filter(entity_id)
+            )
+        ):
+            return
+        entities = self._entities
+        state = event.data["new_state"]
+        if (entity := entities.get(entity_id)) is None:
+            if state is None:
+                # The recorder only records the removal of entities it
+                # has recorded before, which may not be known here
+                return
+            entity = _EntityRecentStates(deque())
+        if state is None:
+            # A removed entity is recorded without a state
+            recent_state = RecentState(event.time_fired_timestamp, None, None, b"{}")
+        else:
+            if (
+                state.attributes is not entity.source_attributes
+                or state.state_info is not entity.source_state_info
+            ):
+                try:
+                    shared_attrs = StateAttributes.shared_attrs_bytes_from_state(
+                        state, dialect
+                    )
+                except JSON_ENCODE_EXCEPTIONS:
+                    # The recorder does not record the state either
+                    return
+                entity.source_attributes = state.attributes
+                entity.source_state_info = state.state_info
+                # Attributes that are too large are recorded as empty
+                entity.shared_attrs = b"{}" if shared_attrs is None else shared_attrs
+            recent_state = RecentState(
+                state.last_updated_timestamp,
+                None
+                if state.last_changed == state.last_updated
+                else state.last_changed_timestamp,
+                state.state,
+                entity.shared_attrs,
+            )
+        entities[entity_id] = entity
+        entities.move_to_end(entity_id)
+        size = self._size + entity.append(recent_state)
+        states = entity.states
+        # Keep the newest state before the window so the state at the start
+        # of the window is known
+        window_start_ts = (
+            recent_state.last_updated_ts - RECENT_STATES_WINDOW.total_seconds()
+        )
+        while len(states) > MAX_RECENT_STATES or (
+            len(states) > 1 and states[1].last_updated_ts < window_start_ts
+        ):
+            size -= entity.popleft()
+        # The entities changed least recently are forgotten as a whole,
+        # since the states of an entity must be complete from its first one
+        while size > self._max_size and entities:
+            size -= entities.popitem(last=False)[1].size
+        self._size = size
+
+    @callback
+    def async_get_states(self, entity_ids: list[str]) -> RecentStates | None:
+        """Return a snapshot of the recent states of entities.
+
+        Returns None if there are no recent states for one of the entities,
+        or if the database still has the legacy schema, which is queried
+        differently.
+        """
+        instance = get_instance(self._hass)
+        if not instance.states_meta_manager.active:
+            return None
+        states: dict[str, tuple[RecentState, ...]] = {}
+        for entity_id in entity_ids:
+            if (entity := self._entities.get(entity_id)) is None:
+                return None
+            states[entity_id] = tuple(entity.states)
+        return RecentStates(states, instance.states_manager.oldest_ts)
+
+
+def _compressed_states(
+    recent_states: tuple[RecentState, ...],
+    domain: str,
+    start_time_ts: float,
+    end_time_ts: float | None,
+    include_start_time: bool,
+    include_start_time_state: bool,
+    significant_changes_only: bool,
+    minimal_response: bool,
+    no_attributes: bool,
+    ent_results: list[dict[str, Any]],
+) -> None:
+    """Add the compressed states of an entity as the database returns them.
+
+    States are added from after start_time_ts, or from start_time_ts on
+    if include_start_time is set, until before end_time_ts.
+    """
+    first = (bisect_left if include_start_time else bisect_right)(
+        recent_states, start_time_ts, key=_LAST_UPDATED_TS
+    )
+    last = (
+        len(recent_states)
+        if end_time_ts is None
+        else bisect_left(recent_states, end_time_ts, key=_LAST_UPDATED_TS)
+    )
+    states: list[tuple[RecentState, float]] = []
+    if include_start_time_state:
+        # The state at the start time is the last state before it
+        start_index = bisect_left(recent_states, start_time_ts, key=_LAST_UPDATED_TS)
+        if start_index:
+            start_state = recent_states[start_index - 1]
+            states.append((start_state._replace(last_changed_ts=None), start_time_ts))
+    significant_domain = domain in history.SIGNIFICANT_DOMAINS
+    # Consecutive states share their shared_attrs, decode them once
+    decoded: dict[int, dict[str, Any]] = {}
+
+    def _attributes(shared_attrs: bytes) -> dict[str, Any]:
+        if (attributes := decoded.get(id(shared_attrs))) is None:
+            attributes = decoded[id(shared_attrs)] = json_loads_object(shared_attrs)
+        return attributes
+
+    states.extend(
+        (recent_state, recent_state.last_updated_ts)
+        for recent_state in recent_states[first:last]
+        if not significant_changes_only
+        or significant_domain
+        or recent_state.last_changed_ts is None
+    )
+
+    def _compressed_state(
+        recent_state: RecentState, last_updated_ts: float, with_attributes: bool
+    ) -> dict[str, Any]:
+        comp_state: dict[str, Any] = {COMPRESSED_STATE_STATE: recent_state.state}
+        if with_attributes:
+            comp_state[COMPRESSED_STATE_ATTRIBUTES] = (
+                {} if no_attributes else _attributes(recent_state.shared_attrs)
+            )
+        comp_state[COMPRESSED_STATE_LAST_UPDATED] = last_updated_ts
+        if (
+            not significant_changes_only
+            and (last_changed_ts := recent_state.last_changed_ts)
+            and last_changed_ts != last_updated_ts
+        ):
+            comp_state[COMPRESSED_STATE_LAST_CHANGED] = last_changed_ts
+        return comp_state
+
+    if not minimal_response or domain in history.NEED_ATTRIBUTE_DOMAINS:
+        ent_results.extend(
+            _compressed_state(recent_state, last_updated_ts, True)
+            for recent_state, last_updated_ts in states
+        )
+        return
+
+    # With minimal response only the first state is a full state, the ones
+    # after it only have the state and last_updated if the state changed
+    states_iter = iter(states)
+    if ent_results:
+        prev_state = ent_results[-1][COMPRESSED_STATE_STATE]
+    elif first_state := next(states_iter, None):
+        prev_state = first_state[0].state
+        ent_results.append(_compressed_state(*first_state, not no_attributes))
+    else:
+        return
+    ent_results.extend(
+        {
+            COMPRESSED_STATE_STATE: (prev_state := recent_state.state),
+            COMPRESSED_STATE_LAST_UPDATED: last_updated_ts,
+        }
+        for recent_state, last_updated_ts in states_iter
+        if recent_state.state != prev_state
+    )
+
+
+def get_significant_states(
+    hass: HomeAssistant,
+    recent: RecentStates | None,
+    start_time: dt,
+    end_time: dt | None,
+    entity_ids: list[str],
+    include_start_time_state: bool,
+    significant_changes_only: bool,
+    minimal_response: bool,
+    no_attributes: bool,
+) -> dict[str, list[dict[str, Any]]]:
+    """Return significant states in the compressed state format.
+
+    The states are taken from the recent states where they cover the
+    requested period, and only the part of the period before that is
+    fetched from the database.
+    """
+    start_time_ts = start_time.timestamp()
+    end_time_ts = end_time.timestamp() if end_time else None
+    if recent is None or (oldest_ts := recent.oldest_ts) is None:
+        return _get_significant_states_from_database(
+            hass,
+            start_time,
+            end_time,
+            entity_ids,
+            include_start_time_state,
+            significant_changes_only,
+            minimal_response,
+            no_attributes,
+        )
+    if include_start_time_state and oldest_ts >= start_time_ts:
+        # Same as the database, which has no state before its oldest one
+        include_start_time_state = False
+
+    recent_states: dict[str, tuple[RecentState, ...]] = {}
+    # Every state is known from covered_since_ts on
+    covered_since_ts = -math.inf
+    for entity_id, states in recent.states.items():
+        if states[0].last_updated_ts < oldest_ts:
+            # The database has nothing before its oldest state, so the
+            # recent states cover the entity from the start
+            states = states[bisect_left(states, oldest_ts, key=_LAST_UPDATED_TS) :]
+        else:
+            covered_since_ts = max(covered_since_ts, states[0].last_updated_ts)
+        recent_states[entity_id] = states
+
+    if end_time_ts is not None and end_time_ts <= covered_since_ts:
+        return _get_significant_states_from_database(
+            hass,
+            start_time,
+            end_time,
+            entity_ids,
+            include_start_time_state,
+            significant_changes_only,
+            minimal_response,
+            no_attributes,
+        )
+
+    result: dict[str, list[dict[str, Any]]] = {
+        entity_id: [] for entity_id in entity_ids
+    }
+    include_start_time = False
+    if covered_since_ts > start_time_ts or (
+        include_start_time_state and covered_since_ts == start_time_ts
+    ):
+        # Fetch the part of the period before covered_since_ts from the
+        # database and continue it with the recent states. The boundary is
+        # rounded down to what a datetime can hold so no state is fetched
+        # from both.
+        boundary = dt_util.utc_from_timestamp(covered_since_ts)
+        if boundary.timestamp() > covered_since_ts:
+            boundary -= timedelta(microseconds=1)
+        result.update(
+            _get_significant_states_from_database(
+                hass,
+                start_time,
+                boundary,
+                entity_ids,
+                include_start_time_state,
+                significant_changes_only,
+                minimal_response,
+                no_attributes,
+            )
+        )
+        # The recent states continue from the boundary, which is part of
+        # the period unless it is the start time
+        if (boundary_ts := boundary.timestamp()) > start_time_ts:
+            start_time_ts = boundary_ts
+            include_start_time = True
+        include_start_time_state = False
+
+    for entity_id, ent_results in result.items():
+        _compressed_states(
+            recent_states[entity_id],
+            split_entity_id(entity_id)[0],
+            start_time_ts,
+            end_time_ts,
+            include_start_time,
+            include_start_time_state,
+            significant_changes_only,
+            minimal_response,
+            no_attributes,
+            ent_results,
+        )
+    return {entity_id: states for entity_id, states in result.items() if states}
+
+
+def _get_significant_states_from_database(
+    hass: HomeAssistant,
+    start_time: dt,
+    end_time: dt | None,
+    entity_ids: list[str],
+    include_start_time_state: bool,
+    significant_changes_only: bool,
+    minimal_response: bool,
+    no_attributes: bool,
+) -> dict[str, list[dict[str, Any]]]:
+    """Return significant states in the compressed state format from the database."""
+    return cast(
+        dict[str, list[dict[str, Any]]],
+        history.get_significant_states(
+            hass,
+            start_time,
+            end_time,
+            entity_ids,
+            None,
+            include_start_time_state,
+            significant_changes_only,
+            minimal_response,
+            no_attributes,
+            True,
+        ),
+    )
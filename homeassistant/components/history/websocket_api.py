@@ -13,6 +13,7 @@ import voluptuous as vol
 
 from homeassistant.components import websocket_api
 from homeassistant.components.recorder import get_instance, history
+from homeassistant.components.recorder.readers import async_cancel_on_close
 from homeassistant.components.websocket_api import ActiveConnection, messages
 from homeassistant.const import (
     COMPRESSED_STATE_ATTRIBUTES,
@@ -36,9 +37,16 @@ from homeassistant.helpers.event import (
 )
 from homeassistant.helpers.json import json_bytes
 from homeassistant.util.async_ import create_eager_task
+from homeassistant.util.collection import chunked_or_all
 import homeassistant.util.dt as dt_util
 
-from .const import EVENT_COALESCE_TIME, MAX_PENDING_HISTORY_STATES
+from . import recent
+from .const import (
+    DATA_RECENT_HISTORY,
+    EVENT_COALESCE_TIME,
+    MAX_PENDING_HISTORY_STATES,
+    STREAM_CHUNK_ENTITIES,
+)
 from .helpers import entities_may_have_state_changes_after, has_states_before
 
 _LOGGER = logging.getLogger(__name__)
@@ -62,12 +70,23 @@ def async_setup(hass: HomeAssistant) -> None:
     websocket_api.async_register_command(hass, ws_stream)
 
 
+@callback
+def _async_get_recent_states(
+    hass: HomeAssistant, entity_ids: list[str]
+) -> recent.RecentStates | None:
+    """Return a snapshot of the recent states of entities if they are kept."""
+    if (recent_history := hass.data.get(DATA_RECENT_HISTORY)) is None:
+        return None
+    return recent_history.async_get_states(entity_ids)
+
+
 def _ws_get_significant_states(
     hass: HomeAssistant,
     msg_id: int,
+    recent_states: recent.RecentStates | None,
     start_time: dt,
     end_time: dt | None,
-    entity_ids: list[str] | None,
+    entity_ids: list[str],
     include_start_time_state: bool,
     significant_changes_only: bool,
     minimal_response: bool,
@@ -77,17 +96,16 @@ def _ws_get_significant_states(
     return json_bytes(
         messages.result_message(
             msg_id,
-            history.get_significant_states(
+            recent.get_significant_states(
                 hass,
+                recent_states,
                 start_time,
                 end_time,
                 entity_ids,
-                None,
                 include_start_time_state,
                 significant_changes_only,
                 minimal_response,
                 no_attributes,
-                True,
             ),
         )
     )
@@ -159,17 +177,22 @@ async def ws_get_history_during_period(
     minimal_response = msg["minimal_response"]
 
     connection.send_message(
-        await get_instance(hass).async_add_executor_job(
-            _ws_get_significant_states,
-            hass,
+        await async_cancel_on_close(
+            connection,
             msg["id"],
-            start_time,
-            end_time,
-            entity_ids,
-            include_start_time_state,
-            significant_changes_only,
-            minimal_response,
-            no_attributes,
+            get_instance(hass).async_add_read_executor_job(
+                _ws_get_significant_states,
+                hass,
+                msg["id"],
+                _async_get_recent_states(hass, entity_ids),
+                start_time,
+                end_time,
+                entity_ids,
+                include_start_time_state,
+                significant_changes_only,
+                minimal_response,
+                no_attributes,
+            ),
         )
     )
 
@@ -216,9 +239,10 @@ def _generate_websocket_response(
 def _generate_historical_response(
     hass: HomeAssistant,
     msg_id: int,
+    recent_states: recent.RecentStates | None,
     start_time: dt,
     end_time: dt,
-    entity_ids: list[str] | None,
+    entity_ids: list[str],
     include_start_time_state: bool,
     significant_changes_only: bool,
     minimal_response: bool,
@@ -226,20 +250,16 @@ def _generate_historical_response(
     send_empty: bool,
 ) -> tuple[float, dt | None, bytes | None]:
     """Generate a historical response."""
-    states = cast(
-        dict[str, list[dict[str, Any]]],
-        history.get_significant_states(
-            hass,
-            start_time,
-            end_time,
-            entity_ids,
-            None,
-            include_start_time_state,
-            significant_changes_only,
-            minimal_response,
-            no_attributes,
-            True,
-        ),
+    states = recent.get_significant_states(
+        hass,
+        recent_states,
+        start_time,
+        end_time,
+        entity_ids,
+        include_start_time_state,
+        significant_changes_only,
+        minimal_response,
+        no_attributes,
     )
     last_time_ts = 0.0
     for state_list in states.values():
@@ -273,31 +293,55 @@ async def _async_send_historical_states(
     msg_id: int,
     start_time: dt,
     end_time: dt,
-    entity_ids: list[str] | None,
+    entity_ids: list[str],
     include_start_time_state: bool,
     significant_changes_only: bool,
     minimal_response: bool,
     no_attributes: bool,
     send_empty: bool,
 ) -> dt | None:
-    """Fetch history significant_states and send them to the client."""
+    """Fetch history significant_states and send them to the client.
+
+    The history is fetched and sent in chunks of entities so only the states
+    of one chunk are held in memory at a time. The next chunk is not fetched
+    before the previous one has been handed to the connection, and fetching
+    stops when the client unsubscribes.
+    """
     instance = get_instance(hass)
-    last_time_ts, last_time_dt, payload = await instance.async_add_executor_job(
-        _generate_historical_response,
-        hass,
-        msg_id,
-        start_time,
-        end_time,
-        entity_ids,
-        include_start_time_state,
-        significant_changes_only,
-        minimal_response,
-        no_attributes,
-        send_empty,
-    )
-    if payload:
-        connection.send_message(payload)
-    return last_time_dt if last_time_ts != 0 else None
+    recent_states = _async_get_recent_states(hass, entity_ids)
+    chunks: list[list[str]] = list(chunked_or_all(entity_ids, STREAM_CHUNK_ENTITIES))
+    last_time_ts = 0.0
+    last_time_dt: dt | None = None
+    for index, chunk_entity_ids in enumerate(chunks, 1):
+        if index > 1 and msg_id not in connection.subscriptions:
+            break
+        (
+            chunk_last_time_ts,
+            chunk_last_time_dt,
+            payload,
+        ) = await instance.async_add_read_executor_job(
+            _generate_historical_response,
+            hass,
+            msg_id,
+            recent_states
+            if recent_states is None or len(chunks) == 1
+            else recent_states.for_entities(chunk_entity_ids),
+            start_time,
+            end_time,
+            chunk_entity_ids,
+            include_start_time_state,
+            significant_changes_only,
+            minimal_response,
+            no_attributes,
+            # Only send an empty response if no chunk had any states
+            send_empty and index == len(chunks) and last_time_ts == 0,
+        )
+        if payload:
+            connection.send_message(payload)
+        if chunk_last_time_ts > last_time_ts:
+            last_time_ts = chunk_last_time_ts
+            last_time_dt = chunk_last_time_dt
+    return last_time_dt
 
 
 def _history_compressed_state(state: State, no_attributes: bool) -> dict[str, Any]:
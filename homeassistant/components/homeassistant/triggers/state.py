@@ -3,8 +3,11 @@
 from __future__ import annotations
 
 from collections.abc import Callable
+from dataclasses import dataclass
 from datetime import timedelta
+from functools import partial
 import logging
+from typing import Any
 
 import voluptuous as vol
 
@@ -31,6 +34,7 @@ from homeassistant.helpers.event import (
 )
 from homeassistant.helpers.trigger import TriggerActionType, TriggerInfo
 from homeassistant.helpers.typing import ConfigType
+from homeassistant.util.hass_dict import HassKey
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -40,6 +44,8 @@ CONF_TO = "to"
 CONF_NOT_FROM = "not_from"
 CONF_NOT_TO = "not_to"
 
+_STATE_TRIGGER_INDEX: HassKey[_StateTriggerIndex] = HassKey("state_trigger_index")
+
 BASE_SCHEMA = cv.TRIGGER_BASE_SCHEMA.extend(
     {
         vol.Required(CONF_PLATFORM): "state",
@@ -69,6 +75,114 @@ TRIGGER_ATTRIBUTE_SCHEMA = BASE_SCHEMA.extend(
 )
 
 
+@dataclass(slots=True)
+class _StateTriggerMatcher:
+    """Compiled from/to/attribute predicates of a state trigger."""
+
+    attribute: str | None
+    match_from_state: Callable[[str | None], bool]
+    match_to_state: Callable[[str | None], bool]
+    match_all: bool
+    action: Callable[[Event[EventStateChangedData], Any, Any], None]
+
+
+def _state_value(state: State | None, attribute: str | None) -> Any:
+    """Return the state or attribute value a trigger matches on."""
+    if state is None:
+        return None
+    if attribute is None:
+        return state.state
+    return state.attributes.get(attribute)
+
+
+class _StateTriggerIndex:
+    """Index of all state triggers by entity_id.
+
+    A single state change listener is registered per entity_id and the
+    predicates of all triggers of the entity are evaluated in one pass
+    so only the triggers that match are called.
+    """
+
+    __slots__ = ("_hass", "_matchers", "_unsubs")
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize the index."""
+        self._hass = hass
+        self._matchers: dict[str, list[_StateTriggerMatcher]] = {}
+        self._unsubs: dict[str, CALLBACK_TYPE] = {}
+
+    @callback
+    def async_add(
+        self, entity_ids: list[str], matcher: _StateTriggerMatcher
+    ) -> CALLBACK_TYPE:
+        """Add a trigger for entity_ids and return a function to remove it."""
+        entity_ids = [entity_id.lower() for entity_id in entity_ids]
+        for entity_id in entity_ids:
+            if (matchers := self._matchers.get(entity_id)) is not None:
+                matchers.append(matcher)
+                continue
+            self._matchers[entity_id] = [matcher]
+            self._unsubs[entity_id] = async_track_state_change_event(
+                self._hass, entity_id, self._async_state_listener
+            )
+        return partial(self._async_remove, entity_ids, matcher)
+
+    @callback
+    def _async_remove(
+        self, entity_ids: list[str], matcher: _StateTriggerMatcher
+    ) -> None:
+        """Remove a trigger."""
+        for entity_id in entity_ids:
+            matchers = self._matchers[entity_id]
+            matchers.remove(matcher)
+            if not matchers:
+                del self._matchers[entity_id]
+                self._unsubs.pop(entity_id)()
+
+    @callback
+    def _async_state_listener(self, event: Event[EventStateChangedData]) -> None:
+        """Evaluate the triggers of an entity and call the ones that match."""
+        entity_id = event.data["entity_id"]
+        if not (matchers := self._matchers.get(entity_id)):
+            return
+        from_s = event.data["old_state"]
+        to_s = event.data["new_state"]
+        # Most triggers of an entity match on the same attribute (usually
+        # the state) so the values are only looked up once per attribute.
+        values: dict[str | None, tuple[Any, Any]] = {}
+        for matcher in matchers.copy():
+            attribute = matcher.attribute
+            if (attribute_values := values.get(attribute)) is None:
+                attribute_values = values[attribute] = (
+                    _state_value(from_s, attribute),
+                    _state_value(to_s, attribute),
+                )
+            old_value, new_value = attribute_values
+
+            # When we listen for state changes with `match_all`, we
+            # will trigger even if just an attribute changes. When
+            # we listen to just an attribute, we should ignore all
+            # other attribute changes.
+            if attribute is not None and old_value == new_value:
+                continue
+
+            if (
+                not matcher.match_from_state(old_value)
+                or not matcher.match_to_state(new_value)
+                or (not matcher.match_all and old_value == new_value)
+            ):
+                continue
+
+            try:
+                matcher.action(event, old_value, new_value)
+            except Exception:
+                _LOGGER.exception(
+                    "Error while dispatching event for %s to %s",
+                    entity_id,
+                    matcher.action,
+                )
+
+
 async def async_validate_trigger_config(
     hass: HomeAssistant, config: ConfigType
 ) -> ConfigType:
@@ -131,40 +245,14 @@ async def async_attach_trigger(
     _variables = trigger_info["variables"] or {}
 
     @callback
-    def state_automation_listener(event: Event[EventStateChangedData]) -> None:
-        """Listen for state changes and calls action."""
+    def state_automation_action(
+        event: Event[EventStateChangedData], old_value: Any, new_value: Any
+    ) -> None:
+        """Call action for a state change that matched the trigger."""
         entity = event.data["entity_id"]
         from_s = event.data["old_state"]
         to_s = event.data["new_state"]
 
-        if from_s is None:
-            old_value = None
-        elif attribute is None:
-            old_value = from_s.state
-        else:
-            old_value = from_s.attributes.get(attribute)
-
-        if to_s is None:
-            new_value = None
-        elif attribute is None:
-            new_value = to_s.state
-        else:
-            new_value = to_s.attributes.get(attribute)
-
-        # When we listen for state changes with `match_all`, we
-        # will trigger even if just an attribute changes. When
-        # we listen to just an attribute, we should ignore all
-        # other attribute changes.
-        if attribute is not None and old_value == new_value:
-            return
-
-        if (
-            not match_from_state(old_value)
-            or not match_to_state(new_value)
-            or (not match_all and old_value == new_value)
-        ):
-            return
-
         @callback
         def call_action() -> None:
             """Call action with right context."""
@@ -232,7 +320,18 @@ async def async_attach_trigger(
             entity_ids=entity,
         )
 
-    unsub = async_track_state_change_event(hass, entity_ids, state_automation_listener)
+    if (index := hass.data.get(_STATE_TRIGGER_INDEX)) is None:
+        index = hass.data[_STATE_TRIGGER_INDEX] = _StateTriggerIndex(hass)
+    unsub = index.async_add(
+        entity_ids,
+        _StateTriggerMatcher(
+            attribute,
+            match_from_state,
+            match_to_state,
+            match_all,
+            state_automation_action,
+        ),
+    )
 
     @callback
     def async_remove() -> None:
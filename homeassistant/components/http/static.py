@@ -2,14 +2,32 @@
 
 from __future__ import annotations
 
+import asyncio
+from collections import OrderedDict
 from collections.abc import Mapping
+from dataclasses import dataclass
+import gzip
+from http import HTTPStatus
+import os
 from pathlib import Path
+from stat import S_ISREG
 import sys
 from typing import Final
 
-from aiohttp.hdrs import CACHE_CONTROL, CONTENT_TYPE
-from aiohttp.web import FileResponse, Request, StreamResponse
-from aiohttp.web_fileresponse import CONTENT_TYPES, FALLBACK_CONTENT_TYPE
+from aiohttp.hdrs import (
+    ACCEPT_ENCODING,
+    CACHE_CONTROL,
+    CONTENT_ENCODING,
+    CONTENT_TYPE,
+    RANGE,
+    VARY,
+)
+from aiohttp.web import FileResponse, Request, Response, StreamResponse
+from aiohttp.web_fileresponse import (
+    CONTENT_TYPES,
+    ENCODING_EXTENSIONS,
+    FALLBACK_CONTENT_TYPE,
+)
 from aiohttp.web_urldispatcher import StaticResource
 from lru import LRU
 
@@ -18,6 +36,15 @@ CACHE_HEADER = f"public, max-age={CACHE_TIME}"
 CACHE_HEADERS: Mapping[str, str] = {CACHE_CONTROL: CACHE_HEADER}
 RESPONSE_CACHE: LRU[tuple[str, Path], tuple[Path, str]] = LRU(512)
 
+# Files up to this size are served from memory, with their compressed variants
+HOT_CACHE_MAX_FILE_SIZE: Final = 256 * 1024
+HOT_CACHE_MAX_SIZE: Final = 32 * 1024 * 1024
+# Seconds after which a file in memory is checked for changes on disk
+HOT_CACHE_REVALIDATE_INTERVAL: Final = 60
+# Files which are not worth compressing when they have no compressed variant
+_UNCOMPRESSED_TYPES: Final = ("image/", "audio/", "video/", "font/woff")
+_GZIP_LEVEL: Final = 6
+
 if sys.version_info >= (3, 13):
     # guess_type is soft-deprecated in 3.13
     # for paths and should only be used for
@@ -28,6 +55,153 @@ else:
     _GUESSER = CONTENT_TYPES.guess_type
 
 
+@dataclass(slots=True)
+class _HotFile:
+    """A file and its compressed variants in memory."""
+
+    path: Path
+    content_type: str
+    mtime_ns: int
+    file_size: int
+    last_modified: float
+    # The body and ETag of each encoding, the file itself has no encoding
+    variants: dict[str, tuple[bytes, str]]
+    size: int
+    validated: float
+
+
+class HotFileCache:
+    """Size-bounded LRU cache of small static files in memory."""
+
+    def __init__(self, max_size: int) -> None:
+        """Initialize the cache."""
+        self.max_size = max_size
+        self.size = 0
+        self._files: OrderedDict[tuple[str, Path], _HotFile] = OrderedDict()
+        # Files which are not cached, so they are not read again
+        self._skipped: LRU[tuple[str, Path], bool] = LRU(512)
+
+    def get(self, key: tuple[str, Path]) -> _HotFile | None:
+        """Return a file in the cache."""
+        if (hot_file := self._files.get(key)) is not None:
+            self._files.move_to_end(key)
+        return hot_file
+
+    def skipped(self, key: tuple[str, Path]) -> bool:
+        """Return if a file is not cached."""
+        return key in self._skipped
+
+    def add(self, key: tuple[str, Path], hot_file: _HotFile) -> None:
+        """Add a file, evicting the least recently used files."""
+        self.remove(key)
+        self._files[key] = hot_file
+        self.size += hot_file.size
+        while self.size > self.max_size:
+            self.size -= self._files.popitem(last=False)[1].size
+
+    def skip(self, key: tuple[str, Path]) -> None:
+        """Remember a file is not cached."""
+        self._skipped[key] = True
+
+    def remove(self, key: tuple[str, Path]) -> None:
+        """Remove a file from the cache."""
+        if (hot_file := self._files.pop(key, None)) is not None:
+            self.size -= hot_file.size
+
+    def clear(self) -> None:
+        """Remove all files from the cache."""
+        self._files.clear()
+        self._skipped.clear()
+        self.size = 0
+
+
+HOT_CACHE = HotFileCache(HOT_CACHE_MAX_SIZE)
+
+
+def _etag(stat: os.stat_result) -> str:
+    """Return the ETag aiohttp uses for a file."""
+    return f"{stat.st_mtime_ns:x}-{stat.st_size:x}"
+
+
+def _load_hot_file(file_path: Path, content_type: str, now: float) -> _HotFile | None:
+    """Read a file and its compressed variants.
+
+    Returns None if the file is too large or not a regular file. A file of
+    a compressible type without a gzip variant on disk is compressed in memory.
+    """
+    stat = file_path.stat()
+    if not S_ISREG(stat.st_mode) or stat.st_size > HOT_CACHE_MAX_FILE_SIZE:
+        return None
+    etag = _etag(stat)
+    body = file_path.read_bytes()
+    variants = {"": (body, etag)}
+    for extension, encoding in ENCODING_EXTENSIONS.items():
+        compressed_path = file_path.with_suffix(file_path.suffix + extension)
+        try:
+            # Do not follow symlinks like aiohttp does for compressed variants
+            compressed_stat = compressed_path.lstat()
+            if S_ISREG(compressed_stat.st_mode):
+                variants[encoding] = (
+                    compressed_path.read_bytes(),
+                    _etag(compressed_stat),
+                )
+        except OSError:
+            continue
+    if "gzip" not in variants and not content_type.startswith(_UNCOMPRESSED_TYPES):
+        compressed = gzip.compress(body, _GZIP_LEVEL, mtime=0)
+        if len(compressed) < len(body):
+            variants["gzip"] = (compressed, f"{etag}-gzip")
+    return _HotFile(
+        file_path,
+        content_type,
+        stat.st_mtime_ns,
+        stat.st_size,
+        stat.st_mtime,
+        variants,
+        sum(len(variant[0]) for variant in variants.values()),
+        now,
+    )
+
+
+def _hot_file_unchanged(hot_file: _HotFile) -> bool:
+    """Return if a file in memory is unchanged on disk."""
+    try:
+        stat = hot_file.path.stat()
+    except OSError:
+        return False
+    return stat.st_mtime_ns == hot_file.mtime_ns and stat.st_size == hot_file.file_size
+
+
+def _hot_file_response(request: Request, hot_file: _HotFile) -> Response:
+    """Return the response for a file in memory.
+
+    The content encoding is negotiated like aiohttp does for files on disk.
+    """
+    accept_encoding = request.headers.get(ACCEPT_ENCODING, "").lower()
+    encoding = next(
+        (
+            encoding
+            for encoding in ("br", "gzip")
+            if encoding in hot_file.variants and encoding in accept_encoding
+        ),
+        "",
+    )
+    body, etag = hot_file.variants[encoding]
+    headers = {CACHE_CONTROL: CACHE_HEADER, CONTENT_TYPE: hot_file.content_type}
+    if encoding:
+        headers[CONTENT_ENCODING] = encoding
+        headers[VARY] = ACCEPT_ENCODING
+    if (if_none_match := request.if_none_match) is not None and any(
+        match.value in (etag, "*") for match in if_none_match
+    ):
+        response = Response(status=HTTPStatus.NOT_MODIFIED, headers=headers)
+    else:
+        response = Response(body=body, headers=headers)
+    response.etag = etag
+    response.last_modified = hot_file.last_modified
+    return response
+
+
 class CachingStaticResource(StaticResource):
     """Static Resource handler that will add cache headers."""
 
@@ -36,6 +210,17 @@ class CachingStaticResource(StaticResource):
         rel_url = request.match_info["filename"]
         key = (rel_url, self._directory)
         response: StreamResponse
+        # Range requests are rare, they are left to aiohttp
+        use_hot_cache = RANGE not in request.headers
+
+        if use_hot_cache and (hot_file := HOT_CACHE.get(key)) is not None:
+            loop = asyncio.get_running_loop()
+            if loop.time() - hot_file.validated < HOT_CACHE_REVALIDATE_INTERVAL:
+                return _hot_file_response(request, hot_file)
+            if await loop.run_in_executor(None, _hot_file_unchanged, hot_file):
+                hot_file.validated = loop.time()
+                return _hot_file_response(request, hot_file)
+            HOT_CACHE.remove(key)
 
         if key in RESPONSE_CACHE:
             file_path, content_type = RESPONSE_CACHE[key]
@@ -52,5 +237,21 @@ class CachingStaticResource(StaticResource):
             content_type = response.headers[CONTENT_TYPE]
             RESPONSE_CACHE[key] = (file_path, content_type)
 
+        if use_hot_cache and not HOT_CACHE.skipped(key):
+            loop = asyncio.get_running_loop()
+            try:
+                hot_file = await loop.run_in_executor(
+                    None, _load_hot_file, file_path, content_type, loop.time()
+                )
+            except OSError:
+                # Leave reporting the error to the file response
+                hot_file = None
+            else:
+                if hot_file is None:
+                    HOT_CACHE.skip(key)
+            if hot_file is not None:
+                HOT_CACHE.add(key, hot_file)
+                return _hot_file_response(request, hot_file)
+
         response.headers[CACHE_CONTROL] = CACHE_HEADER
         return response
@@ -34,6 +34,7 @@ from homeassistant.loader import bind_hass
 from homeassistant.util.event_type import EventType
 
 from . import rest_api, websocket_api
+from .cache import LogbookCache
 from .const import (  # noqa: F401
     ATTR_MESSAGE,
     DOMAIN,
@@ -136,7 +137,9 @@ async def async_setup(hass: HomeAssistant, config: ConfigType) -> bool:
         EventType[Any] | str,
         tuple[str, Callable[[LazyEventPartialState], dict[str, Any]]],
     ] = {}
-    hass.data[DOMAIN] = LogbookConfig(external_events, filters, entities_filter)
+    cache = LogbookCache(hass)
+    cache.async_setup()
+    hass.data[DOMAIN] = LogbookConfig(external_events, filters, entities_filter, cache)
     websocket_api.async_setup(hass)
     rest_api.async_setup(hass, config, filters, entities_filter)
     hass.services.async_register(DOMAIN, "log", log_message, schema=LOG_MESSAGE_SCHEMA)
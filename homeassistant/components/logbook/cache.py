@@ -0,0 +1,148 @@
+"""Cache humanified logbook events of recently streamed periods."""
+
+from __future__ import annotations
+
+from bisect import bisect_left
+from collections.abc import Hashable
+from dataclasses import dataclass
+from operator import itemgetter
+import threading
+from typing import Any
+
+from lru import LRU
+from sqlalchemy.engine.row import Row
+
+from homeassistant.components.recorder import get_instance
+from homeassistant.const import EVENT_CALL_SERVICE
+from homeassistant.core import Event, HomeAssistant, callback
+from homeassistant.helpers import entity_registry as er
+
+from .const import LOGBOOK_ENTRY_WHEN
+from .models import EventAsRow
+
+# The number of periods cached
+LOGBOOK_CACHE_SIZE = 16
+
+# The maximum number of events and of contexts cached for a period
+MAX_CACHED_EVENTS = 10000
+MAX_CACHED_CONTEXTS = 20000
+
+_WHEN = itemgetter(LOGBOOK_ENTRY_WHEN)
+
+type ContextLookup = dict[bytes | None, Row | EventAsRow | None]
+
+
+@dataclass(slots=True, frozen=True)
+class _CachedEvents:
+    """The humanified events of a period."""
+
+    end_ts: float
+    events: tuple[dict[str, Any], ...]
+    # The context rows seen while humanifying the events, so events after
+    # the period can be augmented as if they were fetched with it
+    contexts: ContextLookup
+    oldest_ts: float | None
+
+
+@dataclass(slots=True, frozen=True)
+class CachedEvents:
+    """The cached events of the start of a period."""
+
+    events: list[dict[str, Any]]
+    contexts: ContextLookup
+    known_until_ts: float
+
+
+class LogbookCache:
+    """Cache the humanified events of recently streamed periods.
+
+    Periods are keyed by the filter of the request and their start, and are
+    only cached once they have been fetched from the database after the
+    recorder has committed every event in them. An entry is never changed
+    once cached, it is replaced or removed under the lock, so it can be
+    read from database reader threads.
+
+    The cache is cleared when recorder data may have been removed or when
+    entities change in ways that affect how their events are humanified.
+    """
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize the cache."""
+        self._hass = hass
+        self._entries: LRU[Hashable, _CachedEvents] = LRU(LOGBOOK_CACHE_SIZE)
+        self._lock = threading.Lock()
+        # Incremented on every clear so periods fetched before it are not cached
+        self.generation = 0
+
+    @callback
+    def async_setup(self) -> None:
+        """Start clearing the cache when it may be stale."""
+        self._hass.bus.async_listen(
+            EVENT_CALL_SERVICE,
+            self._async_clear,
+            self._async_filter_recorder_service,
+        )
+        self._hass.bus.async_listen(er.EVENT_ENTITY_REGISTRY_UPDATED, self._async_clear)
+
+    @callback
+    def _async_filter_recorder_service(self, event_data: dict[str, Any]) -> bool:
+        """Filter service calls to the recorder."""
+        return bool(event_data.get("domain") == "recorder")
+
+    @callback
+    def _async_clear(self, event: Event) -> None:
+        """Clear the cache."""
+        self.async_clear()
+
+    @callback
+    def async_clear(self) -> None:
+        """Clear the cache."""
+        with self._lock:
+            self._entries.clear()
+            self.generation += 1
+
+    def get(self, key: Hashable, start_ts: float, end_ts: float) -> CachedEvents | None:
+        """Return the cached events of a period starting at start_ts.
+
+        The events are known until before end_ts, or until the end of the
+        cached period if it ends before end_ts. Returns None if no period
+        starting at start_ts is cached.
+        """
+        with self._lock:
+            entry = self._entries.get((key, start_ts))
+        if entry is None or (
+            # The oldest state moves when a purge removed recorded data
+            entry.oldest_ts is not None
+            and entry.oldest_ts != get_instance(self._hass).states_manager.oldest_ts
+        ):
+            return None
+        known_until_ts = min(end_ts, entry.end_ts)
+        events = entry.events
+        return CachedEvents(
+            list(events[: bisect_left(events, known_until_ts, key=_WHEN)]),
+            entry.contexts,
+            known_until_ts,
+        )
+
+    @callback
+    def async_set(
+        self,
+        key: Hashable,
+        generation: int,
+        start_ts: float,
+        end_ts: float,
+        events: list[dict[str, Any]],
+        contexts: ContextLookup,
+    ) -> None:
+        """Cache the events of a period fetched since generation."""
+        if len(events) > MAX_CACHED_EVENTS or len(contexts) > MAX_CACHED_CONTEXTS:
+            return
+        entry = _CachedEvents(
+            end_ts,
+            tuple(events),
+            dict(contexts),
+            get_instance(self._hass).states_manager.oldest_ts,
+        )
+        with self._lock:
+            if generation == self.generation:
+                self._entries[(key, start_ts)] = entry
@@ -4,7 +4,8 @@ from __future__ import annotations
 
 from collections.abc import Callable, Generator, Sequence
 from dataclasses import dataclass
-from datetime import datetime as dt
+from datetime import datetime as dt, timedelta
+from itertools import chain
 import logging
 import time
 from typing import TYPE_CHECKING, Any
@@ -34,7 +35,7 @@ from homeassistant.const import (
     EVENT_CALL_SERVICE,
     EVENT_LOGBOOK_ENTRY,
 )
-from homeassistant.core import HomeAssistant, split_entity_id
+from homeassistant.core import HomeAssistant, callback, split_entity_id
 from homeassistant.helpers import entity_registry as er
 import homeassistant.util.dt as dt_util
 from homeassistant.util.event_type import EventType
@@ -135,6 +136,22 @@ class EventProcessor:
             timestamp=timestamp,
         )
         self.context_augmenter = ContextAugmenter(self.logbook_run)
+        # Only events without entity names are cached since the names are
+        # looked up when humanifying and may change. Requests for entities
+        # or devices only fetch the context rows of the events in their
+        # period, so the events after a cached period could not be augmented
+        # with the context rows before it.
+        self._cache = (
+            logbook_config.cache
+            if timestamp
+            and not include_entity_name
+            and not entity_ids
+            and not device_ids
+            else None
+        )
+        self._cache_key = (event_types, context_id)
+        self._cache_generation = self._cache.generation if self._cache else 0
+        self._fetched_events: list[list[dict[str, Any]]] = []
 
     @property
     def limited_select(self) -> bool:
@@ -149,13 +166,81 @@ class EventProcessor:
         self.logbook_run.event_cache.clear()
         self.logbook_run.context_lookup.clear()
         self.logbook_run.memoize_new_contexts = False
+        self._fetched_events.clear()
 
     def get_events(
         self,
         start_day: dt,
         end_day: dt,
     ) -> list[dict[str, Any]]:
-        """Get events for a period of time."""
+        """Get events for a period of time.
+
+        The cached events are used for the start of the period they cover,
+        and only the rest of it is fetched from the database.
+        """
+        if self._cache is None or not (
+            cached := self._cache.get(
+                self._cache_key, start_day.timestamp(), end_day.timestamp()
+            )
+        ):
+            events = self._get_events_from_database(start_day, end_day)
+            self._add_fetched_events(events)
+            return events
+        events = cached.events
+        known_until_ts = cached.known_until_ts
+        if self.logbook_run.memoize_new_contexts:
+            # The first row of each context in the cached period is the one
+            # fetching the whole period would have used to augment the events
+            self.logbook_run.context_lookup.update(cached.contexts)
+        if known_until_ts < end_day.timestamp():
+            # The cached period ends before known_until_ts and the queries
+            # only fetch events after their start, so start before it. The
+            # events known already are skipped after humanifying
+            start_day = dt_util.utc_from_timestamp(known_until_ts)
+            if start_day.timestamp() >= known_until_ts:
+                start_day -= timedelta(microseconds=1)
+            events.extend(
+                event
+                for event in self._get_events_from_database(start_day, end_day)
+                if event[LOGBOOK_ENTRY_WHEN] >= known_until_ts
+            )
+        self._add_fetched_events(events)
+        return events
+
+    def _add_fetched_events(self, events: list[dict[str, Any]]) -> None:
+        """Keep the fetched events until they can be cached."""
+        if self._cache is not None and self.logbook_run.memoize_new_contexts:
+            self._fetched_events.append(events)
+
+    @callback
+    def async_cache_fetched_events(self, start_day: dt, end_day: dt) -> None:
+        """Cache the events fetched for a period.
+
+        The whole period must have been fetched from the database, after the
+        recorder has committed every event in it, and before switching to
+        live events.
+        """
+        if self._cache is None:
+            return
+        self._cache.async_set(
+            self._cache_key,
+            self._cache_generation,
+            start_day.timestamp(),
+            end_day.timestamp(),
+            sorted(
+                chain.from_iterable(self._fetched_events),
+                key=lambda event: event[LOGBOOK_ENTRY_WHEN],
+            ),
+            self.logbook_run.context_lookup,
+        )
+        self._fetched_events.clear()
+
+    def _get_events_from_database(
+        self,
+        start_day: dt,
+        end_day: dt,
+    ) -> list[dict[str, Any]]:
+        """Get events for a period of time from the database."""
         with session_scope(hass=self.hass, read_only=True) as session:
             metadata_ids: list[int] | None = None
             instance = get_instance(self.hass)
@@ -13,6 +13,7 @@ import voluptuous as vol
 
 from homeassistant.components import websocket_api
 from homeassistant.components.recorder import get_instance
+from homeassistant.components.recorder.readers import async_cancel_on_close
 from homeassistant.components.websocket_api import ActiveConnection, messages
 from homeassistant.core import CALLBACK_TYPE, Event, HomeAssistant, callback
 from homeassistant.helpers.event import async_track_point_in_utc_time
@@ -163,7 +164,7 @@ async def _async_get_ws_stream_events(
     partial: bool,
 ) -> tuple[bytes, dt | None]:
     """Async wrapper around _ws_formatted_get_events."""
-    return await get_instance(hass).async_add_executor_job(
+    return await get_instance(hass).async_add_read_executor_job(
         _ws_stream_get_events,
         msg_id,
         start_time,
@@ -424,6 +425,11 @@ async def ws_event_stream(
         event_processor,
         partial=False,
     )
+    # Every event until the subscriptions were set up has been committed
+    # and fetched now
+    event_processor.async_cache_fetched_events(
+        start_time, subscriptions_setup_complete_time
+    )
     event_processor.switch_to_live()
 
 
@@ -501,11 +507,15 @@ async def ws_get_events(
     )
 
     connection.send_message(
-        await get_instance(hass).async_add_executor_job(
-            _ws_formatted_get_events,
+        await async_cancel_on_close(
+            connection,
             msg["id"],
-            start_time,
-            end_time,
-            event_processor,
+            get_instance(hass).async_add_read_executor_job(
+                _ws_formatted_get_events,
+                msg["id"],
+                start_time,
+                end_time,
+                event_processor,
+            ),
         )
     )
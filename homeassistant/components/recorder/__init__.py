@@ -46,6 +46,7 @@ from .const import (  # noqa: F401
 )
 from .core import Recorder
 from .services import async_register_services
+from .spool import SPOOL_DIR
 from .tasks import AddRecorderPlatformTask
 from .util import get_instance
 
@@ -68,6 +69,8 @@ CONF_PURGE_KEEP_DAYS = "purge_keep_days"
 CONF_PURGE_INTERVAL = "purge_interval"
 CONF_EVENT_TYPES = "event_types"
 CONF_COMMIT_INTERVAL = "commit_interval"
+CONF_SPOOL_BACKLOG = "spool_backlog"
+CONF_ARCHIVE_STATISTICS_DAYS = "archive_statistics_days"
 
 
 EXCLUDE_SCHEMA = INCLUDE_EXCLUDE_FILTER_SCHEMA_INNER.extend(
@@ -120,6 +123,10 @@ CONFIG_SCHEMA = vol.Schema(
                     vol.Optional(
                         CONF_DB_INTEGRITY_CHECK, default=DEFAULT_DB_INTEGRITY_CHECK
                     ): cv.boolean,
+                    vol.Optional(CONF_SPOOL_BACKLOG, default=False): cv.boolean,
+                    vol.Optional(CONF_ARCHIVE_STATISTICS_DAYS): vol.All(
+                        vol.Coerce(int), vol.Range(min=1)
+                    ),
                 }
             ),
         )
@@ -170,6 +177,8 @@ async def async_setup(hass: HomeAssistant, config: ConfigType) -> bool:
         db_retry_wait=db_retry_wait,
         entity_filter=entity_filter,
         exclude_event_types=exclude_event_types,
+        spool_path=hass.config.path(SPOOL_DIR) if conf[CONF_SPOOL_BACKLOG] else None,
+        archive_statistics_days=conf.get(CONF_ARCHIVE_STATISTICS_DAYS),
     )
     get_instance.cache_clear()
     instance.async_initialize()
@@ -0,0 +1,125 @@
+"""Adapt how often the recorder commits to its load."""
+
+from __future__ import annotations
+
+import logging
+from typing import Any
+
+_LOGGER = logging.getLogger(__name__)
+
+# The interval never goes below MIN_COMMIT_INTERVAL or above
+# MAX_COMMIT_INTERVAL seconds unless the configured commit interval does
+MIN_COMMIT_INTERVAL = 1.0
+MAX_COMMIT_INTERVAL = 30.0
+
+# Transactions with at most IDLE_COMMIT_WRITES events are considered idle
+IDLE_COMMIT_WRITES = 10
+
+# A transaction is committed right away once it holds MAX_COMMIT_WRITES events
+MAX_COMMIT_WRITES = 5000
+
+# Commits are made as soon as possible once the backlog reaches BUSY_BACKLOG
+BUSY_BACKLOG = 1000
+
+# A commit is slow if it takes more than this share of the commit interval
+SLOW_COMMIT_RATIO = 0.25
+
+
+class CommitScheduler:
+    """Decide when the recorder commits its event session.
+
+    The configured commit interval is used unless the recorder is idle,
+    busy or competing with database readers:
+
+    - After idle or slow commits the interval is doubled so fewer, larger
+      transactions are written, up to the maximum interval.
+    - While the backlog is large the interval drops to the minimum, and
+      transactions are committed once they reach MAX_COMMIT_WRITES events
+      no matter the interval, so they stay bounded.
+    - While database readers are running the interval does not grow past
+      the configured one so writes do not hold locks for longer.
+
+    A commit is queued at least once every maximum interval while there
+    are events to commit.
+    """
+
+    def __init__(self, commit_interval: float) -> None:
+        """Initialize the scheduler."""
+        self.commit_interval = commit_interval
+        self.min_interval = min(commit_interval, MIN_COMMIT_INTERVAL)
+        self.max_interval = max(commit_interval, MAX_COMMIT_INTERVAL)
+        self.interval = float(commit_interval)
+        self.reason = "configured"
+        self.pending_writes = 0
+        self.commits = 0
+        self.last_commit_writes = 0
+        self.last_commit_duration = 0.0
+        self._last_commit = 0.0
+        self._last_queued = 0.0
+
+    def async_commit_due(self, now: float, readers: int) -> bool:
+        """Return if a commit should be queued at the monotonic time now.
+
+        Readers may have started since the last commit, so the interval is
+        brought back to the configured one before it is checked.
+        """
+        if readers and self.interval > self.commit_interval:
+            self._set_interval(self.commit_interval, "readers")
+        return now - max(self._last_commit, self._last_queued) >= self.interval
+
+    def async_commit_queued(self, now: float) -> None:
+        """Record that a commit was queued at the monotonic time now."""
+        self._last_queued = now
+
+    def committed(
+        self, started: float, ended: float, backlog: int, readers: int
+    ) -> None:
+        """Adapt the interval after a commit.
+
+        Called from the recorder thread with the monotonic times the commit
+        started and ended, the recorder backlog and the number of running
+        database readers.
+        """
+        writes = self.pending_writes
+        duration = ended - started
+        self.pending_writes = 0
+        self.commits += 1
+        self.last_commit_writes = writes
+        self.last_commit_duration = duration
+        self._last_commit = ended
+        if not self.commit_interval:
+            # Every event is committed on its own
+            return
+        if backlog >= BUSY_BACKLOG:
+            interval, reason = self.min_interval, "backlog"
+        elif readers:
+            interval, reason = min(self.interval, self.commit_interval), "readers"
+        elif duration >= self.interval * SLOW_COMMIT_RATIO:
+            interval, reason = min(self.interval * 2, self.max_interval), "slow_commit"
+        elif writes <= IDLE_COMMIT_WRITES:
+            interval, reason = min(self.interval * 2, self.max_interval), "idle"
+        else:
+            interval, reason = self.commit_interval, "configured"
+        self._set_interval(interval, reason)
+
+    def _set_interval(self, interval: float, reason: str) -> None:
+        """Set the interval and the reason it was chosen."""
+        if interval != self.interval:
+            _LOGGER.debug(
+                "Commit interval changed from %ss to %ss (%s)",
+                self.interval,
+                interval,
+                reason,
+            )
+        self.interval = interval
+        self.reason = reason
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the decisions of the scheduler."""
+        return {
+            "commit_interval": self.interval,
+            "commit_interval_reason": self.reason,
+            "max_commit_interval": self.max_interval,
+            "last_commit_events": self.last_commit_writes,
+            "last_commit_duration": round(self.last_commit_duration, 3),
+        }
@@ -3,7 +3,7 @@
 from __future__ import annotations
 
 import asyncio
-from collections.abc import Callable, Iterable
+from collections.abc import Callable, Iterable, Sequence
 from concurrent.futures import CancelledError
 import contextlib
 from datetime import datetime, timedelta
@@ -49,7 +49,8 @@ import homeassistant.util.dt as dt_util
 from homeassistant.util.enum import try_parse_enum
 from homeassistant.util.event_type import EventType
 
-from . import migration, statistics
+from . import migration, statistics, statistics_archive
+from .commit import MAX_COMMIT_WRITES, CommitScheduler
 from .const import (
     DB_WORKER_PREFIX,
     DOMAIN,
@@ -80,6 +81,8 @@ from .db_schema import (
 from .executor import DBInterruptibleThreadPoolExecutor
 from .models import DatabaseEngine, StatisticData, StatisticMetaData, UnsupportedDialect
 from .pool import POOL_SIZE, MutexPool, RecorderPool
+from .readers import READ_POOL_SIZE, DatabaseReaders
+from .spool import RecorderSpool
 from .table_managers.event_data import EventDataManager
 from .table_managers.event_types import EventTypeManager
 from .table_managers.recorder_runs import RecorderRunsManager
@@ -90,11 +93,13 @@ from .table_managers.statistics_meta import StatisticsMetaManager
 from .tasks import (
     AdjustLRUSizeTask,
     AdjustStatisticsTask,
+    ArchiveStatisticsTask,
     ChangeStatisticsUnitTask,
     ClearStatisticsTask,
     CommitTask,
     CompileMissingStatisticsTask,
     DatabaseLockTask,
+    DrainSpoolTask,
     ImportStatisticsTask,
     KeepAliveTask,
     PerodicCleanupTask,
@@ -140,6 +145,13 @@ DB_LOCK_QUEUE_CHECK_TIMEOUT = 10  # check every 10 seconds
 
 QUEUE_CHECK_INTERVAL = timedelta(minutes=5)
 
+# While spooling, events are written to disk in segments of at most
+# SPOOL_SEGMENT_EVENTS events, at least every SPOOL_FLUSH_INTERVAL
+SPOOL_FLUSH_INTERVAL = timedelta(seconds=5)
+SPOOL_SEGMENT_EVENTS = 10000
+# The spool is drained once the in memory backlog is below this size
+SPOOL_DRAIN_MAX_BACKLOG = 1000
+
 INVALIDATED_ERR = "Database connection invalidated"
 CONNECTIVITY_ERR = "Error in database connectivity during commit"
 
@@ -164,6 +176,8 @@ class Recorder(threading.Thread):
         db_retry_wait: int,
         entity_filter: Callable[[str], bool] | None,
         exclude_event_types: set[EventType[Any] | str],
+        spool_path: str | None = None,
+        archive_statistics_days: int | None = None,
     ) -> None:
         """Initialize the recorder."""
         threading.Thread.__init__(self, name="Recorder")
@@ -174,9 +188,11 @@ class Recorder(threading.Thread):
         self.auto_purge = auto_purge
         self.auto_repack = auto_repack
         self.keep_days = keep_days
+        self.archive_statistics_days = archive_statistics_days
         self.is_running: bool = False
         self._hass_started: asyncio.Future[object] = hass.loop.create_future()
         self.commit_interval = commit_interval
+        self.commit_scheduler = CommitScheduler(commit_interval)
         self._queue: queue.SimpleQueue[RecorderTask | Event] = queue.SimpleQueue()
         self.db_url = uri
         self.db_max_retries = db_max_retries
@@ -194,6 +210,18 @@ class Recorder(threading.Thread):
         self.max_backlog: int = MAX_QUEUE_BACKLOG_MIN_VALUE
         self._psutil: ha_psutil.PsutilWrapper | None = None
 
+        # Events are spooled to disk instead of queued in memory when the
+        # backlog grows too large, if a spool path is configured
+        self._spool = RecorderSpool(spool_path) if spool_path else None
+        self._spool_events: list[Event] = []
+        # Tasks that must follow the events fired before them are held back
+        # while spooling, since those events may still be on disk
+        self._spool_tasks: list[RecorderTask] = []
+        self._spool_listener: CALLBACK_TYPE | None = None
+        self._spool_writing = False
+        self._spool_draining = False
+        self._spool_failed = False
+
         # The entity_filter is exposed on the recorder instance so that
         # it can be used to see if an entity is being recorded and is called
         # by is_entity_recorder and the sensor recorder.
@@ -220,6 +248,8 @@ class Recorder(threading.Thread):
         self.use_legacy_events_index = False
         self._database_lock_task: DatabaseLockTask | None = None
         self._db_executor: DBInterruptibleThreadPoolExecutor | None = None
+        self._running_read_jobs = 0
+        self._readers: DatabaseReaders | None = None
 
         self._event_listener: CALLBACK_TYPE | None = None
         self._queue_watcher: CALLBACK_TYPE | None = None
@@ -228,6 +258,7 @@ class Recorder(threading.Thread):
         self._periodic_listener: CALLBACK_TYPE | None = None
         self._nightly_listener: CALLBACK_TYPE | None = None
         self._dialect_name: SupportedDialect | None = None
+        self._bulk_insert_states = False
         self.enabled = True
 
         # For safety we default to the lowest value for max_bind_vars
@@ -263,6 +294,10 @@ class Recorder(threading.Thread):
         """Get a new sqlalchemy session."""
         if self._get_session is None:
             raise RuntimeError("The database connection has not been established")
+        if (
+            readers := self._readers
+        ) is not None and threading.get_ident() in readers.thread_ids:
+            return readers.get_session()
         return self._get_session()
 
     def queue_task(self, task: RecorderTask | Event) -> None:
@@ -291,9 +326,19 @@ class Recorder(threading.Thread):
     @callback
     def async_initialize(self) -> None:
         """Initialize the recorder."""
+        self._async_listen_events(self._queue.put_nowait)
+        self._queue_watcher = async_track_time_interval(
+            self.hass,
+            self._async_check_queue,
+            QUEUE_CHECK_INTERVAL,
+            name="Recorder queue watcher",
+        )
+
+    @callback
+    def _async_listen_events(self, queue_put: Callable[[Event], None]) -> None:
+        """Listen for events to record and pass them to queue_put."""
         entity_filter = self.entity_filter
         exclude_event_types = self.exclude_event_types
-        queue_put = self._queue.put_nowait
 
         @callback
         def _event_listener(event: Event) -> None:
@@ -326,12 +371,6 @@ class Recorder(threading.Thread):
             MATCH_ALL,
             _event_listener,
         )
-        self._queue_watcher = async_track_time_interval(
-            self.hass,
-            self._async_check_queue,
-            QUEUE_CHECK_INTERVAL,
-            name="Recorder queue watcher",
-        )
 
     @callback
     def _async_keep_alive(self, now: datetime) -> None:
@@ -340,14 +379,26 @@ class Recorder(threading.Thread):
             self.queue_task(KEEP_ALIVE_TASK)
 
     @callback
-    def _async_commit(self, now: datetime) -> None:
-        """Queue a commit."""
+    def _async_commit(self, now: datetime) -> bool:
+        """Queue a commit and return if it was queued."""
         if (
             self._event_listener
             and not self._database_lock_task
             and self._event_session_has_pending_writes
         ):
             self.queue_task(COMMIT_TASK)
+            return True
+        return False
+
+    @callback
+    def _async_commit_if_due(self, now: datetime) -> None:
+        """Queue a commit if the commit interval has passed."""
+        scheduler = self.commit_scheduler
+        monotonic_now = time.monotonic()
+        if scheduler.async_commit_due(
+            monotonic_now, self._running_read_jobs
+        ) and self._async_commit(now):
+            scheduler.async_commit_queued(monotonic_now)
 
     @callback
     def async_add_executor_job[_T](
@@ -356,6 +407,30 @@ class Recorder(threading.Thread):
         """Add an executor job from within the event loop."""
         return self.hass.loop.run_in_executor(self._db_executor, target, *args)
 
+    @callback
+    def async_add_read_executor_job[_T](
+        self, target: Callable[..., _T], *args: Any
+    ) -> asyncio.Future[_T]:
+        """Add a read-only executor job from within the event loop.
+
+        The job runs on the read-only connections if the database has them,
+        and cancelling it stops its query. Otherwise it runs in the database
+        executor.
+        """
+        if (readers := self._readers) is None:
+            future = self.async_add_executor_job(target, *args)
+        else:
+            future = readers.async_add_executor_job(self.hass, target, *args)
+        # The running read jobs are the readers commits compete with
+        self._running_read_jobs += 1
+        future.add_done_callback(self._async_executor_job_done)
+        return future
+
+    @callback
+    def _async_executor_job_done(self, future: asyncio.Future[Any]) -> None:
+        """Count a read executor job as done."""
+        self._running_read_jobs -= 1
+
     @callback
     def _async_check_queue(self, *_: Any) -> None:
         """Periodic check of the queue size to ensure we do not exhaust memory.
@@ -363,6 +438,16 @@ class Recorder(threading.Thread):
         The queue grows during migration or if something really goes wrong.
         """
         _LOGGER.debug("Recorder queue size is: %s", self.backlog)
+        if (
+            self._spool is not None
+            and not self._spool_failed
+            and self._spool_listener is None
+            and self.backlog >= MAX_QUEUE_BACKLOG_MIN_VALUE
+        ):
+            self._async_start_spooling()
+        # Events are still held in memory until the spool is written
+        # and the in memory queue only drains as fast as the database,
+        # so the memory guard is kept while spooling
         if not self._reached_max_backlog():
             return
         _LOGGER.error(
@@ -376,6 +461,141 @@ class Recorder(threading.Thread):
         )
         self._async_stop_queue_watcher_and_event_listener()
 
+    @callback
+    def _async_start_spooling(self) -> None:
+        """Spool new events to disk until the database has caught up."""
+        if not self._event_listener:
+            return
+        _LOGGER.warning(
+            "The recorder backlog queue reached %s events; new events will be "
+            "spooled to disk until the database has caught up",
+            self.backlog,
+        )
+        self._event_listener()
+        self._async_listen_events(self._async_spool_event)
+        self._spool_listener = async_track_time_interval(
+            self.hass,
+            self._async_flush_spool,
+            SPOOL_FLUSH_INTERVAL,
+            name="Recorder spool flush",
+        )
+
+    @callback
+    def _async_spool_event(self, event: Event) -> None:
+        """Add an event to the spool."""
+        self._spool_events.append(event)
+        if len(self._spool_events) >= SPOOL_SEGMENT_EVENTS:
+            self._async_flush_spool()
+
+    @callback
+    def _async_queue_task_after_events(self, task: RecorderTask) -> None:
+        """Queue a task after the events fired before it have been recorded."""
+        if self._spool_listener is not None:
+            self._spool_tasks.append(task)
+            return
+        self.queue_task(task)
+
+    @callback
+    def _async_flush_spool(self, *_: Any) -> None:
+        """Write the spooled events to disk and drain the spool if possible."""
+        assert self._spool is not None
+        if self._spool_events and not self._spool_writing and not self._spool_failed:
+            self._spool_writing = True
+            events = self._spool_events
+            self._spool_events = []
+            self.hass.async_create_background_task(
+                self._async_write_spool(events),
+                "Recorder spool write",
+                eager_start=True,
+            )
+            return
+        if self._spool_writing or self._spool_draining:
+            return
+        if self._spool.has_segments:
+            # Only drain once the in memory queue has been processed
+            if self.backlog < SPOOL_DRAIN_MAX_BACKLOG:
+                self._spool_draining = True
+                self.queue_task(DrainSpoolTask())
+            return
+        self._async_stop_spooling()
+
+    async def _async_write_spool(self, events: list[Event]) -> None:
+        """Write events to the spool."""
+        assert self._spool is not None
+        try:
+            await self.hass.async_add_executor_job(self._spool.write_segment, events)
+        except OSError:
+            _LOGGER.exception(
+                "Error writing %s events to the spool; new events will be "
+                "queued in memory again",
+                len(events),
+            )
+            self._async_spool_failed(events)
+        finally:
+            self._spool_writing = False
+        if self._spool_listener is not None:
+            self._async_flush_spool()
+
+    @callback
+    def _async_spool_failed(self, events: list[Event]) -> None:
+        """Keep events in memory after the spool could not be written.
+
+        The events are queued once the segments already written have been
+        drained, so they are still recorded in order. Spooling is not started
+        again so the memory guard of the queue watcher applies.
+        """
+        self._spool_failed = True
+        events.extend(self._spool_events)
+        self._spool_events = events
+
+    @callback
+    def _async_spool_drained(self) -> None:
+        """Continue draining the spool after a segment has been recorded."""
+        self._spool_draining = False
+        if self._spool_listener is not None:
+            self._async_flush_spool()
+
+    @callback
+    def _async_stop_spooling(self) -> None:
+        """Stop spooling and queue new events in memory again."""
+        if self._spool_listener is None:
+            return
+        _LOGGER.info("The recorder has caught up with the spooled events")
+        self._spool_listener()
+        self._spool_listener = None
+        # The events kept in memory after the spool could not be written
+        # and the tasks held back follow the drained segments
+        for event in self._spool_events:
+            self._queue.put_nowait(event)
+        self._spool_events = []
+        for task in self._spool_tasks:
+            self.queue_task(task)
+        self._spool_tasks = []
+        if self._event_listener:
+            self._event_listener()
+            self._async_listen_events(self._queue.put_nowait)
+
+    def _drain_spool(self, all_segments: bool) -> None:
+        """Record the events of the oldest spooled segment, or of all segments."""
+        assert self._spool is not None
+        scheduler = self.commit_scheduler
+        while (segment_events := self._spool.read_segment()) is not None:
+            segment, events = segment_events
+            self._pre_process_startup_events([event for _, event in events])
+            commits = scheduler.commits
+            for count, event in events:
+                self._process_one_event(event)
+                if scheduler.commits != commits:
+                    # Committed while draining the segment, do not record
+                    # the committed events again if draining is interrupted
+                    commits = scheduler.commits
+                    self._spool.mark_committed(segment, count)
+            # The events are only removed from disk once they are committed
+            self._commit_event_session_or_retry()
+            self._spool.remove_segment(segment)
+            if not all_segments:
+                break
+
     def _available_memory(self) -> int:
         """Return the available memory in bytes."""
         if not self._psutil:
@@ -385,7 +605,7 @@ class Recorder(threading.Thread):
     def _reached_max_backlog(self) -> bool:
         """Check if the system has reached the max queue backlog and return True if it has."""
         # First check the minimum value since its cheap
-        if self.backlog < MAX_QUEUE_BACKLOG_MIN_VALUE:
+        if self.backlog + len(self._spool_events) < MAX_QUEUE_BACKLOG_MIN_VALUE:
             return False
         # If they have more RAM available, keep filling the backlog
         # since we do not want to stop recording events or give the
@@ -415,6 +635,9 @@ class Recorder(threading.Thread):
         if self._nightly_listener:
             self._nightly_listener()
             self._nightly_listener = None
+        if self._spool_listener:
+            self._spool_listener()
+            self._spool_listener = None
         if self._periodic_listener:
             self._periodic_listener()
             self._periodic_listener = None
@@ -443,6 +666,12 @@ class Recorder(threading.Thread):
             self._hass_started.set_result(SHUTDOWN_TASK)
         self.queue_task(StopTask())
         self._async_stop_listeners()
+        if self._spool is not None and self._spool_events:
+            # Keep the events that have not been written to disk yet, they
+            # are recorded on the next start
+            events = self._spool_events
+            self._spool_events = []
+            await self.hass.async_add_executor_job(self._spool.write_segment, events)
         await self.hass.async_add_executor_job(self.join)
 
     @callback
@@ -508,16 +737,24 @@ class Recorder(threading.Thread):
 
     @callback
     def async_nightly_tasks(self, now: datetime) -> None:
-        """Trigger the purge."""
+        """Trigger the purge and archiving of old statistics."""
         if self.auto_purge:
             # Purge will schedule the periodic cleanups
             # after it completes to ensure it does not happen
             # until after the database is vacuumed
             repack = self.auto_repack and is_second_sunday(now)
             purge_before = dt_util.utcnow() - timedelta(days=self.keep_days)
-            self.queue_task(PurgeTask(purge_before, repack=repack, apply_filter=False))
+            self._async_queue_task_after_events(
+                PurgeTask(purge_before, repack=repack, apply_filter=False)
+            )
         else:
             self.queue_task(PerodicCleanupTask())
+        if self.archive_statistics_days is not None:
+            self.queue_task(
+                ArchiveStatisticsTask(
+                    statistics_archive.archive_horizon(self.archive_statistics_days)
+                )
+            )
 
     @callback
     def _async_five_minute_tasks(self, now: datetime) -> None:
@@ -543,7 +780,7 @@ class Recorder(threading.Thread):
         Short term statistics run every 5 minutes
         """
         start = statistics.get_start_time()
-        self.queue_task(StatisticsTask(start, True))
+        self._async_queue_task_after_events(StatisticsTask(start, True))
 
     @callback
     def async_adjust_statistics(
@@ -634,12 +871,13 @@ class Recorder(threading.Thread):
                 name="Recorder keep alive",
             )
 
-        # If the commit interval is not 0, we need to commit periodically
+        # If the commit interval is not 0, we need to commit periodically,
+        # check if a commit is due as often as the shortest interval
         if self.commit_interval:
             self._commit_listener = async_track_time_interval(
                 self.hass,
-                self._async_commit,
-                timedelta(seconds=self.commit_interval),
+                self._async_commit_if_due,
+                timedelta(seconds=self.commit_scheduler.min_interval),
                 name="Recorder commit",
             )
 
@@ -791,6 +1029,12 @@ class Recorder(threading.Thread):
             self._dismiss_migration_in_progress()
             self._setup_run()
 
+        # Record the events spooled to disk before the last shutdown
+        # before the events queued since startup
+        if self._spool is not None:
+            self._spool.load()
+            self._drain_spool(all_segments=True)
+
         # Catch up with missed statistics
         self._schedule_compile_missing_statistics()
         _LOGGER.debug("Recorder processing the queue")
@@ -840,7 +1084,7 @@ class Recorder(threading.Thread):
             self._guarded_process_one_task_or_event_or_recover(queue_.get())
 
     def _pre_process_startup_events(
-        self, startup_task_or_events: list[RecorderTask | Event[Any]]
+        self, startup_task_or_events: Sequence[RecorderTask | Event[Any]]
     ) -> None:
         """Pre process startup events."""
         # Prime all the state_attributes and event_data caches
@@ -1033,8 +1277,13 @@ class Recorder(threading.Thread):
             self._process_state_changed_event_into_session(event)
         else:
             self._process_non_state_changed_event_into_session(event)
-        # Commit if the commit interval is zero
-        if not self.commit_interval:
+        # Commit if the commit interval is zero, or once the transaction
+        # is large enough during an event storm
+        self.commit_scheduler.pending_writes += 1
+        if (
+            not self.commit_interval
+            or self.commit_scheduler.pending_writes >= MAX_COMMIT_WRITES
+        ):
             self._commit_event_session_or_retry()
 
     def _process_non_state_changed_event_into_session(self, event: Event) -> None:
@@ -1163,7 +1412,11 @@ class Recorder(threading.Thread):
             self._add_to_session(session, dbstate_attributes)
             dbstate.state_attributes = dbstate_attributes
 
-        self._add_to_session(session, dbstate)
+        if self._bulk_insert_states:
+            self._event_session_has_pending_writes = True
+            states_manager.add_pending_insert(dbstate)
+        else:
+            self._add_to_session(session, dbstate)
 
     def _handle_database_error(self, err: Exception, *, setup_run: bool) -> bool:
         """Handle a database error that may result in moving away the corrupt db."""
@@ -1210,6 +1463,13 @@ class Recorder(threading.Thread):
         assert self.event_session is not None
         session = self.event_session
         self._commits_without_expire += 1
+        commit_started = time.monotonic()
+
+        if self._bulk_insert_states:
+            # Flush the new attributes and states meta first so the
+            # states can refer to their ids
+            session.flush()
+            self.states_manager.insert_pending(session)
 
         if (
             pending_last_reported
@@ -1229,6 +1489,9 @@ class Recorder(threading.Thread):
         session.commit()
 
         self._event_session_has_pending_writes = False
+        self.commit_scheduler.committed(
+            commit_started, time.monotonic(), self.backlog, self._running_read_jobs
+        )
         # We just committed the state attributes to the database
         # and we now know the attributes_ids.  We can save
         # many selects for matching attributes by loading them
@@ -1424,15 +1687,43 @@ class Recorder(threading.Thread):
         self.engine = create_engine(self.db_url, **kwargs, future=True)
         self._dialect_name = try_parse_enum(SupportedDialect, self.engine.dialect.name)
         self.__dict__.pop("dialect_name", None)
+        # States are written with executemany when the state_ids of the new
+        # rows can be returned in order, which is needed to link old_state_id
+        self._bulk_insert_states = getattr(
+            self.engine.dialect,
+            "insert_executemany_returning_sort_by_parameter_order",
+            False,
+        )
         sqlalchemy_event.listen(self.engine, "connect", self._setup_recorder_connection)
 
         migration.pre_migrate_schema(self.engine)
         Base.metadata.create_all(self.engine)
         self._get_session = scoped_session(sessionmaker(bind=self.engine, future=True))
+        if self.engine.dialect.name in (
+            SupportedDialect.MYSQL,
+            SupportedDialect.POSTGRESQL,
+        ):
+            # History, logbook and statistics queries run in parallel on their
+            # own read-only connections instead of queueing behind the writer
+            self._readers = DatabaseReaders(
+                self,
+                create_engine(
+                    self.db_url,
+                    **kwargs,
+                    pool_size=READ_POOL_SIZE,
+                    # Room for the connection that interrupts cancelled queries
+                    max_overflow=1,
+                    future=True,
+                ),
+            )
         _LOGGER.debug("Connected to recorder database")
 
     def _close_connection(self) -> None:
         """Close the connection."""
+        if self._readers:
+            readers = self._readers
+            self._readers = None
+            readers.close()
         if self.engine:
             self.engine.dispose()
             self.engine = None
@@ -77,7 +77,7 @@ class LegacyBase(DeclarativeBase):
     """Base class for tables, used for schema migration."""
 
 
-SCHEMA_VERSION = 48
+SCHEMA_VERSION = 49
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -93,6 +93,7 @@ TABLE_STATISTICS = "statistics"
 TABLE_STATISTICS_META = "statistics_meta"
 TABLE_STATISTICS_RUNS = "statistics_runs"
 TABLE_STATISTICS_SHORT_TERM = "statistics_short_term"
+TABLE_STATISTICS_ARCHIVE = "statistics_archive"
 TABLE_MIGRATION_CHANGES = "migration_changes"
 
 STATISTICS_TABLES = ("statistics", "statistics_short_term")
@@ -116,6 +117,7 @@ ALL_TABLES = [
     TABLE_STATISTICS_META,
     TABLE_STATISTICS_RUNS,
     TABLE_STATISTICS_SHORT_TERM,
+    TABLE_STATISTICS_ARCHIVE,
 ]
 
 TABLES_TO_CHECK = [
@@ -231,6 +233,7 @@ CONTEXT_BINARY_TYPE = LargeBinary(CONTEXT_ID_BIN_MAX_LENGTH).with_variant(
 )
 
 TIMESTAMP_TYPE = DOUBLE_TYPE
+ARCHIVE_BINARY_TYPE = LargeBinary().with_variant(mysql.LONGBLOB(), "mysql", "mariadb")
 
 
 class _LiteralProcessorType(Protocol):
@@ -633,14 +636,8 @@ class StateAttributes(Base):
         )
 
     @staticmethod
-    def shared_attrs_bytes_from_event(
-        event: Event[EventStateChangedData],
-        dialect: SupportedDialect | None,
-    ) -> bytes:
-        """Create shared_attrs from a state_changed event."""
-        # None state means the state was removed from the state machine
-        if (state := event.data["new_state"]) is None:
-            return b"{}"
+    def recorded_attributes(state: State) -> dict[str, Any]:
+        """Return the attributes of a state that are recorded."""
         if state_info := state.state_info:
             unrecorded_attributes = state_info["unrecorded_attributes"]
             exclude_attrs = {
@@ -654,11 +651,22 @@ class StateAttributes(Base):
                 exclude_attrs -= _MATCH_ALL_KEEP
         else:
             exclude_attrs = ALL_DOMAIN_EXCLUDE_ATTRS
-        encoder = json_bytes_strip_null if dialect == PSQL_DIALECT else json_bytes
-        bytes_result = encoder(
-            {k: v for k, v in state.attributes.items() if k not in exclude_attrs}
-        )
-        if len(bytes_result) > MAX_STATE_ATTRS_BYTES:
+        return {k: v for k, v in state.attributes.items() if k not in exclude_attrs}
+
+    @staticmethod
+    def shared_attrs_bytes_from_event(
+        event: Event[EventStateChangedData],
+        dialect: SupportedDialect | None,
+    ) -> bytes:
+        """Create shared_attrs from a state_changed event."""
+        # None state means the state was removed from the state machine
+        if (state := event.data["new_state"]) is None:
+            return b"{}"
+        if (
+            bytes_result := StateAttributes.shared_attrs_bytes_from_state(
+                state, dialect
+            )
+        ) is None:
             _LOGGER.warning(
                 "State attributes for %s exceed maximum size of %s bytes. "
                 "This can cause database performance issues; Attributes "
@@ -669,6 +677,20 @@ class StateAttributes(Base):
             return b"{}"
         return bytes_result
 
+    @staticmethod
+    def shared_attrs_bytes_from_state(
+        state: State, dialect: SupportedDialect | None
+    ) -> bytes | None:
+        """Create shared_attrs from a state.
+
+        Returns None if the attributes are too large to be stored.
+        """
+        encoder = json_bytes_strip_null if dialect == PSQL_DIALECT else json_bytes
+        bytes_result = encoder(StateAttributes.recorded_attributes(state))
+        if len(bytes_result) > MAX_STATE_ATTRS_BYTES:
+            return None
+        return bytes_result
+
     @staticmethod
     def hash_shared_attrs_bytes(shared_attrs_bytes: bytes) -> int:
         """Return the hash of json encoded shared attributes."""
@@ -834,6 +856,30 @@ class LegacyStatisticsShortTerm(LegacyBase, _StatisticsShortTerm):
     )
 
 
+class StatisticsArchive(Base):
+    """Compressed block of the archived hourly statistics of a month."""
+
+    __table_args__ = (
+        Index(
+            "ix_statistics_archive_metadata_id_start_ts",
+            "metadata_id",
+            "start_ts",
+            unique=True,
+        ),
+        _DEFAULT_TABLE_ARGS,
+    )
+    __tablename__ = TABLE_STATISTICS_ARCHIVE
+
+    id: Mapped[int] = mapped_column(ID_TYPE, Identity(), primary_key=True)
+    metadata_id: Mapped[int] = mapped_column(
+        ID_TYPE,
+        ForeignKey(f"{TABLE_STATISTICS_META}.id", ondelete="CASCADE"),
+    )
+    start_ts: Mapped[float] = mapped_column(TIMESTAMP_TYPE)
+    end_ts: Mapped[float] = mapped_column(TIMESTAMP_TYPE)
+    data: Mapped[bytes] = mapped_column(ARCHIVE_BINARY_TYPE)
+
+
 class _StatisticsMeta:
     """Statistics meta data."""
 
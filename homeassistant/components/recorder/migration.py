@@ -67,6 +67,8 @@ from .db_schema import (
     SCHEMA_VERSION,
     STATISTICS_TABLES,
     TABLE_STATES,
+    TABLE_STATISTICS_ARCHIVE,
+    TABLE_STATISTICS_META,
     Base,
     Events,
     EventTypes,
@@ -76,6 +78,7 @@ from .db_schema import (
     States,
     StatesMeta,
     Statistics,
+    StatisticsArchive,
     StatisticsMeta,
     StatisticsRuns,
     StatisticsShortTerm,
@@ -330,6 +333,19 @@ def pre_migrate_schema(engine: Engine) -> None:
             engine, (LegacyBase.metadata.tables["statistics_short_term"],)
         )
 
+    if inspector.has_table(TABLE_STATISTICS_META) and not inspector.has_table(
+        TABLE_STATISTICS_ARCHIVE
+    ):
+        # The id of statistics_meta is not a big integer before schema
+        # version 46, and MySQL refuses a foreign key from the big integer
+        # metadata_id of statistics_archive to it. Create the table without
+        # its foreign key, the migration to schema version 49 adds it.
+        table = cast(Table, StatisticsArchive.__table__)
+        with engine.begin() as connection:
+            connection.execute(CreateTable(table, include_foreign_key_constraints=()))
+            for index in table.indexes:
+                index.create(connection)
+
 
 def _migrate_schema(
     instance: Recorder,
@@ -1987,6 +2003,31 @@ class _SchemaVersion48Migrator(_SchemaVersionMigrator, target_version=48):
         _migrate_columns_to_timestamp(self.instance, self.session_maker, self.engine)
 
 
+class _SchemaVersion49Migrator(_SchemaVersionMigrator, target_version=49):
+    def _apply_update(self) -> None:
+        """Version specific update method."""
+        # Add the foreign key of the statistics_archive table, which is
+        # created without it when the database already exists
+        inspector = sqlalchemy.inspect(self.engine)
+        if any(
+            foreign_key["constrained_columns"] == ["metadata_id"]
+            for foreign_key in inspector.get_foreign_keys(TABLE_STATISTICS_ARCHIVE)
+        ):
+            return
+        if self.engine.dialect.name == SupportedDialect.SQLITE:
+            # SQLite can't add a constraint to a table. Nothing is archived
+            # before the migration is done, so the empty table is created again.
+            table = cast(Table, StatisticsArchive.__table__)
+            table.drop(self.engine)
+            table.create(self.engine)
+            return
+        _restore_foreign_key_constraints(
+            self.session_maker,
+            self.engine,
+            [(TABLE_STATISTICS_ARCHIVE, "metadata_id", TABLE_STATISTICS_META, "id")],
+        )
+
+
 def _migrate_statistics_columns_to_timestamp_removing_duplicates(
     hass: HomeAssistant,
     instance: Recorder,
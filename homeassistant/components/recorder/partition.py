@@ -0,0 +1,198 @@
+"""Support for time partitioned recorder tables.
+
+The recorder does not partition tables itself. When the states, events or
+statistics_short_term table of a PostgreSQL database has been converted to a
+table partitioned by range on its timestamp column, purging drops the
+partitions that only hold expired rows instead of deleting them in batches,
+and the periodic cleanup creates the partitions needed to record new rows.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from datetime import timedelta
+import logging
+import math
+import re
+
+from sqlalchemy import text
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm.session import Session
+
+import homeassistant.util.dt as dt_util
+
+from .db_schema import TABLE_EVENTS, TABLE_STATES, TABLE_STATISTICS_SHORT_TERM
+
+_LOGGER = logging.getLogger(__name__)
+
+# The column each table must be partitioned by
+PARTITIONED_TABLES = {
+    TABLE_STATES: "last_updated_ts",
+    TABLE_EVENTS: "time_fired_ts",
+    TABLE_STATISTICS_SHORT_TERM: "start_ts",
+}
+
+# How far ahead the periodic cleanup creates partitions
+PARTITION_CREATE_AHEAD = timedelta(days=14)
+
+_FIND_PARTITIONS = text(
+    "SELECT child.relname, pg_get_expr(child.relpartbound, child.oid), "
+    "pg_get_partkeydef(parent.oid) "
+    "FROM pg_inherits "
+    "JOIN pg_class parent ON parent.oid = pg_inherits.inhparent "
+    "JOIN pg_class child ON child.oid = pg_inherits.inhrelid "
+    "WHERE parent.relname = :table AND parent.relkind = 'p' "
+    "AND pg_table_is_visible(parent.oid)"
+)
+_RANGE_BOUND = re.compile(r"FOR VALUES FROM \((.+)\) TO \((.+)\)")
+_SECONDS_PER_DAY = 86400
+
+
+@dataclass(slots=True, frozen=True)
+class TablePartition:
+    """A range partition of a recorder table."""
+
+    name: str
+    start: float
+    end: float
+
+
+def _parse_bound(bound: str) -> float:
+    """Parse a partition bound as rendered by pg_get_expr."""
+    if bound == "MINVALUE":
+        return -math.inf
+    if bound == "MAXVALUE":
+        return math.inf
+    return float(bound.split("::", 1)[0].strip("'"))
+
+
+def _quote(session: Session, name: str) -> str:
+    """Quote a table name."""
+    return session.get_bind().dialect.identifier_preparer.quote(name)
+
+
+def find_table_partitions(session: Session, table: str) -> list[TablePartition]:
+    """Return the range partitions of a table ordered by start.
+
+    Returns an empty list if the table is not partitioned by range on its
+    timestamp column. The default partition, if any, is not returned since
+    it can never be dropped.
+    """
+    partition_key = f"RANGE ({PARTITIONED_TABLES[table]})"
+    partitions: list[TablePartition] = []
+    for name, bound, key in session.execute(_FIND_PARTITIONS, {"table": table}):
+        if key != partition_key:
+            _LOGGER.debug("Table %s is not partitioned by %s", table, partition_key)
+            return []
+        if not (match := _RANGE_BOUND.fullmatch(bound)):
+            continue
+        try:
+            start, end = (_parse_bound(value) for value in match.groups())
+        except ValueError:
+            _LOGGER.debug("Ignoring partition %s with bound %s", name, bound)
+            continue
+        partitions.append(TablePartition(name, start, end))
+    partitions.sort(key=lambda partition: partition.start)
+    return partitions
+
+
+def find_expired_partitions(
+    session: Session, table: str, purge_before_ts: float
+) -> list[TablePartition]:
+    """Return the partitions of a table that only hold rows to purge."""
+    return [
+        partition
+        for partition in find_table_partitions(session, table)
+        if partition.end <= purge_before_ts
+    ]
+
+
+def select_partition_ids(
+    session: Session, partition: TablePartition, column: str
+) -> set[int]:
+    """Return the distinct non null values of an id column in a partition."""
+    return {
+        row[0]
+        for row in session.execute(
+            text(
+                f"SELECT DISTINCT {column} FROM {_quote(session, partition.name)} "  # noqa: S608
+                f"WHERE {column} IS NOT NULL"
+            )
+        )
+    }
+
+
+def disconnect_partition_states(
+    session: Session, partition: TablePartition
+) -> tuple[int, int] | None:
+    """Unlink the states in a partition from newer states.
+
+    Returns the range of state_ids in the partition, or None if it is empty.
+    """
+    quoted = _quote(session, partition.name)
+    min_state_id, max_state_id = session.execute(
+        text(f"SELECT min(state_id), max(state_id) FROM {quoted}")  # noqa: S608
+    ).one()
+    if min_state_id is None:
+        return None
+    disconnected_rows = session.execute(
+        text(
+            f"UPDATE {TABLE_STATES} SET old_state_id = NULL "  # noqa: S608
+            f"WHERE old_state_id IN (SELECT state_id FROM {quoted})"
+        )
+    )
+    _LOGGER.debug("Updated %s states to remove old_state_id", disconnected_rows)
+    return min_state_id, max_state_id
+
+
+def drop_partition(session: Session, partition: TablePartition) -> None:
+    """Drop a partition and all its rows.
+
+    This locks the partitioned table exclusively until the transaction ends.
+    """
+    session.execute(text(f"DROP TABLE {_quote(session, partition.name)}"))
+    _LOGGER.debug("Dropped partition %s", partition.name)
+
+
+def _partition_name(table: str, start: float, interval: float) -> str:
+    """Return the name of a new partition."""
+    start_time = dt_util.utc_from_timestamp(start)
+    if interval % _SECONDS_PER_DAY:
+        return f"{table}_p{start_time:%Y%m%d_%H%M}"
+    return f"{table}_p{start_time:%Y%m%d}"
+
+
+def create_future_partitions(session: Session, until_ts: float) -> None:
+    """Create partitions so rows can be recorded until until_ts.
+
+    New partitions continue the last partition of each partitioned table
+    with the same interval. Tables that are not partitioned are left alone.
+    """
+    for table in PARTITIONED_TABLES:
+        partitions = [
+            partition
+            for partition in find_table_partitions(session, table)
+            if math.isfinite(partition.start) and math.isfinite(partition.end)
+        ]
+        if not partitions:
+            continue
+        last = max(partitions, key=lambda partition: partition.end)
+        interval = last.end - last.start
+        start = last.end
+        while start < until_ts:
+            end = start + interval
+            name = _partition_name(table, start, interval)
+            try:
+                with session.begin_nested():
+                    session.execute(
+                        text(
+                            f"CREATE TABLE {_quote(session, name)} "
+                            f"PARTITION OF {table} "
+                            f"FOR VALUES FROM ({start!r}) TO ({end!r})"
+                        )
+                    )
+            except SQLAlchemyError:
+                _LOGGER.exception("Error creating partition %s", name)
+                break
+            _LOGGER.debug("Created partition %s", name)
+            start = end
@@ -12,8 +12,22 @@ from sqlalchemy.orm.session import Session
 
 from homeassistant.util.collection import chunked_or_all
 
-from .db_schema import Events, States, StatesMeta
+from .const import SupportedDialect
+from .db_schema import (
+    TABLE_EVENTS,
+    TABLE_STATES,
+    TABLE_STATISTICS_SHORT_TERM,
+    Events,
+    States,
+    StatesMeta,
+)
 from .models import DatabaseEngine
+from .partition import (
+    disconnect_partition_states,
+    drop_partition,
+    find_expired_partitions,
+    select_partition_ids,
+)
 from .queries import (
     attributes_ids_exist_in_states,
     attributes_ids_exist_in_states_with_fast_in_distinct,
@@ -70,6 +84,13 @@ def purge_old_data(
         "Purging states and events before target %s",
         purge_before.isoformat(sep=" ", timespec="seconds"),
     )
+    if (
+        instance.dialect_name == SupportedDialect.POSTGRESQL
+        and not instance.use_legacy_events_index
+    ):
+        # Drop whole partitions first so only the rows of the
+        # partition spanning purge_before are deleted in batches
+        _purge_expired_partitions(instance, purge_before)
     with session_scope(session=instance.get_session()) as session:
         # Purge a max of max_bind_vars, based on the oldest states or events record
         has_more_to_purge = False
@@ -174,6 +195,41 @@ def _purge_legacy_format(
     )
 
 
+def _purge_expired_partitions(instance: Recorder, purge_before: datetime) -> None:
+    """Drop the partitions that only hold rows older than purge_before.
+
+    Dropping a partition locks its parent table exclusively, so each
+    partition is dropped in its own short transaction, and the shared
+    attributes and event data rows are purged after the lock is released.
+    """
+    purge_before_ts = purge_before.timestamp()
+    with session_scope(session=instance.get_session(), read_only=True) as session:
+        expired = {
+            table: find_expired_partitions(session, table, purge_before_ts)
+            for table in (TABLE_STATES, TABLE_EVENTS, TABLE_STATISTICS_SHORT_TERM)
+        }
+
+    for partition in expired[TABLE_STATES]:
+        with session_scope(session=instance.get_session()) as session:
+            attributes_ids = select_partition_ids(session, partition, "attributes_id")
+            if state_id_range := disconnect_partition_states(session, partition):
+                instance.states_manager.evict_purged_state_id_range(*state_id_range)
+            drop_partition(session, partition)
+        with session_scope(session=instance.get_session()) as session:
+            _purge_unused_attributes_ids(instance, session, attributes_ids)
+
+    for partition in expired[TABLE_EVENTS]:
+        with session_scope(session=instance.get_session()) as session:
+            data_ids = select_partition_ids(session, partition, "data_id")
+            drop_partition(session, partition)
+        with session_scope(session=instance.get_session()) as session:
+            _purge_unused_data_ids(instance, session, data_ids)
+
+    for partition in expired[TABLE_STATISTICS_SHORT_TERM]:
+        with session_scope(session=instance.get_session()) as session:
+            drop_partition(session, partition)
+
+
 def _purge_states_and_attributes_ids(
     instance: Recorder,
     session: Session,
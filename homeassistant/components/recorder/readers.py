@@ -0,0 +1,247 @@
+"""Run read-only database queries in parallel to the recorder."""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Callable
+from concurrent.futures import CancelledError
+from functools import partial
+import logging
+import threading
+from typing import TYPE_CHECKING, Any
+
+from sqlalchemy import event as sqlalchemy_event
+from sqlalchemy.engine import Engine
+from sqlalchemy.engine.interfaces import DBAPIConnection
+from sqlalchemy.orm import scoped_session, sessionmaker
+from sqlalchemy.orm.session import Session
+
+from homeassistant.core import HomeAssistant, callback
+
+from .const import DB_READER_PREFIX, SupportedDialect
+from .executor import DBInterruptibleThreadPoolExecutor
+from .util import (
+    execute_on_connection,
+    query_on_connection,
+    setup_connection_for_dialect,
+)
+
+if TYPE_CHECKING:
+    from homeassistant.components.websocket_api import ActiveConnection
+
+    from . import Recorder
+
+_LOGGER = logging.getLogger(__name__)
+
+# The number of read-only queries that run at the same time
+READ_POOL_SIZE = 4
+
+# Read-only queries are stopped by the database after this many seconds
+READ_QUERY_TIMEOUT = 300
+
+
+class _ReadJob:
+    """A job running on the read-only connections."""
+
+    __slots__ = ("cancelled", "interrupting", "thread_id")
+
+    def __init__(self) -> None:
+        """Initialize the job."""
+        self.cancelled = False
+        # Set while the query of the job is interrupted, the job keeps its
+        # thread and connection until the interrupt returns
+        self.interrupting = False
+        self.thread_id: int | None = None
+
+
+class DatabaseReaders:
+    """Run read-only queries on their own pool of database connections.
+
+    The queries run in their own executor so they do not queue behind the
+    recorder or its database jobs, and each connection is read-only with a
+    statement timeout. Cancelling a job stops its query if it is running.
+
+    Readers are only used with MySQL and PostgreSQL, the SQLite database is
+    only written and read by the recorder connections.
+    """
+
+    def __init__(self, instance: Recorder, engine: Engine) -> None:
+        """Initialize the readers."""
+        self._instance = instance
+        self.engine = engine
+        self.thread_ids: set[int] = set()
+        self._get_session = scoped_session(sessionmaker(bind=engine, future=True))
+        self._executor = DBInterruptibleThreadPoolExecutor(
+            self.thread_ids,
+            thread_name_prefix=DB_READER_PREFIX,
+            max_workers=READ_POOL_SIZE,
+            shutdown_hook=self._get_session.remove,
+        )
+        self._lock = threading.Lock()
+        # Notified when the interrupt of a job returns
+        self._interrupted = threading.Condition(self._lock)
+        # The job each reader thread runs and the connection it has checked out
+        self._jobs: dict[int, _ReadJob] = {}
+        self._connections: dict[int, DBAPIConnection] = {}
+        sqlalchemy_event.listen(engine, "connect", self._setup_connection)
+        sqlalchemy_event.listen(engine, "checkout", self._connection_checked_out)
+        sqlalchemy_event.listen(engine, "checkin", self._connection_checked_in)
+        sqlalchemy_event.listen(engine, "before_cursor_execute", self._before_execute)
+
+    def get_session(self) -> Session:
+        """Get a new read-only sqlalchemy session."""
+        return self._get_session()
+
+    @callback
+    def async_add_executor_job[_T](
+        self, hass: HomeAssistant, target: Callable[..., _T], *args: Any
+    ) -> asyncio.Future[_T]:
+        """Add a read-only executor job from within the event loop."""
+        job = _ReadJob()
+        future = hass.loop.run_in_executor(
+            self._executor, self._run_job, job, target, *args
+        )
+        future.add_done_callback(partial(self._async_job_done, hass, job))
+        return future
+
+    @callback
+    def _async_job_done(
+        self, hass: HomeAssistant, job: _ReadJob, future: asyncio.Future[Any]
+    ) -> None:
+        """Stop the query of a job that was cancelled while it was running."""
+        if future.cancelled():
+            hass.async_add_executor_job(self._cancel_job, job)
+
+    def close(self) -> None:
+        """Stop the executor and close the connections."""
+        self._executor.shutdown(join_threads_or_timeout=False)
+        self.engine.dispose()
+        self._executor.join_threads_or_timeout()
+
+    def _run_job[_T](self, job: _ReadJob, target: Callable[..., _T], *args: Any) -> _T:
+        """Run a job in a reader thread unless it was cancelled."""
+        thread_id = threading.get_ident()
+        with self._lock:
+            if job.cancelled:
+                raise CancelledError
+            job.thread_id = thread_id
+            self._jobs[thread_id] = job
+        try:
+            return target(*args)
+        finally:
+            with self._interrupted:
+                # The thread must not run another job while the query of
+                # this one is interrupted
+                self._interrupted.wait_for(lambda: not job.interrupting)
+                job.thread_id = None
+                del self._jobs[thread_id]
+
+    def _cancel_job(self, job: _ReadJob) -> None:
+        """Cancel a job and stop its query if it is running.
+
+        The connection is interrupted without holding the lock since killing
+        a MySQL query opens another connection, which must not block the
+        reader threads starting or finishing their jobs. The job keeps its
+        thread and connection until the interrupt returns, so the query of
+        another job can not be stopped instead.
+        """
+        with self._lock:
+            job.cancelled = True
+            if job.thread_id is None or (
+                (dbapi_connection := self._connections.get(job.thread_id)) is None
+            ):
+                return
+            job.interrupting = True
+        _LOGGER.debug("Interrupting the query of a cancelled read job")
+        try:
+            self._interrupt(dbapi_connection)
+        except Exception:
+            _LOGGER.exception("Error interrupting a read query")
+        finally:
+            with self._interrupted:
+                job.interrupting = False
+                self._interrupted.notify_all()
+
+    def _interrupt(self, dbapi_connection: DBAPIConnection) -> None:
+        """Stop the query running on a connection."""
+        dialect_name = self.engine.dialect.name
+        if dialect_name == SupportedDialect.POSTGRESQL:
+            dbapi_connection.cancel()  # type: ignore[attr-defined]
+        elif dialect_name == SupportedDialect.MYSQL:
+            # The query can only be killed from another connection
+            thread_id = dbapi_connection.thread_id()  # type: ignore[attr-defined]
+            with self.engine.connect() as connection:
+                connection.exec_driver_sql(f"KILL QUERY {int(thread_id)}")
+
+    def _setup_connection(
+        self, dbapi_connection: DBAPIConnection, connection_record: Any
+    ) -> None:
+        """Make a new connection read-only with a statement timeout."""
+        dialect_name = self.engine.dialect.name
+        setup_connection_for_dialect(
+            self._instance, dialect_name, dbapi_connection, False
+        )
+        if dialect_name == SupportedDialect.MYSQL:
+            execute_on_connection(dbapi_connection, "SET SESSION TRANSACTION READ ONLY")
+            version_string = query_on_connection(dbapi_connection, "SELECT VERSION()")
+            if "mariadb" in version_string[0][0].lower():
+                execute_on_connection(
+                    dbapi_connection,
+                    f"SET SESSION max_statement_time = {READ_QUERY_TIMEOUT}",
+                )
+            else:
+                execute_on_connection(
+                    dbapi_connection,
+                    f"SET SESSION max_execution_time = {READ_QUERY_TIMEOUT * 1000}",
+                )
+        elif dialect_name == SupportedDialect.POSTGRESQL:
+            execute_on_connection(
+                dbapi_connection,
+                "SET SESSION CHARACTERISTICS AS TRANSACTION READ ONLY",
+            )
+            execute_on_connection(
+                dbapi_connection,
+                f"SET statement_timeout = {READ_QUERY_TIMEOUT * 1000}",
+            )
+            # The settings are lost if the pool rolls the transaction back
+            dbapi_connection.commit()
+
+    def _before_execute(self, *args: Any) -> None:
+        """Stop a cancelled job before it runs its next query."""
+        if (job := self._jobs.get(threading.get_ident())) and job.cancelled:
+            raise CancelledError
+
+    def _connection_checked_out(
+        self,
+        dbapi_connection: DBAPIConnection,
+        connection_record: Any,
+        connection_proxy: Any,
+    ) -> None:
+        """Remember the connection a thread checked out."""
+        with self._lock:
+            self._connections[threading.get_ident()] = dbapi_connection
+
+    def _connection_checked_in(
+        self, dbapi_connection: DBAPIConnection, connection_record: Any
+    ) -> None:
+        """Forget the connection a thread checked in.
+
+        A connection is not returned to the pool while the query of its job
+        is interrupted.
+        """
+        thread_id = threading.get_ident()
+        with self._interrupted:
+            if job := self._jobs.get(thread_id):
+                self._interrupted.wait_for(lambda: not job.interrupting)
+            self._connections.pop(thread_id, None)
+
+
+async def async_cancel_on_close[_T](
+    connection: ActiveConnection, msg_id: int, future: asyncio.Future[_T]
+) -> _T:
+    """Wait for a database job, cancelling it if the websocket closes first."""
+    connection.subscriptions[msg_id] = future.cancel
+    try:
+        return await future
+    finally:
+        connection.subscriptions.pop(msg_id, None)
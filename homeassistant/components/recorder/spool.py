@@ -0,0 +1,281 @@
+"""Spool recorder events to disk while the database cannot keep up."""
+
+from __future__ import annotations
+
+from collections import deque
+from collections.abc import Iterable
+import contextlib
+import logging
+import os
+import threading
+from typing import Any
+
+from homeassistant.const import EVENT_STATE_CHANGED
+from homeassistant.core import Context, Event, EventOrigin, State
+from homeassistant.helpers.json import json_bytes
+import homeassistant.util.dt as dt_util
+from homeassistant.util.json import json_loads_array
+
+_LOGGER = logging.getLogger(__name__)
+
+SPOOL_DIR = ".recorder_spool"
+SEGMENT_SUFFIX = ".jsonl"
+TMP_SEGMENT_SUFFIX = ".tmp"
+# Holds the number of events of a segment which have been committed
+COMMITTED_SUFFIX = ".committed"
+
+
+def _state_to_spool(state: State | None) -> list[Any] | None:
+    """Return a state as a JSON serializable list."""
+    if state is None:
+        return None
+    state_info = state.state_info
+    return [
+        state.entity_id,
+        state.state,
+        state.attributes,
+        state.last_changed_timestamp,
+        state.last_reported_timestamp,
+        state.last_updated_timestamp,
+        sorted(state_info["unrecorded_attributes"]) if state_info else None,
+    ]
+
+
+def _state_from_spool(spooled: list[Any] | None, context: Context) -> State | None:
+    """Return a state from a spooled list."""
+    if spooled is None:
+        return None
+    (
+        entity_id,
+        state,
+        attributes,
+        last_changed,
+        last_reported,
+        last_updated,
+        unrecorded_attributes,
+    ) = spooled
+    return State(
+        entity_id,
+        state,
+        attributes,
+        dt_util.utc_from_timestamp(last_changed),
+        dt_util.utc_from_timestamp(last_reported),
+        dt_util.utc_from_timestamp(last_updated),
+        # The recorder only uses the context of the event
+        context,
+        validate_entity_id=False,
+        state_info=(
+            None
+            if unrecorded_attributes is None
+            else {"unrecorded_attributes": frozenset(unrecorded_attributes)}
+        ),
+        last_updated_timestamp=last_updated,
+    )
+
+
+def event_to_spool(event: Event) -> bytes:
+    """Serialize an event to a spool line.
+
+    Raises TypeError if the event data is not JSON serializable.
+    """
+    data: Any = event.data
+    if event.event_type == EVENT_STATE_CHANGED:
+        data = {
+            "entity_id": data["entity_id"],
+            "old_state": _state_to_spool(data["old_state"]),
+            "new_state": _state_to_spool(data["new_state"]),
+        }
+    context = event.context
+    return json_bytes(
+        [
+            event.event_type,
+            data,
+            event.origin.value,
+            event.time_fired_timestamp,
+            context.id,
+            context.user_id,
+            context.parent_id,
+        ]
+    )
+
+
+def event_from_spool(line: bytes) -> Event:
+    """Deserialize an event from a spool line."""
+    (
+        event_type,
+        data,
+        origin,
+        time_fired_timestamp,
+        context_id,
+        context_user_id,
+        context_parent_id,
+    ) = json_loads_array(line)
+    context = Context(context_user_id, context_parent_id, context_id)  # type: ignore[arg-type]
+    if event_type == EVENT_STATE_CHANGED:
+        assert isinstance(data, dict)
+        data = {
+            "entity_id": data["entity_id"],
+            "old_state": _state_from_spool(data["old_state"], context),  # type: ignore[arg-type]
+            "new_state": _state_from_spool(data["new_state"], context),  # type: ignore[arg-type]
+        }
+    return Event(
+        event_type,  # type: ignore[arg-type]
+        data,  # type: ignore[arg-type]
+        EventOrigin(origin),
+        time_fired_timestamp,  # type: ignore[arg-type]
+        context,
+    )
+
+
+class RecorderSpool:
+    """Append-only spool of events on disk.
+
+    Events are written in numbered segment files. A segment is written
+    once, under a temporary name that is renamed when complete, and is
+    removed after its events have been written to the database. The
+    segments are drained in the order they were written.
+
+    The recorder may commit while it drains a segment. The number of events
+    of the segment committed so far is kept next to it, so those events are
+    not recorded twice when draining is interrupted.
+    """
+
+    def __init__(self, path: str) -> None:
+        """Initialize the spool."""
+        self._path = path
+        self._lock = threading.Lock()
+        self._segments: deque[int] = deque()
+        self._next_segment = 0
+
+    def _segment_path(self, segment: int, suffix: str = SEGMENT_SUFFIX) -> str:
+        """Return the path of a segment."""
+        return os.path.join(self._path, f"{segment:012d}{suffix}")
+
+    @property
+    def has_segments(self) -> bool:
+        """Return if there are segments to drain."""
+        with self._lock:
+            return bool(self._segments)
+
+    def load(self) -> None:
+        """Load the segments left over from a previous run.
+
+        Must not be called from the event loop.
+        """
+        try:
+            names = os.listdir(self._path)
+        except FileNotFoundError:
+            return
+        segments: list[int] = []
+        committed: list[int] = []
+        for name in names:
+            segment, _, suffix = name.partition(".")
+            if not segment.isdigit():
+                continue
+            if f".{suffix}" == SEGMENT_SUFFIX:
+                segments.append(int(segment))
+            elif f".{suffix}" == COMMITTED_SUFFIX:
+                committed.append(int(segment))
+            else:
+                # Incomplete segment or offset from a crash while writing
+                os.unlink(os.path.join(self._path, name))
+        for segment in set(committed).difference(segments):
+            # Offset of a segment removed before its offset was
+            os.unlink(self._segment_path(segment, COMMITTED_SUFFIX))
+        segments.sort()
+        with self._lock:
+            self._segments.extend(segments)
+            if segments:
+                self._next_segment = segments[-1] + 1
+
+    def write_segment(self, events: Iterable[Event]) -> int:
+        """Write events to a new segment and return the number written.
+
+        Events that cannot be serialized are dropped like the recorder
+        drops them when it writes to the database.
+
+        Must not be called from the event loop.
+        """
+        lines: list[bytes] = []
+        for event in events:
+            try:
+                lines.append(event_to_spool(event))
+            except TypeError as err:
+                _LOGGER.warning(
+                    "Event is not JSON serializable and will not be spooled: %s: %s",
+                    event,
+                    err,
+                )
+        if not lines:
+            return 0
+        with self._lock:
+            segment = self._next_segment
+            self._next_segment += 1
+        os.makedirs(self._path, exist_ok=True)
+        tmp_path = self._segment_path(segment, TMP_SEGMENT_SUFFIX)
+        with open(tmp_path, "wb") as fp:
+            fp.write(b"\n".join(lines))
+            fp.flush()
+            os.fsync(fp.fileno())
+        os.replace(tmp_path, self._segment_path(segment))
+        with self._lock:
+            self._segments.append(segment)
+        return len(lines)
+
+    def _read_committed(self, segment: int) -> int:
+        """Return the number of committed events of a segment."""
+        try:
+            with open(self._segment_path(segment, COMMITTED_SUFFIX), "rb") as fp:
+                return int(fp.read())
+        except FileNotFoundError:
+            return 0
+        except ValueError:
+            # The offset is replaced atomically, so this is not expected
+            _LOGGER.warning("Invalid committed offset of segment %s", segment)
+            return 0
+
+    def read_segment(self) -> tuple[int, list[tuple[int, Event]]] | None:
+        """Return the oldest segment and its events which are not committed.
+
+        Each event comes with the number of events of the segment up to and
+        including it, which is passed to mark_committed once it is committed.
+
+        Must not be called from the event loop.
+        """
+        with self._lock:
+            if not self._segments:
+                return None
+            segment = self._segments[0]
+        with open(self._segment_path(segment), "rb") as fp:
+            lines = fp.read().split(b"\n")
+        committed = self._read_committed(segment)
+        events: list[tuple[int, Event]] = []
+        for number, line in enumerate(lines[committed:], committed + 1):
+            try:
+                events.append((number, event_from_spool(line)))
+            except (ValueError, TypeError, KeyError):
+                _LOGGER.warning("Skipping invalid spooled event in segment %s", segment)
+        return segment, events
+
+    def mark_committed(self, segment: int, count: int) -> None:
+        """Record that the first count events of a segment are committed.
+
+        Must not be called from the event loop.
+        """
+        tmp_path = self._segment_path(segment, TMP_SEGMENT_SUFFIX)
+        with open(tmp_path, "wb") as fp:
+            fp.write(str(count).encode())
+            fp.flush()
+            os.fsync(fp.fileno())
+        os.replace(tmp_path, self._segment_path(segment, COMMITTED_SUFFIX))
+
+    def remove_segment(self, segment: int) -> None:
+        """Remove a segment after its events have been recorded.
+
+        Must not be called from the event loop.
+        """
+        with self._lock:
+            self._segments.remove(segment)
+        os.unlink(self._segment_path(segment))
+        with contextlib.suppress(FileNotFoundError):
+            os.unlink(self._segment_path(segment, COMMITTED_SUFFIX))
@@ -3,7 +3,7 @@
 from __future__ import annotations
 
 from collections import defaultdict
-from collections.abc import Callable, Iterable, Sequence
+from collections.abc import Callable, Hashable, Iterable, Sequence
 import dataclasses
 from datetime import datetime, timedelta
 from functools import lru_cache, partial
@@ -11,9 +11,11 @@ from itertools import chain, groupby
 import logging
 from operator import itemgetter
 import re
+import threading
 from time import time as time_time
-from typing import TYPE_CHECKING, Any, Literal, TypedDict, cast
+from typing import TYPE_CHECKING, Any, Literal, NamedTuple, TypedDict, cast
 
+from lru import LRU
 from sqlalchemy import Select, and_, bindparam, func, lambda_stmt, select, text
 from sqlalchemy.engine.row import Row
 from sqlalchemy.exc import SQLAlchemyError
@@ -75,6 +77,13 @@ from .models import (
     datetime_to_timestamp_or_none,
     process_timestamp,
 )
+from .statistics_archive import (
+    ArchivedStatistic,
+    archived_statistics_before,
+    archived_statistics_during_period,
+    last_archived_statistics,
+    update_archived_statistics,
+)
 from .util import (
     execute,
     execute_stmt_lambda_element,
@@ -165,6 +174,11 @@ UNIT_CLASSES = {
 }
 
 DATA_SHORT_TERM_STATISTICS_RUN_CACHE = "recorder_short_term_statistics_run_cache"
+DATA_HOURLY_STATISTICS_ROLLUP = "recorder_hourly_statistics_rollup"
+DATA_REDUCED_STATISTICS_CACHE = "recorder_reduced_statistics_cache"
+
+# Number of statistics reduced to days, weeks or months to keep in memory
+REDUCED_STATISTICS_CACHE_SIZE = 1024
 
 
 def mean(values: list[float]) -> float | None:
@@ -208,6 +222,140 @@ class ShortTermStatisticsRunCache:
         self._latest_id_by_metadata_id.update(metadata_id_to_id)
 
 
+@dataclasses.dataclass(slots=True)
+class HourlyStatisticsRollup:
+    """Roll up the short term statistics of the hour being compiled.
+
+    The short term statistics compiled for each 5-minute period are kept
+    until the hour is complete, so the hourly statistics can be written
+    without querying the statistics_short_term table. Hours which were not
+    compiled period by period are summarized from the database.
+    """
+
+    _start_ts: float | None = None
+    # This is a mapping of period start_ts to the short term statistics
+    # compiled for the period by metadata_id
+    _periods: dict[float, dict[int, StatisticData]] = dataclasses.field(
+        default_factory=dict
+    )
+
+    def add_period(
+        self,
+        hour_start_ts: float,
+        period_start_ts: float,
+        stats: dict[int, StatisticData],
+    ) -> None:
+        """Add the short term statistics compiled for a period."""
+        if hour_start_ts != self._start_ts:
+            self._start_ts = hour_start_ts
+            self._periods = {}
+        self._periods[period_start_ts] = stats
+
+    def clear(self) -> None:
+        """Forget the rolled up statistics.
+
+        Called when short term statistics are changed other than by compiling
+        them, the current hour will then be summarized from the database.
+        """
+        self._start_ts = None
+        self._periods = {}
+
+    def summarize(
+        self, hour_start_ts: float
+    ) -> dict[int, StatisticDataTimestamp] | None:
+        """Return the hourly statistics of an hour.
+
+        Returns None unless every 5-minute period of the hour was added.
+        """
+        if hour_start_ts != self._start_ts or len(self._periods) != int(
+            Statistics.duration / StatisticsShortTerm.duration
+        ):
+            return None
+        periods = [self._periods[start_ts] for start_ts in sorted(self._periods)]
+        summary: dict[int, StatisticDataTimestamp] = {}
+        for metadata_id in sorted({metadata_id for p in periods for metadata_id in p}):
+            stats = [period[metadata_id] for period in periods if metadata_id in period]
+            means = [v for stat in stats if (v := stat.get("mean")) is not None]
+            # The sum is taken from the last period
+            last_stat = stats[-1]
+            summary[metadata_id] = cast(
+                StatisticDataTimestamp,
+                {
+                    "start_ts": hour_start_ts,
+                    "mean": mean(means) if means else None,
+                    "min": min(
+                        (v for stat in stats if (v := stat.get("min")) is not None),
+                        default=None,
+                    ),
+                    "max": max(
+                        (v for stat in stats if (v := stat.get("max")) is not None),
+                        default=None,
+                    ),
+                    "last_reset_ts": datetime_to_timestamp_or_none(
+                        last_stat.get("last_reset")
+                    ),
+                    "state": last_stat.get("state"),
+                    "sum": last_stat.get("sum"),
+                },
+            )
+        return summary
+
+
+@dataclasses.dataclass(slots=True)
+class ReducedStatistics:
+    """Statistics of a statistic reduced to periods between start_ts and end_ts."""
+
+    start_ts: float
+    end_ts: float
+    rows: list[StatisticsRow]
+
+
+class ReducedStatisticsCache:
+    """Cache for hourly statistics reduced to days, weeks or months.
+
+    Only periods which ended before the newest compiled hour are cached, the
+    statistics of those periods are not changed by compiling statistics.
+    The cache is cleared when statistics are changed in any other way.
+
+    The cache is used from the recorder thread and from database reader
+    threads, so it is guarded by a lock.
+    """
+
+    def __init__(self) -> None:
+        """Initialize the cache."""
+        # End of the newest hour for which all hourly statistics are compiled,
+        # None until missing statistics have been compiled
+        self.compiled_until_ts: float | None = None
+        # Incremented when the cache is cleared, reduced statistics fetched
+        # before that are not added to the cache
+        self.generation = 0
+        self._reduced: LRU[Hashable, ReducedStatistics] = LRU(
+            REDUCED_STATISTICS_CACHE_SIZE
+        )
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable) -> ReducedStatistics | None:
+        """Return cached reduced statistics."""
+        with self._lock:
+            return self._reduced.get(key)
+
+    def set(self, key: Hashable, generation: int, reduced: ReducedStatistics) -> None:
+        """Cache reduced statistics fetched during generation."""
+        with self._lock:
+            if generation == self.generation:
+                self._reduced[key] = reduced
+
+    def clear(self) -> None:
+        """Clear the cache after statistics were changed."""
+        with self._lock:
+            self.generation += 1
+            self._reduced.clear()
+
+    def set_compiled_until(self, compiled_until_ts: float) -> None:
+        """Set the end of the newest hour with compiled statistics."""
+        self.compiled_until_ts = max(compiled_until_ts, self.compiled_until_ts or 0)
+
+
 class BaseStatisticsRow(TypedDict, total=False):
     """A processed row of statistic data."""
 
@@ -397,18 +545,10 @@ def _compile_hourly_statistics_last_sum_stmt(
     )
 
 
-def _compile_hourly_statistics(session: Session, start: datetime) -> None:
-    """Compile hourly statistics.
-
-    This will summarize 5-minute statistics for one hour:
-    - average, min max is computed by a database query
-    - sum is taken from the last 5-minute entry during the hour
-    """
-    start_time = start.replace(minute=0)
-    start_time_ts = start_time.timestamp()
-    end_time = start_time + Statistics.duration
-    end_time_ts = end_time.timestamp()
-
+def _compile_hourly_statistics_summary(
+    session: Session, start_time_ts: float, end_time_ts: float
+) -> dict[int, StatisticDataTimestamp]:
+    """Summarize the 5-minute statistics of an hour from the database."""
     # Compute last hour's average, min, max
     summary: dict[int, StatisticDataTimestamp] = {}
     stmt = _compile_hourly_statistics_summary_mean_stmt(start_time_ts, end_time_ts)
@@ -447,6 +587,29 @@ def _compile_hourly_statistics(session: Session, start: datetime) -> None:
                     "sum": _sum,
                 }
 
+    return summary
+
+
+def _compile_hourly_statistics(
+    session: Session, start: datetime, rollup: HourlyStatisticsRollup
+) -> None:
+    """Compile hourly statistics.
+
+    This will summarize 5-minute statistics for one hour:
+    - average, min max is computed from the rolled up 5-minute statistics
+      if all of them were compiled since started, otherwise by a database query
+    - sum is taken from the last 5-minute entry during the hour
+    """
+    start_time = start.replace(minute=0)
+    start_time_ts = start_time.timestamp()
+    end_time = start_time + Statistics.duration
+    end_time_ts = end_time.timestamp()
+
+    if (summary := rollup.summarize(start_time_ts)) is None:
+        summary = _compile_hourly_statistics_summary(
+            session, start_time_ts, end_time_ts
+        )
+
     # Insert compiled hourly statistics in the database
     now_timestamp = time_time()
     session.add_all(
@@ -455,6 +618,25 @@ def _compile_hourly_statistics(session: Session, start: datetime) -> None:
     )
 
 
+def _filter_compile_statistics_error(
+    instance: Recorder,
+) -> Callable[[Exception], bool]:
+    """Forget the rolled up statistics if compiling statistics fails.
+
+    The rolled up statistics may otherwise hold statistics which were
+    never committed.
+    """
+    unique_constraint_error_filter = filter_unique_constraint_integrity_error(
+        instance, "statistic"
+    )
+
+    def _filter_error(err: Exception) -> bool:
+        get_hourly_statistics_rollup(instance.hass).clear()
+        return unique_constraint_error_filter(err)
+
+    return _filter_error
+
+
 @retryable_database_job("compile missing statistics")
 def compile_missing_statistics(instance: Recorder) -> bool:
     """Compile missing statistics."""
@@ -469,9 +651,7 @@ def compile_missing_statistics(instance: Recorder) -> bool:
 
     with session_scope(
         session=instance.get_session(),
-        exception_filter=filter_unique_constraint_integrity_error(
-            instance, "statistic"
-        ),
+        exception_filter=_filter_compile_statistics_error(instance),
     ) as session:
         # Find the newest statistics run, if any
         if last_run := session.query(func.max(StatisticsRuns.start)).scalar():
@@ -493,6 +673,10 @@ def compile_missing_statistics(instance: Recorder) -> bool:
                 periods_without_commit = 0
             start = end
 
+    # Hourly statistics are now compiled for every hour before the last period
+    get_reduced_statistics_cache(instance.hass).set_compiled_until(
+        last_period.replace(minute=0).timestamp()
+    )
     return True
 
 
@@ -511,14 +695,18 @@ def compile_statistics(instance: Recorder, start: datetime, fire_events: bool) -
     # Return if we already have 5-minute statistics for the requested period
     with session_scope(
         session=instance.get_session(),
-        exception_filter=filter_unique_constraint_integrity_error(
-            instance, "statistic"
-        ),
+        exception_filter=_filter_compile_statistics_error(instance),
     ) as session:
         modified_statistic_ids = _compile_statistics(
             instance, session, start, fire_events
         )
 
+    reduced_statistics_cache = get_reduced_statistics_cache(instance.hass)
+    if start.minute == 55 and reduced_statistics_cache.compiled_until_ts is not None:
+        reduced_statistics_cache.set_compiled_until(
+            (start + StatisticsShortTerm.duration).timestamp()
+        )
+
     if modified_statistic_ids:
         # In the rare case that we have modified statistic_ids, we reload the modified
         # statistics meta data into the cache in a fresh session to ensure that the
@@ -536,7 +724,10 @@ def _get_first_id_stmt(start: datetime) -> StatementLambdaElement:
 
 
 def _compile_statistics(
-    instance: Recorder, session: Session, start: datetime, fire_events: bool
+    instance: Recorder,
+    session: Session,
+    start: datetime,
+    fire_events: bool,
 ) -> set[str]:
     """Compile 5-minute statistics for all integrations with a recorder platform.
 
@@ -580,6 +771,7 @@ def _compile_statistics(
         current_metadata.update(compiled.current_metadata)
 
     new_short_term_stats: list[StatisticsBase] = []
+    period_stats: dict[int, StatisticData] = {}
     updated_metadata_ids: set[int] = set()
     now_timestamp = time_time()
     # Insert collected statistics in the database
@@ -594,6 +786,12 @@ def _compile_statistics(
             session, StatisticsShortTerm, metadata_id, stats["stat"], now_timestamp
         ):
             new_short_term_stats.append(new_stat)
+            period_stats[metadata_id] = stats["stat"]
+
+    hourly_rollup = get_hourly_statistics_rollup(instance.hass)
+    hourly_rollup.add_period(
+        start.replace(minute=0).timestamp(), start.timestamp(), period_stats
+    )
 
     if start.minute == 50:
         # Once every hour, update issues
@@ -608,7 +806,7 @@ def _compile_statistics(
 
     if start.minute == 55:
         # A full hour is ready, summarize it
-        _compile_hourly_statistics(session, start)
+        _compile_hourly_statistics(session, start, hourly_rollup)
 
     session.add(StatisticsRuns(start=start))
 
@@ -655,6 +853,13 @@ def _adjust_sum_statistics(
             },
             synchronize_session=False,
         )
+        if table is Statistics:
+            update_archived_statistics(
+                session,
+                metadata_id,
+                start_time_ts,
+                lambda row: row if row.sum is None else row._replace(sum=row.sum + adj),
+            )
     except SQLAlchemyError:
         _LOGGER.exception(
             "Unexpected exception when updating statistics %s",
@@ -754,8 +959,10 @@ def get_metadata(
 
 def clear_statistics(instance: Recorder, statistic_ids: list[str]) -> None:
     """Clear statistics for a list of statistic_ids."""
+    get_hourly_statistics_rollup(instance.hass).clear()
     with session_scope(session=instance.get_session()) as session:
         instance.statistics_meta_manager.delete(session, statistic_ids)
+    get_reduced_statistics_cache(instance.hass).clear()
 
 
 def update_statistics_metadata(
@@ -1145,6 +1352,67 @@ def _generate_statistics_during_period_stmt(
     return stmt
 
 
+def _fetch_statistics_during_period(
+    session: Session,
+    start_time: datetime,
+    end_time: datetime | None,
+    metadata_ids: list[int] | None,
+    table: type[StatisticsBase],
+    types: set[Literal["last_reset", "max", "mean", "min", "state", "sum"]],
+) -> Sequence[Row]:
+    """Return the statistics rows during a period, including archived statistics.
+
+    The rows are sorted by metadata_id and start_ts.
+    """
+    stmt = _generate_statistics_during_period_stmt(
+        start_time, end_time, metadata_ids, table, types
+    )
+    stats = cast(
+        Sequence[Row], execute_stmt_lambda_element(session, stmt, orm_rows=False)
+    )
+    if table is not Statistics or not (
+        archived := archived_statistics_during_period(
+            session,
+            start_time.timestamp(),
+            end_time.timestamp() if end_time is not None else None,
+            metadata_ids,
+        )
+    ):
+        return stats
+    archived_row, indices = _archived_statistics_row_factory(frozenset(types))
+    rows: dict[tuple[int, float], Row] = {
+        (metadata_id, archived_stat.start_ts): archived_row(
+            metadata_id,
+            archived_stat.start_ts,
+            *(archived_stat[idx] for idx in indices),
+        )
+        for metadata_id, archived_stats in archived.items()
+        for archived_stat in archived_stats
+    }
+    # Statistics imported after their month was archived replace the
+    # archived statistics until the month is archived again
+    rows.update(((row[0], row[1]), row) for row in stats)
+    return [rows[key] for key in sorted(rows)]
+
+
+@lru_cache(maxsize=16)
+def _archived_statistics_row_factory(
+    types: Iterable[str],
+) -> tuple[type[tuple], tuple[int, ...]]:
+    """Return a row type for archived statistics matching the selected columns.
+
+    Also returns the indices of the columns in ArchivedStatistic.
+    """
+    columns = [column for key, column in _type_column_mapping.items() if key in types]
+    return (
+        NamedTuple(  # type: ignore[misc]
+            "ArchivedStatisticsRow",
+            [(column, Any) for column in ("metadata_id", "start_ts", *columns)],
+        ),
+        tuple(ArchivedStatistic._fields.index(column) for column in columns),
+    )
+
+
 def _generate_max_mean_min_statistic_in_sub_period_stmt(
     columns: Select,
     start_time: datetime | None,
@@ -1185,6 +1453,10 @@ def _get_max_mean_min_statistic_in_sub_period(
         columns, start_time, end_time, table, metadata_id
     )
     stats = cast(Sequence[Row[Any]], execute_stmt_lambda_element(session, stmt))
+    if table is Statistics:
+        _get_max_mean_min_archived_statistic_in_sub_period(
+            session, result, start_time, end_time, types, metadata_id
+        )
     if not stats:
         return
     if "max" in types and (new_max := stats[0].max) is not None:
@@ -1200,6 +1472,48 @@ def _get_max_mean_min_statistic_in_sub_period(
         result["min"] = min(new_min, old_min) if old_min is not None else new_min
 
 
+def _get_max_mean_min_archived_statistic_in_sub_period(
+    session: Session,
+    result: dict[str, float],
+    start_time: datetime | None,
+    end_time: datetime | None,
+    types: set[Literal["max", "mean", "min", "change"]],
+    metadata_id: int,
+) -> None:
+    """Add the archived hourly statistics to max, mean and min during the period."""
+    if not (
+        archived := _drop_replaced_archived_statistics(
+            session,
+            metadata_id,
+            archived_statistics_during_period(
+                session,
+                start_time.timestamp() if start_time is not None else None,
+                end_time.timestamp() if end_time is not None else None,
+                (metadata_id,),
+            ).get(metadata_id, []),
+        )
+    ):
+        return
+    if "max" in types and (
+        maxes := [row.max for row in archived if row.max is not None]
+    ):
+        old_max = result.get("max")
+        new_max = max(maxes)
+        result["max"] = max(new_max, old_max) if old_max is not None else new_max
+    if "mean" in types and (
+        means := [row.mean for row in archived if row.mean is not None]
+    ):
+        duration = Statistics.duration.total_seconds()
+        result["duration"] = result.get("duration", 0.0) + len(means) * duration
+        result["mean_acc"] = result.get("mean_acc", 0.0) + sum(means) * duration
+    if "min" in types and (
+        mins := [row.min for row in archived if row.min is not None]
+    ):
+        old_min = result.get("min")
+        new_min = min(mins)
+        result["min"] = min(new_min, old_min) if old_min is not None else new_min
+
+
 def _get_max_mean_min_statistic(
     session: Session,
     head_start_time: datetime | None,
@@ -1266,6 +1580,29 @@ def _get_max_mean_min_statistic(
     return result
 
 
+def _drop_replaced_archived_statistics(
+    session: Session, metadata_id: int, archived: list[ArchivedStatistic]
+) -> list[ArchivedStatistic]:
+    """Drop the archived statistics replaced by statistics in the table.
+
+    Statistics imported after their month was archived replace the archived
+    statistics with the same start time until the month is archived again.
+    """
+    if not archived:
+        return archived
+    replaced = set(
+        session.execute(
+            select(Statistics.start_ts)
+            .where(Statistics.metadata_id == metadata_id)
+            .where(Statistics.start_ts >= archived[0].start_ts)
+            .where(Statistics.start_ts <= archived[-1].start_ts)
+        ).scalars()
+    )
+    if not replaced:
+        return archived
+    return [row for row in archived if row.start_ts not in replaced]
+
+
 def _first_statistic(
     session: Session,
     table: type[StatisticsBase],
@@ -1278,9 +1615,16 @@ def _first_statistic(
         .order_by(table.start_ts.asc())
         .limit(1)
     )
+    first_ts: float | None = None
     if stats := cast(Sequence[Row], execute_stmt_lambda_element(session, stmt)):
-        return dt_util.utc_from_timestamp(stats[0].start_ts)
-    return None
+        first_ts = stats[0].start_ts
+    if table is Statistics and (
+        archived := archived_statistics_during_period(
+            session, None, first_ts, (metadata_id,)
+        ).get(metadata_id)
+    ):
+        first_ts = archived[0].start_ts
+    return dt_util.utc_from_timestamp(first_ts) if first_ts is not None else None
 
 
 def _last_statistic(
@@ -1295,9 +1639,18 @@ def _last_statistic(
         .order_by(table.start_ts.desc())
         .limit(1)
     )
+    last_ts: float | None = None
     if stats := cast(Sequence[Row], execute_stmt_lambda_element(session, stmt)):
-        return dt_util.utc_from_timestamp(stats[0].start_ts)
-    return None
+        last_ts = stats[0].start_ts
+    if table is Statistics and (
+        archived := last_archived_statistics(session, metadata_id, 1, last_ts)
+    ):
+        last_ts = (
+            max(last_ts, archived[0].start_ts)
+            if last_ts is not None
+            else archived[0].start_ts
+        )
+    return dt_util.utc_from_timestamp(last_ts) if last_ts is not None else None
 
 
 def _get_oldest_sum_statistic(
@@ -1320,12 +1673,13 @@ def _get_oldest_sum_statistic(
     ) -> float | None:
         """Return the oldest non-NULL sum during the period."""
         stmt = lambda_stmt(
-            lambda: select(table.sum)
+            lambda: select(table.start_ts, table.sum)
             .filter(table.metadata_id == metadata_id)
             .filter(table.sum.is_not(None))
             .order_by(table.start_ts.asc())
             .limit(1)
         )
+        prev_period_ts: float | None = None
         if start_time is not None:
             start_time = start_time + table.duration - timedelta.resolution
             if table == StatisticsShortTerm:
@@ -1337,6 +1691,20 @@ def _get_oldest_sum_statistic(
             prev_period_ts = prev_period.timestamp()
             stmt += lambda q: q.filter(table.start_ts >= prev_period_ts)
         stats = cast(Sequence[Row], execute_stmt_lambda_element(session, stmt))
+        if table is Statistics:
+            # Archived statistics older than the oldest sum in the table
+            for row in _drop_replaced_archived_statistics(
+                session,
+                metadata_id,
+                archived_statistics_during_period(
+                    session,
+                    prev_period_ts,
+                    stats[0].start_ts if stats else None,
+                    (metadata_id,),
+                ).get(metadata_id, []),
+            ):
+                if row.sum is not None:
+                    return row.sum
         return stats[0].sum if stats else None
 
     oldest_sum: float | None = None
@@ -1414,6 +1782,7 @@ def _get_newest_sum_statistic(
         """Return the newest non-NULL sum during the period."""
         stmt = lambda_stmt(
             lambda: select(
+                table.start_ts,
                 table.sum,
             )
             .filter(table.metadata_id == metadata_id)
@@ -1428,7 +1797,26 @@ def _get_newest_sum_statistic(
             end_time_ts = end_time.timestamp()
             stmt += lambda q: q.filter(table.start_ts < end_time_ts)
         stats = cast(Sequence[Row], execute_stmt_lambda_element(session, stmt))
-
+        if table is Statistics:
+            # Archived statistics newer than the newest sum in the table
+            newest_ts: float | None = None
+            if stats:
+                newest_ts = stats[0].start_ts
+            elif start_time is not None:
+                newest_ts = start_time.timestamp()
+            archived = archived_statistics_during_period(
+                session,
+                newest_ts,
+                end_time.timestamp() if end_time is not None else None,
+                (metadata_id,),
+            ).get(metadata_id, [])
+            if stats:
+                archived = [row for row in archived if row.start_ts > newest_ts]
+            for row in reversed(
+                _drop_replaced_archived_statistics(session, metadata_id, archived)
+            ):
+                if row.sum is not None:
+                    return row.sum
         return stats[0].sum if stats else None
 
     newest_sum: float | None = None
@@ -1707,6 +2095,159 @@ def _augment_result_with_change(
             prev_sum = _sum
 
 
+_REDUCE_PERIODS: dict[
+    str,
+    tuple[
+        Callable[
+            [],
+            tuple[
+                Callable[[float, float], bool],
+                Callable[[float], tuple[float, float]],
+            ],
+        ],
+        timedelta,
+    ],
+] = {
+    "day": (reduce_day_ts_factory, timedelta(days=1)),
+    "week": (reduce_week_ts_factory, timedelta(days=7)),
+    "month": (reduce_month_ts_factory, timedelta(days=31)),
+}
+
+
+def _reduced_statistics_during_period(
+    hass: HomeAssistant,
+    session: Session,
+    start_time: datetime,
+    end_time: datetime | None,
+    statistic_ids: set[str],
+    metadata: dict[str, tuple[int, StatisticMetaData]],
+    metadata_ids: list[int],
+    period: Literal["day", "week", "month"],
+    units: dict[str, str] | None,
+    types: set[Literal["last_reset", "max", "mean", "min", "state", "sum"]],
+) -> dict[str, list[StatisticsRow]]:
+    """Return hourly statistics reduced to days, weeks or months.
+
+    start_time and end_time must be aligned with the period. Reduced statistics
+    of periods which are compiled are taken from the cache, only the hourly
+    statistics after them are fetched from the database and reduced.
+    """
+    cache = get_reduced_statistics_cache(hass)
+    generation = cache.generation
+    period_factory, period_duration = _REDUCE_PERIODS[period]
+    same_period, period_start_end = period_factory()
+    start_time_ts = start_time.timestamp()
+    end_time_ts = end_time.timestamp() if end_time else None
+    # Periods before complete_until_ts are compiled and can be cached
+    complete_until_ts: float | None = None
+    if (compiled_until_ts := cache.compiled_until_ts) is not None:
+        complete_until_ts = period_start_end(compiled_until_ts)[0]
+        if end_time_ts is not None:
+            complete_until_ts = min(complete_until_ts, end_time_ts)
+
+    metadata_by_id = dict(metadata.values())
+    time_zone = dt_util.get_default_time_zone()
+    frozen_types = frozenset(types)
+    frozen_units = frozenset(units.items()) if units else None
+    cached: dict[int, ReducedStatistics] = {}
+    fetch_from: defaultdict[float, list[int]] = defaultdict(list)
+    cache_keys: dict[int, Hashable] = {}
+    for metadata_id in metadata_ids:
+        statistic_id = metadata_by_id[metadata_id]["statistic_id"]
+        state_unit = unit = metadata_by_id[metadata_id]["unit_of_measurement"]
+        if state := hass.states.get(statistic_id):
+            state_unit = state.attributes.get(ATTR_UNIT_OF_MEASUREMENT)
+        # The reduced statistics depend on the time zone and the units they
+        # are converted to
+        cache_keys[metadata_id] = key = (
+            metadata_id,
+            period,
+            time_zone,
+            frozen_types,
+            unit,
+            state_unit,
+            frozen_units,
+        )
+        if (reduced := cache.get(key)) and (
+            reduced.start_ts <= start_time_ts <= reduced.end_ts
+        ):
+            cached[metadata_id] = reduced
+            if end_time_ts is None or reduced.end_ts < end_time_ts:
+                fetch_from[reduced.end_ts].append(metadata_id)
+        else:
+            fetch_from[start_time_ts].append(metadata_id)
+
+    fetched: dict[str, list[StatisticsRow]] = {}
+    for fetch_start_ts, fetch_metadata_ids in fetch_from.items():
+        if stats := _fetch_statistics_during_period(
+            session,
+            dt_util.utc_from_timestamp(fetch_start_ts),
+            end_time,
+            fetch_metadata_ids,
+            Statistics,
+            types,
+        ):
+            fetched.update(
+                _reduce_statistics(
+                    _sorted_statistics_to_dict(
+                        hass, stats, None, metadata, True, Statistics, units, types
+                    ),
+                    same_period,
+                    period_start_end,
+                    period_duration,
+                    types,
+                )
+            )
+
+    result: dict[str, list[StatisticsRow]] = {}
+    for metadata_id in metadata_ids:
+        statistic_id = metadata_by_id[metadata_id]["statistic_id"]
+        fetched_rows = fetched.get(statistic_id, [])
+        rows: list[StatisticsRow] = []
+        if reduced := cached.get(metadata_id):
+            # The rows are changed by the caller, they must be copied
+            rows.extend(
+                cast(StatisticsRow, row.copy())
+                for row in reduced.rows
+                if row["start"] >= start_time_ts
+                and (end_time_ts is None or row["start"] < end_time_ts)
+            )
+        rows.extend(fetched_rows)
+        if rows:
+            result[statistic_id] = rows
+
+        if complete_until_ts is None:
+            continue
+        # Add the fetched rows of compiled periods to the cache
+        reduced_start_ts = reduced.start_ts if reduced else start_time_ts
+        reduced_end_ts = reduced.end_ts if reduced else start_time_ts
+        if complete_until_ts <= reduced_end_ts:
+            continue
+        cache.set(
+            cache_keys[metadata_id],
+            generation,
+            ReducedStatistics(
+                reduced_start_ts,
+                complete_until_ts,
+                [
+                    *(reduced.rows if reduced else ()),
+                    *(
+                        cast(StatisticsRow, row.copy())
+                        for row in fetched_rows
+                        if row["end"] <= complete_until_ts
+                    ),
+                ],
+            ),
+        )
+
+    # Keep the order of the requested statistic_ids
+    return {
+        statistic_id: result[statistic_id]
+        for statistic_id in statistic_ids
+        if statistic_id in result
+    }
+
+
 def _statistics_during_period_with_session(
     hass: HomeAssistant,
     session: Session,
@@ -1777,35 +2318,48 @@ def _statistics_during_period_with_session(
     table: type[Statistics | StatisticsShortTerm] = (
         Statistics if period != "5minute" else StatisticsShortTerm
     )
-    stmt = _generate_statistics_during_period_stmt(
-        start_time, end_time, metadata_ids, table, types
-    )
-    stats = cast(
-        Sequence[Row], execute_stmt_lambda_element(session, stmt, orm_rows=False)
-    )
+    if period in ("day", "week", "month") and statistic_ids and metadata_ids:
+        result = _reduced_statistics_during_period(
+            hass,
+            session,
+            start_time,
+            end_time,
+            statistic_ids,
+            metadata,
+            metadata_ids,
+            period,
+            units,
+            types,
+        )
+        if not result:
+            return {}
+    else:
+        stats = _fetch_statistics_during_period(
+            session, start_time, end_time, metadata_ids, table, types
+        )
 
-    if not stats:
-        return {}
+        if not stats:
+            return {}
 
-    result = _sorted_statistics_to_dict(
-        hass,
-        stats,
-        statistic_ids,
-        metadata,
-        True,
-        table,
-        units,
-        types,
-    )
+        result = _sorted_statistics_to_dict(
+            hass,
+            stats,
+            statistic_ids,
+            metadata,
+            True,
+            table,
+            units,
+            types,
+        )
 
-    if period == "day":
-        result = _reduce_statistics_per_day(result, types)
+        if period == "day":
+            result = _reduce_statistics_per_day(result, types)
 
-    if period == "week":
-        result = _reduce_statistics_per_week(result, types)
+        if period == "week":
+            result = _reduce_statistics_per_week(result, types)
 
-    if period == "month":
-        result = _reduce_statistics_per_month(result, types)
+        if period == "month":
+            result = _reduce_statistics_per_month(result, types)
 
     if "change" in _types:
         _augment_result_with_change(
@@ -1898,6 +2452,10 @@ def _get_last_statistics(
         stats = cast(
             Sequence[Row], execute_stmt_lambda_element(session, stmt, orm_rows=False)
         )
+        if table is Statistics:
+            stats = _merge_last_archived_statistics(
+                session, stats, metadata_id, number_of_stats
+            )
 
         if not stats:
             return {}
@@ -1915,6 +2473,45 @@ def _get_last_statistics(
         )
 
 
+# Archived statistics with the columns of QUERY_STATISTICS
+_ArchivedLastStatisticsRow = NamedTuple(  # type: ignore[misc]
+    "_ArchivedLastStatisticsRow",
+    [(column, Any) for column in ("metadata_id", *ArchivedStatistic._fields)],
+)
+
+
+def _merge_last_archived_statistics(
+    session: Session,
+    stats: Sequence[Row],
+    metadata_id: int,
+    number_of_stats: int,
+) -> Sequence[Row]:
+    """Merge the last archived statistics into the last statistics.
+
+    The rows are sorted by start_ts, newest first. Archived statistics can only
+    be among the last ones if fewer statistics were found in the table or if
+    they are newer than the oldest statistic found.
+    """
+    if not (
+        archived := last_archived_statistics(
+            session,
+            metadata_id,
+            number_of_stats,
+            stats[-1].start_ts if stats and len(stats) == number_of_stats else None,
+        )
+    ):
+        return stats
+    rows: dict[float, Row] = {
+        archived_stat.start_ts: _ArchivedLastStatisticsRow(metadata_id, *archived_stat)
+        for archived_stat in archived
+    }
+    # Statistics imported after their month was archived replace the
+    # archived statistics until the month is archived again
+    rows.update((row.start_ts, row) for row in stats)
+    last_start_ts = sorted(rows, reverse=True)[:number_of_stats]
+    return [rows[start_ts] for start_ts in last_start_ts]
+
+
 def get_last_statistics(
     hass: HomeAssistant,
     number_of_stats: int,
@@ -2078,7 +2675,25 @@ def _statistics_at_time(
     """Return last known statistics, earlier than start_time, for the metadata_ids."""
     start_time_ts = start_time.timestamp()
     stmt = _generate_statistics_at_time_stmt(table, metadata_ids, start_time_ts, types)
-    return cast(Sequence[Row], execute_stmt_lambda_element(session, stmt))
+    stats = cast(Sequence[Row], execute_stmt_lambda_element(session, stmt))
+    if table is not Statistics or not (
+        archived := archived_statistics_before(session, metadata_ids, start_time_ts)
+    ):
+        return stats
+    archived_row, indices = _archived_statistics_row_factory(frozenset(types))
+    rows: dict[int, Row] = {
+        metadata_id: archived_row(
+            metadata_id,
+            archived_stat.start_ts,
+            *(archived_stat[idx] for idx in indices),
+        )
+        for metadata_id, archived_stat in archived.items()
+    }
+    for row in stats:
+        # Statistics imported after their month was archived may be older
+        if row.metadata_id not in rows or row.start_ts > rows[row.metadata_id][1]:
+            rows[row.metadata_id] = row
+    return list(rows.values())
 
 
 def _build_sum_converted_stats(
@@ -2370,6 +2985,7 @@ def _import_statistics_with_session(
     if table != StatisticsShortTerm:
         return True
 
+    get_hourly_statistics_rollup(instance.hass).clear()
     # We just inserted new short term statistics, so we need to update the
     # ShortTermStatisticsRunCache with the latest id for the metadata_id
     run_cache = get_short_term_statistics_run_cache(instance.hass)
@@ -2388,6 +3004,18 @@ def get_short_term_statistics_run_cache(
     return ShortTermStatisticsRunCache()
 
 
+@singleton(DATA_HOURLY_STATISTICS_ROLLUP)
+def get_hourly_statistics_rollup(hass: HomeAssistant) -> HourlyStatisticsRollup:
+    """Get the hourly statistics rollup."""
+    return HourlyStatisticsRollup()
+
+
+@singleton(DATA_REDUCED_STATISTICS_CACHE)
+def get_reduced_statistics_cache(hass: HomeAssistant) -> ReducedStatisticsCache:
+    """Get the reduced statistics cache."""
+    return ReducedStatisticsCache()
+
+
 def cache_latest_short_term_statistic_id_for_metadata_id(
     run_cache: ShortTermStatisticsRunCache,
     session: Session,
@@ -2453,9 +3081,11 @@ def import_statistics(
             instance, "statistic"
         ),
     ) as session:
-        return _import_statistics_with_session(
+        imported = _import_statistics_with_session(
             instance, session, metadata, statistics, table
         )
+    get_reduced_statistics_cache(instance.hass).clear()
+    return imported
 
 
 @retryable_database_job("adjust_statistics")
@@ -2481,6 +3111,7 @@ def adjust_statistics(
         ):
             sum_adjustment = convert(sum_adjustment)
 
+        get_hourly_statistics_rollup(instance.hass).clear()
         _adjust_sum_statistics(
             session,
             StatisticsShortTerm,
@@ -2496,6 +3127,7 @@ def adjust_statistics(
             start_time.replace(minute=0),
             sum_adjustment,
         )
+    get_reduced_statistics_cache(instance.hass).clear()
 
     return True
 
@@ -2521,6 +3153,19 @@ def _change_statistics_unit_for_table(
             },
             synchronize_session=False,
         )
+    if table is Statistics:
+        update_archived_statistics(
+            session,
+            metadata_id,
+            None,
+            lambda row: row._replace(
+                mean=convert(row.mean),
+                min=convert(row.min),
+                max=convert(row.max),
+                state=convert(row.state),
+                sum=convert(row.sum),
+            ),
+        )
 
 
 def change_statistics_unit(
@@ -2558,12 +3203,14 @@ def change_statistics_unit(
             Statistics,
             StatisticsShortTerm,
         )
+        get_hourly_statistics_rollup(instance.hass).clear()
         for table in tables:
             _change_statistics_unit_for_table(session, table, metadata_id, convert)
 
         statistics_meta_manager.update_unit_of_measurement(
             session, statistic_id, new_unit
         )
+    get_reduced_statistics_cache(instance.hass).clear()
 
 
 @callback
@@ -0,0 +1,307 @@
+"""Archive of old hourly statistics in compressed monthly blocks.
+
+Hourly statistics older than the archive horizon are moved from the statistics
+table to one block per statistic and month in the statistics_archive table.
+The start times of a block are delta encoded and each column is stored as the
+XOR of the IEEE 754 bits of consecutive values, which leaves mostly zero bytes
+for slowly changing values, before the block is compressed.
+"""
+
+from __future__ import annotations
+
+from collections import defaultdict
+from collections.abc import Callable, Iterable
+from datetime import datetime, timedelta
+from itertools import accumulate, pairwise
+import logging
+from operator import xor
+import struct
+from typing import TYPE_CHECKING, NamedTuple
+import zlib
+
+from sqlalchemy import delete, func, select
+from sqlalchemy.orm.session import Session
+
+from homeassistant.util import dt as dt_util
+
+from .db_schema import Statistics, StatisticsArchive
+from .util import session_scope
+
+if TYPE_CHECKING:
+    from . import Recorder
+
+_LOGGER = logging.getLogger(__name__)
+
+# The number of statistics which get a month archived per archive task
+ARCHIVE_BATCH_SIZE = 100
+
+_FORMAT_VERSION = 1
+# Format version, number of rows and start time of the first row
+_HEADER = struct.Struct("<BId")
+
+
+class ArchivedStatistic(NamedTuple):
+    """An hourly statistic decoded from the archive."""
+
+    start_ts: float
+    mean: float | None
+    min: float | None
+    max: float | None
+    last_reset_ts: float | None
+    state: float | None
+    sum: float | None
+
+
+ARCHIVED_COLUMNS = ArchivedStatistic._fields[1:]
+
+
+def _floats_to_bits(values: list[float]) -> tuple[int, ...]:
+    """Return the IEEE 754 bits of floats."""
+    count = len(values)
+    return struct.unpack(f"<{count}Q", struct.pack(f"<{count}d", *values))
+
+
+def _bits_to_floats(bits: Iterable[int], count: int) -> tuple[float, ...]:
+    """Return the floats of IEEE 754 bits."""
+    return struct.unpack(f"<{count}d", struct.pack(f"<{count}Q", *bits))
+
+
+def encode_block(rows: list[ArchivedStatistic]) -> bytes:
+    """Encode statistics sorted by start time into a compressed block.
+
+    The start times must be whole seconds, which they are for hourly statistics.
+    """
+    count = len(rows)
+    parts = [
+        _HEADER.pack(_FORMAT_VERSION, count, rows[0].start_ts),
+        struct.pack(
+            f"<{count - 1}I",
+            *(round(end - start) for start, end in pairwise(row[0] for row in rows)),
+        ),
+    ]
+    for idx in range(1, len(ArchivedStatistic._fields)):
+        values = [row[idx] for row in rows]
+        parts.append(bytes(value is not None for value in values))
+        bits = _floats_to_bits([value for value in values if value is not None])
+        parts.append(
+            struct.pack(
+                f"<{len(bits)}Q",
+                *(value ^ previous for previous, value in pairwise((0, *bits))),
+            )
+        )
+    return zlib.compress(b"".join(parts))
+
+
+def decode_block(data: bytes) -> list[ArchivedStatistic]:
+    """Decode a compressed block into statistics sorted by start time."""
+    payload = zlib.decompress(data)
+    version, count, first_start_ts = _HEADER.unpack_from(payload)
+    if version != _FORMAT_VERSION:
+        raise ValueError(f"Unsupported statistics archive format {version}")
+    offset = _HEADER.size
+    deltas = struct.unpack_from(f"<{count - 1}I", payload, offset)
+    offset += 4 * (count - 1)
+    columns: list[Iterable[float | None]] = [accumulate(deltas, initial=first_start_ts)]
+    for _ in ARCHIVED_COLUMNS:
+        presence = payload[offset : offset + count]
+        offset += count
+        present = sum(presence)
+        xored = struct.unpack_from(f"<{present}Q", payload, offset)
+        offset += 8 * present
+        values = iter(_bits_to_floats(accumulate(xored, xor), present))
+        columns.append([next(values) if flag else None for flag in presence])
+    return list(map(ArchivedStatistic._make, zip(*columns, strict=True)))
+
+
+def _month_start(timestamp: float) -> datetime:
+    """Return the start of the UTC month of a timestamp."""
+    return dt_util.utc_from_timestamp(timestamp).replace(
+        day=1, hour=0, minute=0, second=0, microsecond=0
+    )
+
+
+def _next_month(month_start: datetime) -> datetime:
+    """Return the start of the next month."""
+    return (month_start + timedelta(days=32)).replace(day=1)
+
+
+def archive_horizon(keep_days: int) -> datetime:
+    """Return the start of the month before which statistics are archived.
+
+    Archiving whole months means a block is written once instead of every night.
+    """
+    return _month_start((dt_util.utcnow() - timedelta(days=keep_days)).timestamp())
+
+
+def archive_statistics(instance: Recorder, archive_before: datetime) -> bool:
+    """Move hourly statistics older than archive_before to the archive.
+
+    The oldest month of up to ARCHIVE_BATCH_SIZE statistics is archived per
+    call. Returns True when there is nothing left to archive.
+    """
+    archive_before_ts = archive_before.timestamp()
+    with session_scope(session=instance.get_session()) as session:
+        oldest = session.execute(
+            select(Statistics.metadata_id, func.min(Statistics.start_ts))
+            .where(Statistics.start_ts < archive_before_ts)
+            .group_by(Statistics.metadata_id)
+            .limit(ARCHIVE_BATCH_SIZE)
+        ).all()
+        for metadata_id, oldest_start_ts in oldest:
+            _archive_month(
+                session, metadata_id, _month_start(oldest_start_ts), archive_before_ts
+            )
+    if oldest:
+        _LOGGER.debug("Archived a month of %s statistics", len(oldest))
+    return not oldest
+
+
+def _archive_month(
+    session: Session,
+    metadata_id: int,
+    month_start: datetime,
+    archive_before_ts: float,
+) -> None:
+    """Move the hourly statistics of a month to its block in the archive."""
+    start_ts = month_start.timestamp()
+    month_end_ts = _next_month(month_start).timestamp()
+    end_ts = min(month_end_ts, archive_before_ts)
+    rows = {
+        row[0]: ArchivedStatistic._make(row)
+        for row in session.execute(
+            select(
+                Statistics.start_ts,
+                *(getattr(Statistics, column) for column in ARCHIVED_COLUMNS),
+            )
+            .where(Statistics.metadata_id == metadata_id)
+            .where(Statistics.start_ts >= start_ts)
+            .where(Statistics.start_ts < end_ts)
+        )
+    }
+    block = session.execute(
+        select(StatisticsArchive)
+        .where(StatisticsArchive.metadata_id == metadata_id)
+        .where(StatisticsArchive.start_ts == start_ts)
+    ).scalar_one_or_none()
+    if block is None:
+        session.add(
+            StatisticsArchive(
+                metadata_id=metadata_id,
+                start_ts=start_ts,
+                end_ts=month_end_ts,
+                data=encode_block(sorted(rows.values())),
+            )
+        )
+    else:
+        # Statistics imported after the month was archived replace the
+        # archived statistics with the same start time
+        archived = {row.start_ts: row for row in decode_block(block.data)}
+        archived.update(rows)
+        block.data = encode_block(sorted(archived.values()))
+    session.execute(
+        delete(Statistics)
+        .where(Statistics.metadata_id == metadata_id)
+        .where(Statistics.start_ts >= start_ts)
+        .where(Statistics.start_ts < end_ts)
+        .execution_options(synchronize_session=False)
+    )
+
+
+def archived_statistics_during_period(
+    session: Session,
+    start_ts: float | None,
+    end_ts: float | None,
+    metadata_ids: Iterable[int] | None,
+) -> dict[int, list[ArchivedStatistic]]:
+    """Return the archived statistics starting in a period by metadata_id."""
+    stmt = select(StatisticsArchive.metadata_id, StatisticsArchive.data)
+    if start_ts is not None:
+        stmt = stmt.where(StatisticsArchive.end_ts > start_ts)
+    if end_ts is not None:
+        stmt = stmt.where(StatisticsArchive.start_ts < end_ts)
+    if metadata_ids is not None:
+        stmt = stmt.where(StatisticsArchive.metadata_id.in_(metadata_ids))
+    result: defaultdict[int, list[ArchivedStatistic]] = defaultdict(list)
+    for metadata_id, data in session.execute(
+        stmt.order_by(StatisticsArchive.metadata_id, StatisticsArchive.start_ts)
+    ):
+        result[metadata_id].extend(
+            row
+            for row in decode_block(data)
+            if (start_ts is None or row.start_ts >= start_ts)
+            and (end_ts is None or row.start_ts < end_ts)
+        )
+    return {metadata_id: rows for metadata_id, rows in result.items() if rows}
+
+
+def archived_statistics_before(
+    session: Session, metadata_ids: Iterable[int], before_ts: float
+) -> dict[int, ArchivedStatistic]:
+    """Return the last archived statistic before a time by metadata_id."""
+    blocks = session.execute(
+        select(
+            StatisticsArchive.id,
+            StatisticsArchive.metadata_id,
+        )
+        .where(StatisticsArchive.metadata_id.in_(metadata_ids))
+        .where(StatisticsArchive.start_ts < before_ts)
+        .order_by(StatisticsArchive.metadata_id, StatisticsArchive.start_ts.desc())
+    ).all()
+    result: dict[int, ArchivedStatistic] = {}
+    for block_id, metadata_id in blocks:
+        if metadata_id in result:
+            continue
+        # The statistics of the last block may all start after the time, the
+        # previous block of the metadata_id is decoded then
+        data = session.execute(
+            select(StatisticsArchive.data).where(StatisticsArchive.id == block_id)
+        ).scalar_one()
+        for row in reversed(decode_block(data)):
+            if row.start_ts < before_ts:
+                result[metadata_id] = row
+                break
+    return result
+
+
+def last_archived_statistics(
+    session: Session, metadata_id: int, number_of_stats: int, after_ts: float | None
+) -> list[ArchivedStatistic]:
+    """Return the last archived statistics of a metadata_id, newest first.
+
+    Only blocks ending after after_ts are decoded if it is given.
+    """
+    stmt = select(StatisticsArchive.id).where(
+        StatisticsArchive.metadata_id == metadata_id
+    )
+    if after_ts is not None:
+        stmt = stmt.where(StatisticsArchive.end_ts > after_ts)
+    result: list[ArchivedStatistic] = []
+    for block_id in session.execute(
+        stmt.order_by(StatisticsArchive.start_ts.desc())
+    ).scalars():
+        data = session.execute(
+            select(StatisticsArchive.data).where(StatisticsArchive.id == block_id)
+        ).scalar_one()
+        result.extend(reversed(decode_block(data)))
+        if len(result) >= number_of_stats:
+            break
+    return result[:number_of_stats]
+
+
+def update_archived_statistics(
+    session: Session,
+    metadata_id: int,
+    start_ts: float | None,
+    update: Callable[[ArchivedStatistic], ArchivedStatistic],
+) -> None:
+    """Update the archived statistics of a metadata_id starting from a time."""
+    stmt = select(StatisticsArchive).where(StatisticsArchive.metadata_id == metadata_id)
+    if start_ts is not None:
+        stmt = stmt.where(StatisticsArchive.end_ts > start_ts)
+    for block in session.execute(stmt).scalars():
+        block.data = encode_block(
+            [
+                update(row) if start_ts is None or row.start_ts >= start_ts else row
+                for row in decode_block(block.data)
+            ]
+        )
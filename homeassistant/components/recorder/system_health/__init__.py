@@ -72,4 +72,7 @@ async def system_health_info(hass: HomeAssistant) -> dict[str, Any]:
             "oldest_recorder_run": recorder_runs_manager.first.start,
             "current_recorder_run": recorder_runs_manager.current.start,
         }
-    return db_runs | db_stats | db_engine_info
+    commit_info: dict[str, Any] = {}
+    if instance.commit_interval:
+        commit_info = instance.commit_scheduler.as_dict()
+    return db_runs | db_stats | db_engine_info | commit_info
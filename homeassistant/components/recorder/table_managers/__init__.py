@@ -43,6 +43,10 @@ class BaseTableManager[_DataT]:
         """
         return self._pending.get(shared_data)
 
+    def get_cache_stats(self) -> tuple[int, int]:
+        """Return the number of hits and misses of the id cache."""
+        return self._id_map.get_stats()
+
     def reset(self) -> None:
         """Reset after the database has been reset or changed.
 
@@ -2,10 +2,11 @@
 
 from __future__ import annotations
 
-from collections.abc import Collection, Iterable
+from collections.abc import Collection, Iterable, Mapping
 import logging
-from typing import TYPE_CHECKING, cast
+from typing import TYPE_CHECKING, Any, cast
 
+from lru import LRU
 from sqlalchemy.orm.session import Session
 
 from homeassistant.core import Event, EventStateChangedData
@@ -18,6 +19,8 @@ from ..util import execute_stmt_lambda_element
 from . import BaseLRUTableManager
 
 if TYPE_CHECKING:
+    from homeassistant.helpers.entity import StateInfo
+
     from ..core import Recorder
 
 # The number of attribute ids to cache in memory
@@ -37,13 +40,34 @@ class StateAttributesManager(BaseLRUTableManager[StateAttributes]):
     def __init__(self, recorder: Recorder) -> None:
         """Initialize the event type manager."""
         super().__init__(recorder, CACHE_SIZE)
+        # The state machine reuses the attributes of the old state when
+        # they did not change, so the same immutable attributes object is
+        # shared by many consecutive states of an entity. We cache the
+        # serialized attributes by the identity of the attributes object
+        # to avoid serializing them again. The cache holds a reference to
+        # the attributes so the id cannot be reused while it is cached.
+        self._serialized: LRU[
+            int, tuple[Mapping[str, Any], StateInfo | None, bytes]
+        ] = LRU(CACHE_SIZE)
 
     def serialize_from_event(self, event: Event[EventStateChangedData]) -> bytes | None:
         """Serialize event data."""
-        try:
+        if (new_state := event.data["new_state"]) is None:
             return StateAttributes.shared_attrs_bytes_from_event(
                 event, self.recorder.dialect_name
             )
+        attributes = new_state.attributes
+        state_info = new_state.state_info
+        if (
+            (cached := self._serialized.get(id(attributes))) is not None
+            and cached[0] is attributes
+            and cached[1] is state_info
+        ):
+            return cached[2]
+        try:
+            shared_attrs_bytes = StateAttributes.shared_attrs_bytes_from_event(
+                event, self.recorder.dialect_name
+            )
         except JSON_ENCODE_EXCEPTIONS as ex:
             _LOGGER.warning(
                 "State is not JSON serializable: %s: %s",
@@ -51,6 +75,8 @@ class StateAttributesManager(BaseLRUTableManager[StateAttributes]):
                 ex,
             )
             return None
+        self._serialized[id(attributes)] = (attributes, state_info, shared_attrs_bytes)
+        return shared_attrs_bytes
 
     def load(
         self, events: list[Event[EventStateChangedData]], session: Session
@@ -116,6 +142,15 @@ class StateAttributesManager(BaseLRUTableManager[StateAttributes]):
 
         return results
 
+    def reset(self) -> None:
+        """Reset after the database has been reset or changed.
+
+        This call is not thread-safe and must be called from the
+        recorder thread.
+        """
+        super().reset()
+        self._serialized.clear()
+
     def add_pending(self, db_state_attributes: StateAttributes) -> None:
         """Add a pending StateAttributes that will be committed at the next interval.
 
@@ -3,8 +3,10 @@
 from __future__ import annotations
 
 from collections.abc import Sequence
+from functools import cache
 from typing import Any, cast
 
+from sqlalchemy import Insert, Table, insert
 from sqlalchemy.engine.row import Row
 from sqlalchemy.orm.session import Session
 
@@ -13,12 +15,42 @@ from ..queries import find_oldest_state
 from ..util import execute_stmt_lambda_element
 
 
+@cache
+def _insert_stmt(states_class: type[States]) -> tuple[tuple[str, ...], Insert]:
+    """Return the columns to insert and the insert statement for a States class."""
+    # We need to cast __table__ to Table, explanation in
+    # https://github.com/sqlalchemy/sqlalchemy/issues/9130
+    table = cast(Table, states_class.__table__)
+    columns = tuple(column.key for column in table.columns if column.key != "state_id")
+    return columns, insert(table).returning(
+        table.c.state_id, sort_by_parameter_order=True
+    )
+
+
+def _insert_params(state: States, columns: tuple[str, ...]) -> dict[str, Any]:
+    """Return the insert parameters for a state.
+
+    The values are read from the instance dict to avoid the overhead
+    of the instrumented attributes.
+    """
+    values = state.__dict__
+    params = {column: values.get(column) for column in columns}
+    if (old_state := values.get("old_state")) is not None:
+        params["old_state_id"] = old_state.state_id
+    if (state_attributes := values.get("state_attributes")) is not None:
+        params["attributes_id"] = state_attributes.attributes_id
+    if (states_meta := values.get("states_meta_rel")) is not None:
+        params["metadata_id"] = states_meta.metadata_id
+    return params
+
+
 class StatesManager:
     """Manage the states table."""
 
     def __init__(self) -> None:
         """Initialize the states manager for linking old_state_id."""
         self._pending: dict[str, States] = {}
+        self._pending_inserts: list[States] = []
         self._last_committed_id: dict[str, int] = {}
         self._last_reported: dict[int, float] = {}
         self._oldest_ts: float | None = None
@@ -61,6 +93,50 @@ class StatesManager:
         if self._oldest_ts is None:
             self._oldest_ts = state.last_updated_ts
 
+    def add_pending_insert(self, state: States) -> None:
+        """Add a state to insert with insert_pending instead of the session.
+
+        This call is not thread-safe and must be called from the
+        recorder thread.
+        """
+        self._pending_inserts.append(state)
+
+    def insert_pending(self, session: Session) -> None:
+        """Insert the pending states with executemany.
+
+        The rows are written with Core inserts instead of flushing the
+        States through the unit of work which is much more expensive.
+        The attributes and states meta the states refer to must be
+        flushed before calling this.
+
+        States linking to an older state of the same entity from the
+        same commit are inserted in a later round, after the state_id
+        of the older state is known.
+
+        This call is not thread-safe and must be called from the
+        recorder thread.
+        """
+        if not self._pending_inserts:
+            return
+        columns, stmt = _insert_stmt(type(self._pending_inserts[0]))
+        rounds: list[list[States]] = []
+        round_by_state: dict[int, int] = {}
+        for state in self._pending_inserts:
+            round_ = 0
+            if (old_state := state.__dict__.get("old_state")) is not None:
+                round_ = round_by_state.get(id(old_state), -1) + 1
+            round_by_state[id(state)] = round_
+            if round_ == len(rounds):
+                rounds.append([])
+            rounds[round_].append(state)
+
+        for states in rounds:
+            result = session.execute(
+                stmt, [_insert_params(state, columns) for state in states]
+            )
+            for state, state_id in zip(states, result.scalars(), strict=True):
+                state.state_id = state_id
+
     def update_pending_last_reported(
         self, state_id: int, last_reported_timestamp: float
     ) -> None:
@@ -80,6 +156,7 @@ class StatesManager:
         for entity_id, db_states in self._pending.items():
             self._last_committed_id[entity_id] = db_states.state_id
         self._pending.clear()
+        self._pending_inserts.clear()
         self._last_reported.clear()
 
     def reset(self) -> None:
@@ -90,6 +167,7 @@ class StatesManager:
         """
         self._last_committed_id.clear()
         self._pending.clear()
+        self._pending_inserts.clear()
         self._oldest_ts = None
 
     def load_from_db(self, session: Session) -> None:
@@ -125,6 +203,16 @@ class StatesManager:
         ):
             last_committed_ids.pop(last_committed_ids_reversed[purged_state_id], None)
 
+    def evict_purged_state_id_range(self, min_state_id: int, max_state_id: int) -> None:
+        """Evict a range of purged states from the committed states.
+
+        Used when a whole partition of states is dropped.
+        """
+        last_committed_ids = self._last_committed_id
+        for entity_id, state_id in list(last_committed_ids.items()):
+            if min_state_id <= state_id <= max_state_id:
+                del last_committed_ids[entity_id]
+
     def evict_purged_entity_ids(self, purged_entity_ids: set[str]) -> None:
         """Evict purged entity_ids from the committed states.
 
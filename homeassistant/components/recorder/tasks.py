@@ -14,7 +14,7 @@ from typing import TYPE_CHECKING, Any
 from homeassistant.helpers.typing import UndefinedType
 from homeassistant.util.event_type import EventType
 
-from . import entity_registry, purge, statistics
+from . import entity_registry, purge, statistics, statistics_archive
 from .const import DOMAIN
 from .db_schema import Statistics, StatisticsShortTerm
 from .models import StatisticData, StatisticMetaData
@@ -131,6 +131,20 @@ class PurgeTask(RecorderTask):
         )
 
 
+@dataclass(slots=True)
+class ArchiveStatisticsTask(RecorderTask):
+    """Object to store information about an archive statistics task."""
+
+    archive_before: datetime
+
+    def run(self, instance: Recorder) -> None:
+        """Archive old hourly statistics."""
+        if statistics_archive.archive_statistics(instance, self.archive_before):
+            return
+        # Schedule a new archive task if this one didn't finish
+        instance.queue_task(ArchiveStatisticsTask(self.archive_before))
+
+
 @dataclass(slots=True)
 class PurgeEntitiesTask(RecorderTask):
     """Object to store entity information about purge task."""
@@ -295,6 +309,18 @@ class CommitTask(RecorderTask):
         instance._commit_event_session_or_retry()  # noqa: SLF001
 
 
+@dataclass(slots=True)
+class DrainSpoolTask(RecorderTask):
+    """Record the oldest segment of the events spooled to disk."""
+
+    def run(self, instance: Recorder) -> None:
+        """Handle the task."""
+        try:
+            instance._drain_spool(all_segments=False)  # noqa: SLF001
+        finally:
+            instance.hass.add_job(instance._async_spool_drained)  # noqa: SLF001
+
+
 @dataclass(slots=True)
 class AddRecorderPlatformTask(RecorderTask):
     """Add a recorder platform."""
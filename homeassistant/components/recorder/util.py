@@ -57,6 +57,7 @@ from .models import (
     UnsupportedDialect,
     process_timestamp,
 )
+from .partition import PARTITION_CREATE_AHEAD, create_future_partitions
 
 if TYPE_CHECKING:
     from sqlite3.dbapi2 import Cursor as SQLiteCursor
@@ -794,6 +795,12 @@ def periodic_db_cleanups(instance: Recorder) -> None:
         with instance.engine.connect() as connection:
             connection.execute(text("PRAGMA wal_checkpoint(TRUNCATE);"))
             connection.execute(text("PRAGMA OPTIMIZE;"))
+    elif instance.engine.dialect.name == SupportedDialect.POSTGRESQL:
+        # Make sure new rows can be recorded into time partitioned tables
+        with session_scope(session=instance.get_session()) as session:
+            create_future_partitions(
+                session, (dt_util.utcnow() + PARTITION_CREATE_AHEAD).timestamp()
+            )
 
 
 @contextmanager
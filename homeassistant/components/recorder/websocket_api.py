@@ -37,6 +37,7 @@ from homeassistant.util.unit_conversion import (
 )
 
 from .models import StatisticPeriod
+from .readers import async_cancel_on_close
 from .statistics import (
     STATISTIC_UNIT_TO_UNIT_CONVERTER,
     async_add_external_statistics,
@@ -140,15 +141,19 @@ async def ws_get_statistic_during_period(
     start_time, end_time = resolve_period(cast(StatisticPeriod, msg))
 
     connection.send_message(
-        await get_instance(hass).async_add_executor_job(
-            _ws_get_statistic_during_period,
-            hass,
+        await async_cancel_on_close(
+            connection,
             msg["id"],
-            start_time,
-            end_time,
-            msg["statistic_id"],
-            msg.get("types"),
-            msg.get("units"),
+            get_instance(hass).async_add_read_executor_job(
+                _ws_get_statistic_during_period,
+                hass,
+                msg["id"],
+                start_time,
+                end_time,
+                msg["statistic_id"],
+                msg.get("types"),
+                msg.get("units"),
+            ),
         )
     )
 
@@ -208,16 +213,20 @@ async def ws_handle_get_statistics_during_period(
     if (types := msg.get("types")) is None:
         types = {"change", "last_reset", "max", "mean", "min", "state", "sum"}
     connection.send_message(
-        await get_instance(hass).async_add_executor_job(
-            _ws_get_statistics_during_period,
-            hass,
+        await async_cancel_on_close(
+            connection,
             msg["id"],
-            start_time,
-            end_time,
-            set(msg["statistic_ids"]),
-            msg.get("period"),
-            msg.get("units"),
-            types,
+            get_instance(hass).async_add_read_executor_job(
+                _ws_get_statistics_during_period,
+                hass,
+                msg["id"],
+                start_time,
+                end_time,
+                set(msg["statistic_ids"]),
+                msg.get("period"),
+                msg.get("units"),
+                types,
+            ),
         )
     )
 
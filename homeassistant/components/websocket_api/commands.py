@@ -3,6 +3,7 @@
 from __future__ import annotations
 
 from collections.abc import Callable
+from dataclasses import dataclass
 from functools import lru_cache, partial
 import json
 import logging
@@ -19,6 +20,7 @@ from homeassistant.const import (
     SIGNAL_BOOTSTRAP_INTEGRATIONS,
 )
 from homeassistant.core import (
+    CALLBACK_TYPE,
     Context,
     Event,
     EventStateChangedData,
@@ -60,6 +62,7 @@ from homeassistant.loader import (
     async_get_integrations,
 )
 from homeassistant.setup import async_get_loaded_integrations, async_get_setup_timings
+from homeassistant.util.hass_dict import HassKey
 from homeassistant.util.json import format_unserializable_data
 
 from . import const, decorators, messages
@@ -67,6 +70,9 @@ from .connection import ActiveConnection
 from .messages import construct_result_message
 
 ALL_SERVICE_DESCRIPTIONS_JSON_CACHE = "websocket_api_all_service_descriptions_json"
+ENTITY_CHANGES_FORWARDER: HassKey[_EntityChangesForwarder] = HassKey(
+    "websocket_api_entity_changes_forwarder"
+)
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -367,31 +373,146 @@ def _send_handle_get_states_response(
     )
 
 
-@callback
-def _forward_entity_changes(
-    send_message: Callable[[str | bytes | dict[str, Any]], None],
-    entity_ids: set[str] | None,
-    entity_filter: Callable[[str], bool] | None,
-    user: User,
-    message_id_as_bytes: bytes,
-    event: Event[EventStateChangedData],
-) -> None:
-    """Forward entity state changed events to websocket."""
-    entity_id = event.data["entity_id"]
-    if (entity_ids and entity_id not in entity_ids) or (
-        entity_filter and not entity_filter(entity_id)
-    ):
-        return
-    # We have to lookup the permissions again because the user might have
-    # changed since the subscription was created.
-    permissions = user.permissions
-    if (
-        not user.is_admin
-        and not permissions.access_all_entities(POLICY_READ)
-        and not permissions.check_entity(entity_id, POLICY_READ)
-    ):
-        return
-    send_message(messages.cached_state_diff_message(message_id_as_bytes, event))
+# The least number of entries of a conflating subscription before the
+# entries of sent messages are dropped
+_MIN_PENDING_PRUNE_SIZE = 64
+
+
+@dataclass(slots=True, eq=False)
+class _EntitySubscription:
+    """A subscribe_entities subscription of a connection.
+
+    When the subscription conflates, the queued message of an entity is
+    replaced by the diff from the state the client has to the latest state
+    until it is sent, so a client which falls behind gets a message per
+    entity instead of one per state change.
+
+    A merged diff keeps the queue position of the message it replaces, so
+    the client may get the latest state of an entity before state changes
+    of other entities which happened earlier. The changes of each entity
+    are still received in order.
+    """
+
+    send_message: Callable[[str | bytes | bytearray | dict[str, Any]], None]
+    entity_ids: set[str] | None
+    entity_filter: Callable[[str], bool] | None
+    user: User
+    message_id_as_bytes: bytes
+    # The queued message of each entity and the state the client has
+    pending: dict[str, tuple[bytearray, State | None]] | None = None
+    # Entries of sent messages are dropped once there are this many entries
+    pending_prune_size: int = _MIN_PENDING_PRUNE_SIZE
+
+    def send_conflated(
+        self, event: Event[EventStateChangedData], partial_message: bytes
+    ) -> None:
+        """Send a state change, merging it with the queued one of the entity."""
+        assert self.pending is not None
+        data = event.data
+        entity_id = data["entity_id"]
+        # The writer empties messages once they are sent
+        if (pending := self.pending.get(entity_id)) and (message := pending[0]):
+            message[:] = messages.message_with_id(
+                messages.partial_state_diff_message_for_states(
+                    entity_id, pending[1], data["new_state"]
+                ),
+                self.message_id_as_bytes,
+            )
+            return
+        if len(self.pending) >= self.pending_prune_size:
+            self._prune_sent()
+        message = bytearray(
+            messages.message_with_id(partial_message, self.message_id_as_bytes)
+        )
+        self.pending[entity_id] = (message, data["old_state"])
+        self.send_message(message)
+
+    def _prune_sent(self) -> None:
+        """Drop the entries of messages which were sent.
+
+        The client has the new state of a sent message, which is the old
+        state of the next state change of the entity, so nothing is kept.
+        Pruning when the entries have doubled keeps the cost per message
+        constant and the entries bounded by the queued messages.
+        """
+        assert self.pending is not None
+        pending = self.pending
+        for entity_id in [
+            entity_id for entity_id, (message, _) in pending.items() if not message
+        ]:
+            del pending[entity_id]
+        self.pending_prune_size = max(2 * len(pending), _MIN_PENDING_PRUNE_SIZE)
+
+    def wants(self, entity_id: str) -> bool:
+        """Return if the state changes of an entity are forwarded."""
+        if (self.entity_ids and entity_id not in self.entity_ids) or (
+            self.entity_filter and not self.entity_filter(entity_id)
+        ):
+            return False
+        # We have to lookup the permissions again because the user might have
+        # changed since the subscription was created.
+        user = self.user
+        permissions = user.permissions
+        return (
+            user.is_admin
+            or permissions.access_all_entities(POLICY_READ)
+            or permissions.check_entity(entity_id, POLICY_READ)
+        )
+
+
+class _EntityChangesForwarder:
+    """Forward state changed events to all subscribe_entities subscriptions.
+
+    A single listener serializes the state diff of an event once, the first
+    time a subscription wants it, and sends it to every subscription.
+    """
+
+    __slots__ = ("_hass", "_subscriptions", "_unsub_listener")
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize the forwarder."""
+        self._hass = hass
+        self._subscriptions: list[_EntitySubscription] = []
+        self._unsub_listener: CALLBACK_TYPE | None = None
+
+    @callback
+    def async_subscribe(self, subscription: _EntitySubscription) -> CALLBACK_TYPE:
+        """Add a subscription and return a callback to remove it."""
+        if self._unsub_listener is None:
+            self._unsub_listener = self._hass.bus.async_listen(
+                EVENT_STATE_CHANGED, self._async_forward_entity_changes
+            )
+        self._subscriptions.append(subscription)
+        return partial(self._async_unsubscribe, subscription)
+
+    @callback
+    def _async_unsubscribe(self, subscription: _EntitySubscription) -> None:
+        """Remove a subscription."""
+        self._subscriptions.remove(subscription)
+        if not self._subscriptions and self._unsub_listener is not None:
+            self._unsub_listener()
+            self._unsub_listener = None
+
+    @callback
+    def _async_forward_entity_changes(
+        self, event: Event[EventStateChangedData]
+    ) -> None:
+        """Forward entity state changed events to websocket."""
+        entity_id = event.data["entity_id"]
+        partial_message: bytes | None = None
+        for subscription in self._subscriptions:
+            if not subscription.wants(entity_id):
+                continue
+            if partial_message is None:
+                partial_message = messages.partial_state_diff_message(event)
+            if subscription.pending is not None:
+                subscription.send_conflated(event, partial_message)
+                continue
+            subscription.send_message(
+                messages.message_with_id(
+                    partial_message, subscription.message_id_as_bytes
+                )
+            )
 
 
 @callback
@@ -399,6 +520,7 @@ def _forward_entity_changes(
     {
         vol.Required("type"): "subscribe_entities",
         vol.Optional("entity_ids"): cv.entity_ids,
+        vol.Optional("conflate", default=False): cv.boolean,
         **INCLUDE_EXCLUDE_BASE_FILTER_SCHEMA.schema,
     }
 )
@@ -415,16 +537,17 @@ def handle_subscribe_entities(
     states = _async_get_allowed_states(hass, connection)
     msg_id = msg["id"]
     message_id_as_bytes = str(msg_id).encode()
-    connection.subscriptions[msg_id] = hass.bus.async_listen(
-        EVENT_STATE_CHANGED,
-        partial(
-            _forward_entity_changes,
+    if (forwarder := hass.data.get(ENTITY_CHANGES_FORWARDER)) is None:
+        forwarder = hass.data[ENTITY_CHANGES_FORWARDER] = _EntityChangesForwarder(hass)
+    connection.subscriptions[msg_id] = forwarder.async_subscribe(
+        _EntitySubscription(
             connection.send_message,
             entity_ids,
             entity_filter,
             connection.user,
             message_id_as_bytes,
-        ),
+            {} if msg["conflate"] else None,
+        )
     )
     connection.send_result(msg_id)
 
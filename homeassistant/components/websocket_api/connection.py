@@ -57,7 +57,7 @@ class ActiveConnection:
         self,
         logger: WebSocketAdapter,
         hass: HomeAssistant,
-        send_message: Callable[[bytes | str | dict[str, Any]], None],
+        send_message: Callable[[bytes | bytearray | str | dict[str, Any]], None],
         user: User,
         refresh_token: RefreshToken,
     ) -> None:
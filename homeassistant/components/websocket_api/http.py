@@ -7,6 +7,7 @@ from collections import deque
 from collections.abc import Callable, Coroutine
 import datetime as dt
 from functools import partial
+from itertools import chain, repeat
 import logging
 from typing import TYPE_CHECKING, Any, Final
 
@@ -82,6 +83,7 @@ class WebSocketHandler:
         "_peak_checker_unsub",
         "_connection",
         "_message_queue",
+        "_conflatable_message_count",
         "_ready_future",
         "_release_ready_queue_size",
     )
@@ -104,7 +106,9 @@ class WebSocketHandler:
         # to where messages are queued. This allows the implementation
         # to use a deque and an asyncio.Future to avoid the overhead of
         # an asyncio.Queue.
-        self._message_queue: deque[bytes] = deque()
+        self._message_queue: deque[bytes | bytearray] = deque()
+        # Number of queued messages which may still be changed by their sender
+        self._conflatable_message_count = 0
         self._ready_future: asyncio.Future[int] | None = None
         self._release_ready_queue_size: int = 0
 
@@ -157,12 +161,24 @@ class WebSocketHandler:
 
                 if not can_coalesce or ready_message_count == 1:
                     message = message_queue.popleft()
+                    if type(message) is bytearray:
+                        self._conflatable_message_count -= 1
+                        message, sent_message = bytes(message), message
+                        sent_message.clear()
                     if is_debug_log_enabled():
                         debug("%s: Sending %s", self.description, message)
                     await send_bytes_text(message)
                     continue
 
-                coalesced_messages = b"".join((b"[", b",".join(message_queue), b"]"))
+                # Each message is copied once, into the coalesced message
+                parts = [b"[", *chain.from_iterable(zip(message_queue, repeat(b",")))]
+                parts[-1] = b"]"
+                coalesced_messages = b"".join(parts)
+                if self._conflatable_message_count:
+                    self._conflatable_message_count = 0
+                    for message in message_queue:
+                        if type(message) is bytearray:
+                            message.clear()
                 message_queue.clear()
                 if is_debug_log_enabled():
                     debug("%s: Sending %s", self.description, coalesced_messages)
@@ -185,11 +201,14 @@ class WebSocketHandler:
             self._peak_checker_unsub = None
 
     @callback
-    def _send_message(self, message: str | bytes | dict[str, Any]) -> None:
+    def _send_message(self, message: str | bytes | bytearray | dict[str, Any]) -> None:
         """Queue sending a message to the client.
 
         Closes connection if the client is not reading the messages.
 
+        A bytearray message may be changed by its sender until it is sent,
+        it is emptied once it is sent.
+
         Async friendly.
         """
         if self._closing:
@@ -202,6 +221,8 @@ class WebSocketHandler:
                 message = message_to_json_bytes(message)
             elif isinstance(message, str):
                 message = message.encode("utf-8")
+            elif type(message) is bytearray:
+                self._conflatable_message_count += 1
 
         message_queue = self._message_queue
         message_queue.append(message)
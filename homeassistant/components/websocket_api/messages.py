@@ -15,7 +15,7 @@ from homeassistant.const import (
     COMPRESSED_STATE_LAST_UPDATED,
     COMPRESSED_STATE_STATE,
 )
-from homeassistant.core import CompressedState, Event, EventStateChangedData
+from homeassistant.core import CompressedState, Event, EventStateChangedData, State
 from homeassistant.helpers import config_validation as cv
 from homeassistant.helpers.json import (
     JSON_DUMP,
@@ -118,13 +118,17 @@ def cached_event_message(message_id_as_bytes: bytes, event: Event) -> bytes:
     all getting many of the same events (mostly state changed)
     we can avoid serializing the same data for each connection.
     """
+    return message_with_id(_partial_cached_event_message(event), message_id_as_bytes)
+
+
+def message_with_id(partial_message: bytes, message_id_as_bytes: bytes) -> bytes:
+    """Return a message serialized without its id with the id appended.
+
+    The serialized message is sliced through a memoryview so it is only
+    copied once, into the returned message.
+    """
     return b"".join(
-        (
-            _partial_cached_event_message(event)[:-1],
-            b',"id":',
-            message_id_as_bytes,
-            b"}",
-        )
+        (memoryview(partial_message)[:-1], b',"id":', message_id_as_bytes, b"}")
     )
 
 
@@ -141,37 +145,30 @@ def _partial_cached_event_message(event: Event) -> bytes:
     )
 
 
-def cached_state_diff_message(
-    message_id_as_bytes: bytes, event: Event[EventStateChangedData]
-) -> bytes:
-    """Return an event message.
+def partial_state_diff_message(event: Event[EventStateChangedData]) -> bytes:
+    """Serialize the state diff of an event to json.
 
-    Serialize to json once per message.
-
-    Since we can have many clients connected that are
-    all getting many of the same events (mostly state changed)
-    we can avoid serializing the same data for each connection.
+    The message is constructed without the id which is appended
+    with message_with_id for each subscription.
     """
-    return b"".join(
-        (
-            _partial_cached_state_diff_message(event)[:-1],
-            b',"id":',
-            message_id_as_bytes,
-            b"}",
+    return (
+        _message_to_json_bytes_or_none(
+            {"type": "event", "event": _state_diff_event(event)}
         )
+        or INVALID_JSON_PARTIAL_MESSAGE
     )
 
 
-@lru_cache(maxsize=128)
-def _partial_cached_state_diff_message(event: Event[EventStateChangedData]) -> bytes:
-    """Cache and serialize the event to json.
+def partial_state_diff_message_for_states(
+    entity_id: str, old_state: State | None, new_state: State | None
+) -> bytes:
+    """Serialize the state diff between two states of an entity to json.
 
-    The message is constructed without the id which
-    will be appended in cached_state_diff_message
+    The message is constructed without the id like partial_state_diff_message.
     """
     return (
         _message_to_json_bytes_or_none(
-            {"type": "event", "event": _state_diff_event(event)}
+            {"type": "event", "event": _state_diff(entity_id, old_state, new_state)}
         )
         or INVALID_JSON_PARTIAL_MESSAGE
     )
@@ -195,9 +192,22 @@ def _state_diff_event(
         "r": [entity_id,…]
     }
     """
-    if (new_state := event.data["new_state"]) is None:
-        return {ENTITY_EVENT_REMOVE: [event.data["entity_id"]]}
-    if (old_state := event.data["old_state"]) is None:
+    data = event.data
+    return _state_diff(data["entity_id"], data["old_state"], data["new_state"])
+
+
+def _state_diff(
+    entity_id: str, old_state: State | None, new_state: State | None
+) -> dict[
+    str,
+    list[str]
+    | dict[str, CompressedState]
+    | dict[str, dict[str, dict[str, str | list[str]]]],
+]:
+    """Return the minimal state diff between two states of an entity."""
+    if new_state is None:
+        return {ENTITY_EVENT_REMOVE: [entity_id]}
+    if old_state is None:
         return {ENTITY_EVENT_ADD: {new_state.entity_id: new_state.as_compressed_state}}
     additions: dict[str, Any] = {}
     diff: dict[str, dict[str, Any]] = {STATE_DIFF_ADDITIONS: additions}
@@ -221,9 +231,11 @@ def _state_diff_event(
             additions[COMPRESSED_STATE_CONTEXT]["id"] = new_state_context.id
         else:
             additions[COMPRESSED_STATE_CONTEXT] = new_state_context.id
-    if (old_attributes := old_state.attributes) != (
+    # The state machine reuses the attributes object when the attributes
+    # did not change so we can avoid comparing them key by key.
+    if (old_attributes := old_state.attributes) is not (
         new_attributes := new_state.attributes
-    ):
+    ) and old_attributes != new_attributes:
         if added := {
             key: value
             for key, value in new_attributes.items()
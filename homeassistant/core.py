@@ -25,6 +25,7 @@ import functools
 import inspect
 import logging
 import re
+import sys
 import threading
 import time
 from time import monotonic
@@ -1821,7 +1822,11 @@ class State:
         self.last_changed = last_changed or self.last_updated
         self.context = context or Context()
         self.state_info = state_info
-        self.domain, self.object_id = split_entity_id(self.entity_id)
+        domain, self.object_id = split_entity_id(self.entity_id)
+        # Intern the domain so all states of a domain share the same string
+        # object, which saves memory on large installs and speeds up the
+        # lookups in the domain index since the hash is already computed.
+        self.domain = sys.intern(domain)
         # The recorder or the websocket_api will always call the timestamps,
         # so we will set the timestamp values here to avoid the overhead of
         # the function call in the property we know will always be called.
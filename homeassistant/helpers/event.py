@@ -14,6 +14,8 @@ from random import randint
 import time
 from typing import TYPE_CHECKING, Any, Concatenate, Generic, TypeVar
 
+from lru import LRU
+
 from homeassistant.const import (
     EVENT_CORE_CONFIG_UPDATE,
     EVENT_STATE_CHANGED,
@@ -75,6 +77,8 @@ _TRACK_ENTITY_REGISTRY_UPDATED_DATA: HassKey[
 _TRACK_DEVICE_REGISTRY_UPDATED_DATA: HassKey[
     _KeyedEventData[EventDeviceRegistryUpdatedData]
 ] = HassKey("track_device_registry_updated_data")
+_TEMPLATE_RENDER_CACHE: HassKey[_TemplateRenderCache] = HassKey("template_render_cache")
+_TEMPLATE_RENDER_STATS_SIZE = 1024
 
 _ALL_LISTENER = "all"
 _DOMAINS_LISTENER = "domains"
@@ -972,6 +976,101 @@ def async_track_template(
 track_template = threaded_listener_factory(async_track_template)
 
 
+@dataclass(slots=True)
+class TemplateRenderStats:
+    """Render statistics of a template rendered by template trackers."""
+
+    renders: int = 0
+    shared_renders: int = 0
+    render_time: float = 0.0
+
+
+class _TemplateRenderCache:
+    """Share template renders between trackers for a state change event.
+
+    Identical templates rendered with the same variables by different
+    trackers while a state_changed event is dispatched render to the same
+    result, so the RenderInfo of the first render is reused by the other
+    trackers. The renders are cleared once the dispatch is done.
+
+    The number of renders and the time spent rendering are collected for
+    each template string.
+    """
+
+    __slots__ = ("_event", "_loop", "_renders", "stats")
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize the cache."""
+        self._loop = hass.loop
+        self._event: Event[EventStateChangedData] | None = None
+        self._renders: dict[str, list[tuple[tuple[Any, ...], RenderInfo]]] = {}
+        self.stats: LRU[str, TemplateRenderStats] = LRU(_TEMPLATE_RENDER_STATS_SIZE)
+
+    @callback
+    def _async_clear(self) -> None:
+        """Clear the renders once the event was dispatched."""
+        self._event = None
+        self._renders.clear()
+
+    @callback
+    def async_render_to_info(
+        self,
+        template: Template,
+        variables: TemplateVarsType,
+        event: Event[EventStateChangedData] | None,
+    ) -> RenderInfo:
+        """Render the template or reuse an identical render for the event.
+
+        The event must only be passed while it is dispatched, renders are
+        not shared otherwise.
+        """
+        if (stats := self.stats.get(template.template)) is None:
+            stats = self.stats[template.template] = TemplateRenderStats()
+
+        renders: list[tuple[tuple[Any, ...], RenderInfo]] = []
+        key = None if event is None else template.async_render_key(variables)
+        if key is not None:
+            if event is not self._event:
+                if self._event is None:
+                    # The state change listeners of the trackers are callbacks,
+                    # so the dispatch is done when the event loop runs again
+                    self._loop.call_soon(self._async_clear)
+                self._event = event
+                self._renders.clear()
+            renders = self._renders.setdefault(template.template, [])
+            for render_key, info in renders:
+                if len(render_key) == len(key) and all(
+                    value is render_value
+                    for value, render_value in zip(key, render_key, strict=True)
+                ):
+                    stats.shared_renders += 1
+                    return info
+
+        start = time.perf_counter()
+        info = template.async_render_to_info(variables)
+        stats.render_time += time.perf_counter() - start
+        stats.renders += 1
+        if key is not None:
+            renders.append((key, info))
+        return info
+
+
+@callback
+def _async_get_template_render_cache(hass: HomeAssistant) -> _TemplateRenderCache:
+    """Return the template render cache."""
+    if (render_cache := hass.data.get(_TEMPLATE_RENDER_CACHE)) is None:
+        render_cache = hass.data[_TEMPLATE_RENDER_CACHE] = _TemplateRenderCache(hass)
+    return render_cache
+
+
+@callback
+def async_get_template_render_stats(
+    hass: HomeAssistant,
+) -> dict[str, TemplateRenderStats]:
+    """Return the render statistics of the templates rendered by trackers."""
+    return dict(_async_get_template_render_cache(hass).stats.items())
+
+
 class TrackTemplateResultInfo:
     """Handle removal / refresh of tracker."""
 
@@ -1003,6 +1102,7 @@ class TrackTemplateResultInfo:
             track_template_.template.hass = hass
 
         self._rate_limit = KeyedRateLimit(hass)
+        self._render_cache = _async_get_template_render_cache(hass)
         self._info: dict[Template, RenderInfo] = {}
         self._track_state_changes: _TrackStateChangeFiltered | None = None
         self._time_listeners: dict[Template, Callable[[], None]] = {}
@@ -1131,6 +1231,7 @@ class TrackTemplateResultInfo:
         track_template_: TrackTemplate,
         now: float,
         event: Event[EventStateChangedData] | None,
+        replayed: bool | None = False,
     ) -> bool | TrackTemplateResult:
         """Re-render the template if conditions match.
 
@@ -1170,8 +1271,10 @@ class TrackTemplateResultInfo:
             )
 
         self._rate_limit.async_triggered(template, now)
-        self._info[template] = info = template.async_render_to_info(
-            track_template_.variables
+        # Renders are only shared while the event is dispatched, not when
+        # it is replayed after the rate limit
+        self._info[template] = info = self._render_cache.async_render_to_info(
+            template, track_template_.variables, None if replayed else event
         )
 
         try:
@@ -1246,7 +1349,9 @@ class TrackTemplateResultInfo:
 
         # Update the super template first
         if super_template is not None:
-            update = self._render_template_if_ready(super_template, now, event)
+            update = self._render_template_if_ready(
+                super_template, now, event, replayed
+            )
             info_changed |= self._apply_update(updates, update, super_template.template)
 
             if isinstance(update, TrackTemplateResult):
@@ -1277,7 +1382,9 @@ class TrackTemplateResultInfo:
                 if track_template_ == super_template:
                     continue
 
-                update = self._render_template_if_ready(track_template_, now, event)
+                update = self._render_template_if_ready(
+                    track_template_, now, event, replayed
+                )
                 info_changed |= self._apply_update(
                     updates, update, track_template_.template
                 )
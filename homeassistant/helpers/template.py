@@ -12,9 +12,13 @@ from contextvars import ContextVar
 from copy import deepcopy
 from datetime import date, datetime, time, timedelta
 from functools import cache, lru_cache, partial, wraps
+import hashlib
+from importlib.util import MAGIC_NUMBER
 import json
 import logging
+import marshal
 import math
+import operator
 from operator import contains
 import pathlib
 import random
@@ -38,7 +42,13 @@ import weakref
 
 from awesomeversion import AwesomeVersion
 import jinja2
-from jinja2 import pass_context, pass_environment, pass_eval_context
+from jinja2 import (
+    meta as jinja2_meta,
+    nodes as jinja2_nodes,
+    pass_context,
+    pass_environment,
+    pass_eval_context,
+)
 from jinja2.runtime import AsyncLoopContext, LoopContext
 from jinja2.sandbox import ImmutableSandboxedEnvironment
 from jinja2.utils import Namespace
@@ -53,14 +63,17 @@ from homeassistant.const import (
     ATTR_LONGITUDE,
     ATTR_PERSONS,
     ATTR_UNIT_OF_MEASUREMENT,
+    EVENT_HOMEASSISTANT_FINAL_WRITE,
     EVENT_HOMEASSISTANT_START,
     EVENT_HOMEASSISTANT_STOP,
     STATE_UNAVAILABLE,
     STATE_UNKNOWN,
     UnitOfLength,
+    __version__ as HA_VERSION,
 )
 from homeassistant.core import (
     Context,
+    Event,
     HomeAssistant,
     ServiceResponse,
     State,
@@ -94,6 +107,7 @@ from . import (
 )
 from .deprecation import deprecated_function
 from .singleton import singleton
+from .storage import Store
 from .translation import async_translate_state
 from .typing import TemplateVarsType
 
@@ -114,6 +128,12 @@ _ENVIRONMENT_STRICT: HassKey[TemplateEnvironment] = HassKey(
     "template.environment_strict"
 )
 _HASS_LOADER = "template.hass_loader"
+_BYTECODE_CACHE = "template.bytecode_cache"
+
+BYTECODE_STORAGE_KEY = "core.template_bytecode"
+BYTECODE_STORAGE_VERSION = 1
+# Templates rendered from dynamic sources should not grow the cache forever
+MAX_BYTECODE_CACHE_SIZE = 10000
 
 # Match "simple" ints and floats. -1.0, 1, +5, 5.0
 _IS_NUMERIC = re.compile(r"^[+-]?(?!0\d)\d*(?:\.\d*)?$")
@@ -502,6 +522,254 @@ class RenderInfo:
             self.filter = _false
 
 
+# Functions, filters and tests whose result does not only depend on the
+# states, like the time, random values and the registries
+_UNSHARED_RENDER_NAMES = frozenset(
+    {
+        "area_devices",
+        "area_entities",
+        "area_id",
+        "area_name",
+        "areas",
+        "config_entry_attr",
+        "config_entry_id",
+        "device_attr",
+        "device_entities",
+        "device_id",
+        "floor_areas",
+        "floor_id",
+        "floor_name",
+        "floors",
+        "integration_entities",
+        "is_device_attr",
+        "is_hidden_entity",
+        "issue",
+        "issues",
+        "label_areas",
+        "label_devices",
+        "label_entities",
+        "label_id",
+        "label_name",
+        "labels",
+        "now",
+        "random",
+        "relative_time",
+        "time_since",
+        "time_until",
+        "today_at",
+        "utcnow",
+    }
+)
+
+
+@lru_cache(maxsize=EVAL_CACHE_SIZE)
+def _render_variable_names(
+    env: TemplateEnvironment, template: str
+) -> tuple[str, ...] | None:
+    """Return the names of the variables a template may reference.
+
+    Returns None if the output of the template is not only determined by
+    its variables and the state, and a render can therefore not be shared.
+    """
+    try:
+        ast = env.parse(template)
+        names = jinja2_meta.find_undeclared_variables(ast)
+    except jinja2.TemplateError:
+        return None
+    # Included and imported templates may reference any variable
+    if any(
+        ast.find_all(
+            (jinja2_nodes.Include, jinja2_nodes.Import, jinja2_nodes.FromImport)
+        )
+    ):
+        return None
+    used = {node.name for node in ast.find_all(jinja2_nodes.Name)}
+    used.update(
+        node.name for node in ast.find_all((jinja2_nodes.Filter, jinja2_nodes.Test))
+    )
+    if not _UNSHARED_RENDER_NAMES.isdisjoint(used):
+        return None
+    return tuple(sorted(names))
+
+
+_FAST_RENDER_BINOPS: dict[type[jinja2_nodes.Expr], Callable[[Any, Any], Any]] = {
+    jinja2_nodes.Add: operator.add,
+    jinja2_nodes.Sub: operator.sub,
+    jinja2_nodes.Mul: operator.mul,
+    jinja2_nodes.Div: operator.truediv,
+    jinja2_nodes.FloorDiv: operator.floordiv,
+}
+_FAST_RENDER_COMPARE_OPS: dict[str, Callable[[Any, Any], Any]] = {
+    "eq": operator.eq,
+    "ne": operator.ne,
+    "gt": operator.gt,
+    "gteq": operator.ge,
+    "lt": operator.lt,
+    "lteq": operator.le,
+}
+_FAST_RENDER_FILTERS = {"float", "int", "round"}
+_FAST_RENDER_FUNCTIONS = {"states", "is_state", "is_state_attr", "state_attr"}
+
+
+class _FastRender:
+    """A template evaluated without the Jinja sandbox."""
+
+    __slots__ = ("_expr", "names")
+
+    def __init__(self, expr: Callable[[], Any], names: frozenset[str]) -> None:
+        """Initialize the fast render."""
+        self._expr = expr
+        # The global functions the template calls, variables with the same
+        # name would shadow them
+        self.names = names
+
+    def render(self, **kwargs: Any) -> str:
+        """Render the template, the variables are not referenced."""
+        return str(self._expr())
+
+
+@lru_cache(maxsize=EVAL_CACHE_SIZE)
+def _compile_fast_render(env: TemplateEnvironment, template: str) -> _FastRender | None:
+    """Compile a template of a common simple shape to plain Python calls.
+
+    A template that outputs a single expression of constants, arithmetic,
+    comparisons, the number filters and calls to the state functions is
+    evaluated without the attribute and call checks of the sandbox. The
+    same functions are called as in a Jinja render, so the output and the
+    entities collected for the RenderInfo are identical.
+
+    Returns None if the template has another shape.
+    """
+    if env.hass is None:
+        return None
+    try:
+        ast = env.parse(template)
+    except jinja2.TemplateError:
+        return None
+    if (
+        len(ast.body) != 1
+        or not isinstance(output := ast.body[0], jinja2_nodes.Output)
+        or len(output.nodes) != 1
+    ):
+        return None
+    names: set[str] = set()
+    if (expr := _compile_fast_render_expr(env, output.nodes[0], names)) is None:
+        return None
+    return _FastRender(expr, frozenset(names))
+
+
+def _compile_fast_render_args(
+    env: TemplateEnvironment,
+    node: jinja2_nodes.Filter | jinja2_nodes.Call,
+    names: set[str],
+) -> list[Callable[[], Any]] | None:
+    """Compile the positional arguments of a call or filter."""
+    if node.kwargs or node.dyn_args or node.dyn_kwargs:
+        return None
+    args = [_compile_fast_render_expr(env, arg, names) for arg in node.args]
+    if any(arg is None for arg in args):
+        return None
+    return args  # type: ignore[return-value]
+
+
+def _compile_fast_render_expr(  # noqa: C901
+    env: TemplateEnvironment, node: jinja2_nodes.Node, names: set[str]
+) -> Callable[[], Any] | None:
+    """Compile an expression node, returns None if it is not supported."""
+    if isinstance(node, jinja2_nodes.Const):
+        value = node.value
+        return lambda: value
+
+    if isinstance(node, jinja2_nodes.List):
+        items = [_compile_fast_render_expr(env, item, names) for item in node.items]
+        if any(item is None for item in items):
+            return None
+        return lambda: [item() for item in items]  # type: ignore[misc]
+
+    if (binop := _FAST_RENDER_BINOPS.get(type(node))) is not None:
+        assert isinstance(node, jinja2_nodes.BinExpr)
+        left = _compile_fast_render_expr(env, node.left, names)
+        right = _compile_fast_render_expr(env, node.right, names)
+        if left is None or right is None:
+            return None
+        return lambda: binop(left(), right())
+
+    if isinstance(node, (jinja2_nodes.And, jinja2_nodes.Or)):
+        left = _compile_fast_render_expr(env, node.left, names)
+        right = _compile_fast_render_expr(env, node.right, names)
+        if left is None or right is None:
+            return None
+        if isinstance(node, jinja2_nodes.And):
+            return lambda: left() and right()
+        return lambda: left() or right()
+
+    if isinstance(node, (jinja2_nodes.Not, jinja2_nodes.Neg)):
+        if (operand := _compile_fast_render_expr(env, node.node, names)) is None:
+            return None
+        if isinstance(node, jinja2_nodes.Not):
+            return lambda: not operand()
+        return lambda: -operand()
+
+    if isinstance(node, jinja2_nodes.Compare):
+        first = _compile_fast_render_expr(env, node.expr, names)
+        operands = [
+            (
+                _FAST_RENDER_COMPARE_OPS.get(operand.op),
+                _compile_fast_render_expr(env, operand.expr, names),
+            )
+            for operand in node.ops
+        ]
+        if first is None or any(op is None or expr is None for op, expr in operands):
+            return None
+
+        def _compare() -> Any:
+            # Chained comparisons behave like they do in Python
+            left = first()
+            result: Any = True
+            for op, expr in operands:
+                right = expr()  # type: ignore[misc]
+                if not (result := op(left, right)):  # type: ignore[misc]
+                    return result
+                left = right
+            return result
+
+        return _compare
+
+    if isinstance(node, jinja2_nodes.Filter):
+        if node.name not in _FAST_RENDER_FILTERS or node.node is None:
+            return None
+        value = _compile_fast_render_expr(env, node.node, names)
+        if (
+            value is None
+            or (args := _compile_fast_render_args(env, node, names)) is None
+        ):
+            return None
+        filt = env.filters[node.name]
+        return lambda: filt(value(), *[arg() for arg in args])
+
+    if isinstance(node, jinja2_nodes.Call):
+        if (
+            not isinstance(node.node, jinja2_nodes.Name)
+            or (name := node.node.name) not in _FAST_RENDER_FUNCTIONS
+            or (args := _compile_fast_render_args(env, node, names)) is None
+        ):
+            return None
+        names.add(name)
+        hass = env.hass
+        func: Callable[..., Any]
+        if name == "states":
+            func = env.globals["states"]
+        elif name == "is_state":
+            func = partial(is_state, hass)
+        elif name == "is_state_attr":
+            func = partial(is_state_attr, hass)
+        else:
+            func = partial(state_attr, hass)
+        return lambda: func(*[arg() for arg in args])
+
+    return None
+
+
 class Template:
     """Class to hold a template and manage caching and rendering."""
 
@@ -512,6 +780,8 @@ class Template:
         "is_static",
         "_compiled_code",
         "_compiled",
+        "_fast_render",
+        "_fast_render_checked",
         "_exc_info",
         "_limited",
         "_strict",
@@ -542,6 +812,8 @@ class Template:
         self.template: str = template.strip()
         self._compiled_code: CodeType | None = None
         self._compiled: jinja2.Template | None = None
+        self._fast_render: _FastRender | None = None
+        self._fast_render_checked = False
         self.hass = hass
         self.is_static = not is_template_string(template)
         self._exc_info: OptExcInfo | None = None
@@ -634,11 +906,22 @@ class Template:
                 return self.template
             return self._parse_result(self.template)
 
-        compiled = self._compiled or self._ensure_compiled(limited, strict, log_fn)
+        compiled: jinja2.Template | _FastRender
+        if self._compiled is None:
+            compiled = self._ensure_compiled(limited, strict, log_fn)
+        else:
+            compiled = self._compiled
+            if not self._fast_render_checked:
+                self._async_check_fast_render()
 
         if variables is not None:
             kwargs.update(variables)
 
+        if (
+            fast_render := self._fast_render
+        ) is not None and fast_render.names.isdisjoint(kwargs):
+            compiled = fast_render
+
         try:
             render_result = _render_with_context(self.template, compiled, **kwargs)
         except Exception as err:
@@ -725,6 +1008,34 @@ class Template:
 
         return False
 
+    @callback
+    def async_render_key(
+        self, variables: TemplateVarsType = None
+    ) -> tuple[Any, ...] | None:
+        """Return a key for the output of rendering the template with variables.
+
+        Templates with the same template string and key render to the same
+        output as long as the states do not change. The key holds the values
+        of the variables the template references, which must be compared by
+        identity.
+
+        Returns None if the render output cannot be shared.
+        """
+        if (
+            self.is_static
+            # Templates with a custom log function do not share an environment
+            or self._log_fn is not None
+            or (names := _render_variable_names(self._env, self.template)) is None
+        ):
+            return None
+        if not variables:
+            variables = {}
+        return (
+            self._limited,
+            self._strict,
+            *(variables.get(name, _SENTINEL) for name in names),
+        )
+
     @callback
     def async_render_to_info(
         self,
@@ -864,6 +1175,20 @@ class Template:
 
         return self._compiled
 
+    @callback
+    def _async_check_fast_render(self) -> None:
+        """Compile the fast render of a template rendered again.
+
+        The template is parsed for it, so templates only rendered once just
+        use the compiled code, which may have been loaded from the cache.
+        """
+        self._fast_render_checked = True
+        # Limited templates may not call the state functions and a custom
+        # log function is only relevant for undefined variables, which the
+        # fast render does not support
+        if not self._limited and self._log_fn is None:
+            self._fast_render = _compile_fast_render(self._env, self.template)
+
     def __eq__(self, other):
         """Compare template with another."""
         return (
@@ -1213,10 +1538,10 @@ def _state_generator(
 ) -> Generator[TemplateState]:
     """State generator for a domain or all states."""
     states = hass.states
-    # If domain is None, we want to iterate over all states, but making
-    # a copy of the dict is expensive. So we iterate over the protected
-    # _states dict instead. This is safe because we're not modifying it
-    # and everything is happening in the same thread (MainThread).
+    # Making a copy of the states is expensive. So we iterate over the
+    # protected _states dict or its domain index instead. This is safe
+    # because we're not modifying it and everything is happening in the
+    # same thread (MainThread).
     #
     # We do not want to expose this method in the public API though to
     # ensure it does not get misused.
@@ -1225,7 +1550,7 @@ def _state_generator(
     if domain is None:
         container = states._states.values()  # noqa: SLF001
     else:
-        container = states.async_all(domain)
+        container = states._states.domain_states(domain)  # noqa: SLF001
     for state in container:
         yield _template_state_no_collect(hass, state)
 
@@ -2737,7 +3062,7 @@ _template_context_manager = TemplateContextManager()
 
 
 def _render_with_context(
-    template_str: str, template: jinja2.Template, **kwargs: Any
+    template_str: str, template: jinja2.Template | _FastRender, **kwargs: Any
 ) -> str:
     """Store template being rendered in a ContextVar to aid error handling."""
     with _template_context_manager as cm:
@@ -2851,6 +3176,106 @@ class HassLoader(jinja2.BaseLoader):
         return self._sources[template], template, lambda: cur_reload == self._reload
 
 
+def _bytecode_cache_version() -> str:
+    """Return the version the compiled templates in the cache are valid for.
+
+    The generated code depends on the Python and Jinja versions. The
+    filters and tests are checked when a template is compiled, so
+    compiled templates are also only valid for a specific Home Assistant
+    version.
+    """
+    return f"{HA_VERSION}-{jinja2.__version__}-{MAGIC_NUMBER.hex()}"
+
+
+async def async_load_bytecode_cache(hass: HomeAssistant) -> None:
+    """Load the compiled templates of the last run from disk."""
+    await _get_bytecode_cache(hass).async_load()
+
+
+@singleton(_BYTECODE_CACHE)
+def _get_bytecode_cache(hass: HomeAssistant) -> TemplateBytecodeCache:
+    return TemplateBytecodeCache(hass)
+
+
+class TemplateBytecodeCache(jinja2.BytecodeCache):
+    """Cache of compiled templates that is persisted between restarts.
+
+    Templates are compiled to code objects that are stored marshalled in
+    .storage when Home Assistant shuts down. Only the templates that were
+    compiled during the run are stored, so templates that are no longer
+    used are dropped from the cache.
+    """
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize the bytecode cache."""
+        self._hass = hass
+        self._store = Store[dict[str, Any]](
+            hass, BYTECODE_STORAGE_VERSION, BYTECODE_STORAGE_KEY
+        )
+        # Marshalled code from the last run, base64 encoded
+        self._stored: dict[str, str] = {}
+        # Code compiled or loaded during this run
+        self._code: dict[str, CodeType] = {}
+        self._dirty = False
+
+    async def async_load(self) -> None:
+        """Load the cache from disk."""
+        self._hass.bus.async_listen_once(
+            EVENT_HOMEASSISTANT_FINAL_WRITE, self._async_save
+        )
+        if (data := await self._store.async_load()) is None:
+            return
+        if data.get("version") != _bytecode_cache_version():
+            _LOGGER.debug("Discarding compiled templates of another version")
+            self._dirty = True
+            return
+        self._stored = data["code"]
+
+    async def _async_save(self, _event: Event) -> None:
+        """Save the templates compiled during this run."""
+        if not self._dirty and len(self._code) == len(self._stored):
+            return
+        await self._store.async_save(
+            {
+                "version": _bytecode_cache_version(),
+                "code": {
+                    key: base64.b64encode(marshal.dumps(code)).decode()
+                    for key, code in self._code.items()
+                },
+            }
+        )
+
+    def get_code(self, key: str) -> CodeType | None:
+        """Return the compiled code for a key."""
+        if (code := self._code.get(key)) is not None:
+            return code
+        if (stored := self._stored.get(key)) is None:
+            return None
+        try:
+            code = marshal.loads(base64.b64decode(stored))
+        except (EOFError, ValueError, TypeError):
+            _LOGGER.debug("Discarding invalid compiled template %s", key)
+            return None
+        self._code[key] = code
+        return code
+
+    def set_code(self, key: str, code: CodeType) -> None:
+        """Store the compiled code for a key."""
+        if len(self._code) >= MAX_BYTECODE_CACHE_SIZE:
+            return
+        self._code[key] = code
+        self._dirty = True
+
+    def load_bytecode(self, bucket: jinja2.bccache.Bucket) -> None:
+        """Load the code of a template loaded by the HassLoader."""
+        bucket.code = self.get_code(f"{bucket.key}-{bucket.checksum}")
+
+    def dump_bytecode(self, bucket: jinja2.bccache.Bucket) -> None:
+        """Store the code of a template loaded by the HassLoader."""
+        if bucket.code is not None:
+            self.set_code(f"{bucket.key}-{bucket.checksum}", bucket.code)
+
+
 class TemplateEnvironment(ImmutableSandboxedEnvironment):
     """The Home Assistant template environment."""
 
@@ -2968,6 +3393,11 @@ class TemplateEnvironment(ImmutableSandboxedEnvironment):
 
         # This environment has access to hass, attach its loader to enable imports.
         self.loader = _get_hass_loader(hass)
+        # Reuse the templates compiled during the last run. Limited and
+        # strict environments have their own entries as they are compiled
+        # against different filters and tests.
+        self.bytecode_cache = _get_bytecode_cache(hass)
+        self._bytecode_prefix = "limited" if limited else "strict" if strict else ""
 
         # We mark these as a context functions to ensure they get
         # evaluated fresh with every execution, rather than executed
@@ -3219,7 +3649,18 @@ class TemplateEnvironment(ImmutableSandboxedEnvironment):
                 defer_init,
             )
 
-        compiled = super().compile(source)
+        bytecode_cache = self.bytecode_cache
+        if not isinstance(source, str) or not isinstance(
+            bytecode_cache, TemplateBytecodeCache
+        ):
+            compiled = super().compile(source)
+        else:
+            key = hashlib.sha1(
+                f"{self._bytecode_prefix}:{source}".encode(), usedforsecurity=False
+            ).hexdigest()
+            if (compiled := bytecode_cache.get_code(key)) is None:
+                compiled = super().compile(source)
+                bytecode_cache.set_code(key, compiled)
         self.template_cache[source] = compiled
         return compiled
 
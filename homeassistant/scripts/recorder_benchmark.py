@@ -0,0 +1,315 @@
+"""Script to benchmark the recorder with a synthetic workload."""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+from collections.abc import Iterator
+from dataclasses import asdict, dataclass
+import json
+import logging
+import os
+import random
+from tempfile import TemporaryDirectory
+from timeit import default_timer as timer
+from typing import Any
+
+from homeassistant import core
+from homeassistant.components.recorder import Recorder
+from homeassistant.components.recorder.tasks import CommitTask
+from homeassistant.helpers import recorder as recorder_helper
+from homeassistant.helpers.recorder import DATA_INSTANCE, session_scope
+
+# mypy: allow-untyped-calls
+
+DEFAULT_ENTITIES = 100
+DEFAULT_STATE_CHANGES = 10000
+DEFAULT_ATTRIBUTE_CHURN = 0.1
+DEFAULT_EVENTS_PER_STATE_CHANGE = 0.1
+DEFAULT_COMMIT_INTERVAL = 5
+
+BENCHMARK_EVENT = "recorder_benchmark_event"
+
+# The loop yields to the recorder after firing this many state changes
+FIRE_BATCH_SIZE = 1000
+
+_SIZE_QUERIES = {
+    "mysql": (
+        "SELECT SUM(data_length + index_length) FROM information_schema.tables"
+        " WHERE table_schema = DATABASE()"
+    ),
+    "postgresql": "SELECT pg_database_size(current_database())",
+}
+
+
+@dataclass(frozen=True, slots=True)
+class Workload:
+    """A synthetic recorder workload.
+
+    State changes are spread over the entities in turn. attribute_churn is
+    the share of state changes that come with attributes the entity did not
+    have before, and events_per_state_change is how many other events are
+    fired per state change, with the same churn on their data. rate limits
+    the state changes fired per second, 0 fires them as fast as possible.
+    """
+
+    entities: int = DEFAULT_ENTITIES
+    state_changes: int = DEFAULT_STATE_CHANGES
+    attribute_churn: float = DEFAULT_ATTRIBUTE_CHURN
+    events_per_state_change: float = DEFAULT_EVENTS_PER_STATE_CHANGE
+    rate: float = 0
+    seed: int = 0
+
+
+@dataclass(slots=True)
+class Report:
+    """The results of a benchmark run."""
+
+    dialect: str
+    schema_version: int
+    commit_interval: float
+    state_changes: int
+    events: int
+    fire_time: float
+    record_time: float
+    events_per_second: float
+    commits: int
+    commit_latency: dict[str, float]
+    cache_hit_rates: dict[str, float | None]
+    database_size_before: int | None
+    database_size_after: int | None
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the report as a dictionary."""
+        return asdict(self)
+
+
+def generate_workload(
+    workload: Workload,
+) -> Iterator[tuple[str, str | None, dict[str, Any]]]:
+    """Generate the state changes and events of a workload.
+
+    Yields the entity id, state and attributes of each state change, or the
+    event type and data of each event with None as the state.
+    """
+    rand = random.Random(workload.seed)
+    revisions = [0] * workload.entities
+    event_revision = 0
+    events_due = 0.0
+    for index in range(workload.state_changes):
+        entity = index % workload.entities
+        if rand.random() < workload.attribute_churn:
+            revisions[entity] += 1
+        yield (
+            f"sensor.benchmark_{entity}",
+            str(index // workload.entities),
+            {
+                "unit_of_measurement": "W",
+                "friendly_name": f"Benchmark {entity}",
+                "revision": revisions[entity],
+            },
+        )
+        events_due += workload.events_per_state_change
+        while events_due >= 1:
+            events_due -= 1
+            if rand.random() < workload.attribute_churn:
+                event_revision += 1
+            yield BENCHMARK_EVENT, None, {"revision": event_revision}
+
+
+def _percentile(values: list[float], percent: int) -> float:
+    """Return a percentile of sorted values."""
+    return values[min(len(values) - 1, len(values) * percent // 100)]
+
+
+def _hit_rate(stats: tuple[int, int]) -> float | None:
+    """Return the hit rate of cache statistics."""
+    hits, misses = stats
+    return round(hits / (hits + misses), 4) if hits + misses else None
+
+
+def _database_size(hass: core.HomeAssistant, db_url: str) -> int | None:
+    """Return the size of the database in bytes."""
+    instance = hass.data[DATA_INSTANCE]
+    if instance.dialect_name == "sqlite":
+        path = db_url.removeprefix("sqlite:///")
+        return sum(
+            os.path.getsize(file)
+            for file in (path, f"{path}-wal")
+            if os.path.exists(file)
+        )
+    if (query := _SIZE_QUERIES.get(instance.dialect_name)) is None:
+        return None
+    with session_scope(session=instance.get_session(), read_only=True) as session:
+        return int(session.connection().exec_driver_sql(query).scalar() or 0)
+
+
+async def async_run_benchmark(
+    hass: core.HomeAssistant,
+    db_url: str,
+    workload: Workload,
+    commit_interval: float = DEFAULT_COMMIT_INTERVAL,
+) -> Report:
+    """Record a workload and measure how the recorder keeps up."""
+    recorder_helper.async_initialize_recorder(hass)
+    instance = hass.data[DATA_INSTANCE] = Recorder(
+        hass=hass,
+        auto_purge=False,
+        auto_repack=False,
+        keep_days=10,
+        commit_interval=commit_interval,
+        uri=db_url,
+        db_max_retries=1,
+        db_retry_wait=1,
+        entity_filter=None,
+        exclude_event_types=set(),
+    )
+    instance.async_initialize()
+    instance.async_register()
+    instance.start()
+    await hass.async_start()
+    if not await instance.async_db_ready:
+        raise RuntimeError(f"The recorder could not connect to {db_url}")
+    await instance.async_recorder_ready.wait()
+
+    commit_durations: list[float] = []
+    committed = instance.commit_scheduler.committed
+
+    def _committed(started: float, ended: float, backlog: int, readers: int) -> None:
+        """Collect the duration of every commit."""
+        commit_durations.append(ended - started)
+        committed(started, ended, backlog, readers)
+
+    instance.commit_scheduler.committed = _committed  # type: ignore[method-assign]
+
+    size_before = await instance.async_add_executor_job(_database_size, hass, db_url)
+    state_changes = events = 0
+    start = timer()
+    for item, (entity_id_or_event_type, state, data) in enumerate(
+        generate_workload(workload), 1
+    ):
+        if state is not None:
+            hass.states.async_set(entity_id_or_event_type, state, data)
+            state_changes += 1
+            if (
+                workload.rate
+                and (delay := start + state_changes / workload.rate - timer()) > 0
+            ):
+                await asyncio.sleep(delay)
+        else:
+            hass.bus.async_fire(entity_id_or_event_type, data)
+            events += 1
+        if not item % FIRE_BATCH_SIZE:
+            await asyncio.sleep(0)
+    fire_time = timer() - start
+    instance.queue_task(CommitTask())
+    await instance.async_block_till_done()
+    record_time = timer() - start
+    size_after = await instance.async_add_executor_job(_database_size, hass, db_url)
+
+    commit_durations.sort()
+    return Report(
+        dialect=str(instance.dialect_name),
+        schema_version=instance.schema_version,
+        commit_interval=commit_interval,
+        state_changes=state_changes,
+        events=events,
+        fire_time=round(fire_time, 3),
+        record_time=round(record_time, 3),
+        events_per_second=round((state_changes + events) / record_time, 1),
+        commits=len(commit_durations),
+        commit_latency={
+            f"p{percent}": round(_percentile(commit_durations, percent), 4)
+            for percent in (50, 90, 99, 100)
+        }
+        if commit_durations
+        else {},
+        cache_hit_rates={
+            name: _hit_rate(manager.get_cache_stats())
+            for name, manager in (
+                ("states_meta", instance.states_meta_manager),
+                ("state_attributes", instance.state_attributes_manager),
+                ("event_types", instance.event_type_manager),
+                ("event_data", instance.event_data_manager),
+            )
+        },
+        database_size_before=size_before,
+        database_size_after=size_after,
+    )
+
+
+async def run_benchmark(
+    db_url: str | None, workload: Workload, commit_interval: float
+) -> Report:
+    """Run the benchmark in a temporary configuration directory."""
+    with TemporaryDirectory() as config_dir:
+        hass = core.HomeAssistant(config_dir)
+        try:
+            return await async_run_benchmark(
+                hass,
+                db_url or f"sqlite:///{os.path.join(config_dir, 'benchmark.db')}",
+                workload,
+                commit_interval,
+            )
+        finally:
+            await hass.async_stop()
+
+
+def run(args: list[str]) -> int:
+    """Handle recorder benchmark commandline script."""
+    parser = argparse.ArgumentParser(
+        description="Benchmark the recorder with a synthetic workload."
+    )
+    parser.add_argument(
+        "--db-url",
+        help="The database to record to, a temporary SQLite database by default",
+    )
+    parser.add_argument("--entities", type=int, default=DEFAULT_ENTITIES)
+    parser.add_argument("--state-changes", type=int, default=DEFAULT_STATE_CHANGES)
+    parser.add_argument(
+        "--attribute-churn",
+        type=float,
+        default=DEFAULT_ATTRIBUTE_CHURN,
+        help="The share of state changes and events with new attributes or data",
+    )
+    parser.add_argument(
+        "--events-per-state-change",
+        type=float,
+        default=DEFAULT_EVENTS_PER_STATE_CHANGE,
+    )
+    parser.add_argument(
+        "--rate",
+        type=float,
+        default=0,
+        help="The state changes fired per second, as fast as possible by default",
+    )
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument(
+        "--commit-interval", type=float, default=DEFAULT_COMMIT_INTERVAL
+    )
+    parser.add_argument("--json", action="store_true", help="Print the report as JSON")
+    parsed = parser.parse_args(args)
+
+    # Only the report is printed
+    logging.getLogger("homeassistant").setLevel(logging.WARNING)
+
+    report = asyncio.run(
+        run_benchmark(
+            parsed.db_url,
+            Workload(
+                entities=parsed.entities,
+                state_changes=parsed.state_changes,
+                attribute_churn=parsed.attribute_churn,
+                events_per_state_change=parsed.events_per_state_change,
+                rate=parsed.rate,
+                seed=parsed.seed,
+            ),
+            parsed.commit_interval,
+        )
+    )
+    if parsed.json:
+        print(json.dumps(report.as_dict()))
+        return 0
+    for key, value in report.as_dict().items():
+        print(f"{key}: {value}")
+    return 0
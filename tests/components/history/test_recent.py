@@ -0,0 +1,241 @@
+"""The tests for the recent history kept in memory."""
+
+from datetime import datetime, timedelta
+from itertools import product
+from unittest.mock import patch
+
+from freezegun.api import FrozenDateTimeFactory
+import pytest
+
+from homeassistant.components import history
+from homeassistant.components.history import recent
+from homeassistant.components.history.const import (
+    CONF_RECENT_HISTORY_SIZE,
+    DATA_RECENT_HISTORY,
+)
+from homeassistant.components.recorder import Recorder
+from homeassistant.components.recorder.const import SupportedDialect
+from homeassistant.components.recorder.db_schema import MAX_STATE_ATTRS_BYTES
+from homeassistant.core import HomeAssistant
+from homeassistant.setup import async_setup_component
+import homeassistant.util.dt as dt_util
+
+from tests.components.recorder.common import async_wait_recording_done
+
+ENTITY_IDS = ["sensor.power", "climate.living_room", "light.kitchen"]
+
+
+async def _async_set_states(
+    hass: HomeAssistant, freezer: FrozenDateTimeFactory, start: datetime
+) -> None:
+    """Record a mix of state and attribute changes."""
+    changes = [
+        ("sensor.power", "1", {"unit_of_measurement": "W"}),
+        ("light.kitchen", "on", {"brightness": 100}),
+        ("climate.living_room", "heat", {"current_temperature": 19}),
+        ("sensor.power", "2", {"unit_of_measurement": "W"}),
+        ("climate.living_room", "heat", {"current_temperature": 20}),
+        ("light.kitchen", "on", {"brightness": 50}),
+        ("sensor.power", "2", {"unit_of_measurement": "kW"}),
+        ("light.kitchen", "off", {}),
+        ("sensor.power", "3", {"unit_of_measurement": "kW"}),
+        ("climate.living_room", "off", {"current_temperature": 20}),
+    ]
+    for minute, (entity_id, state, attributes) in enumerate(changes):
+        freezer.move_to(start + timedelta(minutes=minute))
+        hass.states.async_set(entity_id, state, attributes)
+    await async_wait_recording_done(hass)
+
+
+async def _async_assert_same_as_database(
+    hass: HomeAssistant, start: datetime, end_times: list[datetime | None]
+) -> None:
+    """Assert the recent states give the same history as the database."""
+    recent_states = hass.data[DATA_RECENT_HISTORY].async_get_states(ENTITY_IDS)
+    assert recent_states is not None
+    start_times = [
+        start - timedelta(minutes=1),
+        *(start + timedelta(minutes=minute) for minute in range(10)),
+    ]
+    for start_time, end_time, *options in product(
+        start_times, end_times, *([True, False],) * 4
+    ):
+        if end_time and end_time < start_time:
+            continue
+        args = (start_time, end_time, ENTITY_IDS, *options)
+        from_database = await hass.async_add_executor_job(
+            recent.get_significant_states, hass, None, *args
+        )
+        from_memory = await hass.async_add_executor_job(
+            recent.get_significant_states, hass, recent_states, *args
+        )
+        assert from_memory == from_database, args
+
+
+async def test_recent_states_same_as_database(
+    hass: HomeAssistant, recorder_mock: Recorder, freezer: FrozenDateTimeFactory
+) -> None:
+    """Test recent states are returned the same way as from the database."""
+    start = dt_util.utcnow() + timedelta(minutes=1)
+    await async_setup_component(hass, history.DOMAIN, {})
+    await _async_set_states(hass, freezer, start)
+
+    await _async_assert_same_as_database(
+        hass, start, [None, start + timedelta(minutes=5, seconds=30)]
+    )
+
+
+async def test_recent_states_stitched_to_database(
+    hass: HomeAssistant, recorder_mock: Recorder, freezer: FrozenDateTimeFactory
+) -> None:
+    """Test the part of a period before the recent states comes from the database."""
+    start = dt_util.utcnow() + timedelta(minutes=1)
+    await async_setup_component(hass, history.DOMAIN, {})
+    # Forget the recent states as if the recorder was disabled
+    await hass.services.async_call("recorder", "enable", blocking=True)
+    await _async_set_states(hass, freezer, start)
+    await hass.services.async_call("recorder", "enable", blocking=True)
+    await _async_set_states(hass, freezer, start + timedelta(minutes=10))
+
+    await _async_assert_same_as_database(
+        hass,
+        start + timedelta(minutes=5),
+        [None, start + timedelta(minutes=12), start + timedelta(minutes=16)],
+    )
+
+
+async def test_recent_states_cover_period(
+    hass: HomeAssistant, recorder_mock: Recorder, freezer: FrozenDateTimeFactory
+) -> None:
+    """Test the database is not queried when the recent states cover the period."""
+    start = dt_util.utcnow() + timedelta(minutes=1)
+    await async_setup_component(hass, history.DOMAIN, {})
+    await _async_set_states(hass, freezer, start)
+    recent_states = hass.data[DATA_RECENT_HISTORY].async_get_states(ENTITY_IDS)
+
+    with patch.object(
+        history.recent.history, "get_significant_states"
+    ) as get_significant_states_mock:
+        states = await hass.async_add_executor_job(
+            recent.get_significant_states,
+            hass,
+            recent_states,
+            start + timedelta(minutes=2, seconds=30),
+            None,
+            ENTITY_IDS,
+            True,
+            True,
+            False,
+            False,
+        )
+    assert not get_significant_states_mock.called
+    assert [state["s"] for state in states["sensor.power"]] == ["1", "2", "3"]
+
+    assert hass.data[DATA_RECENT_HISTORY].async_get_states(["sensor.unknown"]) is None
+
+
+@pytest.mark.parametrize(
+    ("recorder_config", "entity_id"),
+    [({"exclude": {"entities": ["sensor.excluded"]}}, "sensor.excluded")],
+)
+async def test_recent_states_follow_recorder_filter(
+    hass: HomeAssistant, recorder_mock: Recorder, entity_id: str
+) -> None:
+    """Test states the recorder does not record are not kept."""
+    await async_setup_component(hass, history.DOMAIN, {})
+    hass.states.async_set(entity_id, "on")
+    hass.states.async_set("sensor.included", "on")
+    await hass.async_block_till_done()
+
+    recent_history = hass.data[DATA_RECENT_HISTORY]
+    assert recent_history.async_get_states([entity_id]) is None
+    assert recent_history.async_get_states(["sensor.included"]) is not None
+
+    await hass.services.async_call("recorder", "disable", blocking=True)
+    assert recent_history.async_get_states(["sensor.included"]) is None
+
+
+@pytest.mark.parametrize(
+    "dialect", [SupportedDialect.SQLITE, SupportedDialect.POSTGRESQL]
+)
+async def test_recent_states_attributes_as_recorded(
+    hass: HomeAssistant,
+    recorder_mock: Recorder,
+    freezer: FrozenDateTimeFactory,
+    dialect: SupportedDialect,
+) -> None:
+    """Test attributes are kept the way the recorder records them."""
+    start = dt_util.utcnow() + timedelta(minutes=1)
+    await async_setup_component(hass, history.DOMAIN, {})
+    changes = [
+        ("sensor.power", "1", {"unit_of_measurement": "W", "name": "a\x00b"}),
+        ("light.kitchen", "on", {"large": "x" * MAX_STATE_ATTRS_BYTES}),
+        ("climate.living_room", "heat", {"current_temperature": 19}),
+        # Not recorded since it cannot be serialized
+        ("climate.living_room", "cool", {"current_temperature": object()}),
+    ]
+    with patch.object(recorder_mock, "dialect_name", dialect):
+        for minute, (entity_id, state, attributes) in enumerate(changes):
+            freezer.move_to(start + timedelta(minutes=minute))
+            hass.states.async_set(entity_id, state, attributes)
+        await async_wait_recording_done(hass)
+
+    recent_states = hass.data[DATA_RECENT_HISTORY].async_get_states(ENTITY_IDS)
+    assert recent_states is not None
+    assert len(recent_states.states["climate.living_room"]) == 1
+    await _async_assert_same_as_database(hass, start, [None])
+    states = await hass.async_add_executor_job(
+        recent.get_significant_states,
+        hass,
+        recent_states,
+        start - timedelta(seconds=1),
+        None,
+        ENTITY_IDS,
+        True,
+        False,
+        False,
+        False,
+    )
+    assert states["light.kitchen"][0]["a"] == {}
+    # PostgreSQL cannot store NUL characters, strings end at the first one
+    assert states["sensor.power"][0]["a"] == {
+        "unit_of_measurement": "W",
+        "name": "a" if dialect == SupportedDialect.POSTGRESQL else "a\x00b",
+    }
+
+
+async def test_recent_states_max_size(
+    hass: HomeAssistant, recorder_mock: Recorder
+) -> None:
+    """Test the entities changed least recently are forgotten to bound memory."""
+    await async_setup_component(hass, history.DOMAIN, {})
+    recent_history = recent.RecentHistory(hass, 4096)
+    recent_history.async_setup()
+
+    attributes = {"value": "x" * 1000}
+    for entity_id in ("sensor.one", "sensor.two", "sensor.three"):
+        hass.states.async_set(entity_id, "on", attributes)
+    hass.states.async_set("sensor.one", "off", {"value": "y" * 1000})
+    await hass.async_block_till_done()
+
+    assert recent_history.async_get_states(["sensor.one", "sensor.three"]) is not None
+    assert recent_history.async_get_states(["sensor.two"]) is None
+    assert recent_history._size <= 4096
+
+    # A single entity larger than the maximum size is not kept
+    hass.states.async_set("sensor.one", "on", {"value": "x" * 5000})
+    await hass.async_block_till_done()
+    assert recent_history.async_get_states(["sensor.one"]) is None
+    assert recent_history._size == sum(
+        entity.size for entity in recent_history._entities.values()
+    )
+
+
+async def test_recent_history_disabled(
+    hass: HomeAssistant, recorder_mock: Recorder
+) -> None:
+    """Test recent states are not kept with a size of 0."""
+    await async_setup_component(
+        hass, history.DOMAIN, {history.DOMAIN: {CONF_RECENT_HISTORY_SIZE: 0}}
+    )
+    assert DATA_RECENT_HISTORY not in hass.data
@@ -543,6 +543,55 @@ async def test_history_stream_historical_only(
     }
 
 
+async def test_history_stream_historical_in_chunks(
+    hass: HomeAssistant, recorder_mock: Recorder, hass_ws_client: WebSocketGenerator
+) -> None:
+    """Test historical states are streamed in chunks of entities."""
+    now = dt_util.utcnow()
+    await async_setup_component(hass, "history", {})
+    for entity_id in ("sensor.one", "sensor.two", "sensor.three"):
+        hass.states.async_set(entity_id, "on")
+        await async_recorder_block_till_done(hass)
+    await async_wait_recording_done(hass)
+    end_time = dt_util.utcnow()
+
+    client = await hass_ws_client()
+    with patch.object(websocket_api, "STREAM_CHUNK_ENTITIES", 2):
+        await client.send_json(
+            {
+                "id": 1,
+                "type": "history/stream",
+                "entity_ids": [
+                    "sensor.one",
+                    "sensor.two",
+                    "sensor.three",
+                    "sensor.unknown",
+                ],
+                "start_time": now.isoformat(),
+                "end_time": end_time.isoformat(),
+                "minimal_response": True,
+                "no_attributes": True,
+            }
+        )
+        response = await client.receive_json()
+        assert response["success"]
+
+        first = await client.receive_json()
+        second = await client.receive_json()
+
+    assert first["type"] == second["type"] == "event"
+    assert first["event"]["states"].keys() == {"sensor.one", "sensor.two"}
+    assert second["event"]["states"].keys() == {"sensor.three"}
+    assert second["event"]["end_time"] == pytest.approx(
+        hass.states.get("sensor.three").last_updated_timestamp
+    )
+
+    # The chunk without states is not sent
+    await client.send_json({"id": 2, "type": "ping"})
+    response = await client.receive_json()
+    assert response == {"id": 2, "type": "pong"}
+
+
 async def test_history_stream_significant_domain_historical_only(
     hass: HomeAssistant, recorder_mock: Recorder, hass_ws_client: WebSocketGenerator
 ) -> None:
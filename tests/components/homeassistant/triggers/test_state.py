@@ -1771,3 +1771,67 @@ async def test_variables_priority(
     await hass.async_block_till_done()
     assert len(service_calls) == 2
     assert service_calls[1].data["some"] == "test.entity_2 - 0:00:10"
+
+
+async def test_triggers_share_state_listener(
+    hass: HomeAssistant, service_calls: list[ServiceCall]
+) -> None:
+    """Test triggers of the same entity share a single state change listener."""
+    with patch(
+        "homeassistant.components.homeassistant.triggers.state.async_track_state_change_event",
+        wraps=state_trigger.async_track_state_change_event,
+    ) as track_mock:
+        assert await async_setup_component(
+            hass,
+            automation.DOMAIN,
+            {
+                automation.DOMAIN: [
+                    {
+                        "trigger": {
+                            "platform": "state",
+                            "entity_id": "test.entity",
+                            "to": to_state,
+                        },
+                        "action": {
+                            "service": "test.automation",
+                            "data": {"to": to_state},
+                        },
+                    }
+                    for to_state in ("world", "planet", "galaxy")
+                ]
+                + [
+                    {
+                        "trigger": {
+                            "platform": "state",
+                            "entity_id": "test.entity",
+                            "attribute": "name",
+                        },
+                        "action": {
+                            "service": "test.automation",
+                            "data": {"to": "attribute"},
+                        },
+                    }
+                ]
+            },
+        )
+        await hass.async_block_till_done()
+
+    assert track_mock.call_count == 1
+
+    hass.states.async_set("test.entity", "planet")
+    await hass.async_block_till_done()
+    assert [call.data["to"] for call in service_calls] == ["planet"]
+
+    hass.states.async_set("test.entity", "planet", {"name": "earth"})
+    await hass.async_block_till_done()
+    assert [call.data["to"] for call in service_calls] == ["planet", "attribute"]
+
+    await hass.services.async_call(
+        automation.DOMAIN,
+        SERVICE_TURN_OFF,
+        {ATTR_ENTITY_ID: ENTITY_MATCH_ALL},
+        blocking=True,
+    )
+    hass.states.async_set("test.entity", "world")
+    await hass.async_block_till_done()
+    assert len(service_calls) == 3
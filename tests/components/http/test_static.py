@@ -1,13 +1,22 @@
 """The tests for http static files."""
 
+import gzip
 from http import HTTPStatus
+import os
 from pathlib import Path
+from unittest.mock import patch
 
 from aiohttp.test_utils import TestClient
 import pytest
 
 from homeassistant.components.http import StaticPathConfig
-from homeassistant.components.http.static import CachingStaticResource
+from homeassistant.components.http.static import (
+    CACHE_HEADER,
+    HOT_CACHE,
+    HOT_CACHE_MAX_FILE_SIZE,
+    HOT_CACHE_REVALIDATE_INTERVAL,
+    CachingStaticResource,
+)
 from homeassistant.const import EVENT_HOMEASSISTANT_START
 from homeassistant.core import HomeAssistant
 from homeassistant.helpers.http import KEY_ALLOW_CONFIGURED_CORS
@@ -63,3 +72,112 @@ async def test_async_register_static_paths(
     assert resp.status == HTTPStatus.OK
     resp = await client.get("/something_else/__init__.py")
     assert resp.status == HTTPStatus.OK
+
+
+@pytest.fixture
+def static_resource(hass: HomeAssistant, tmp_path: Path) -> Path:
+    """Register a caching static resource for a directory."""
+    resource = CachingStaticResource("/static", tmp_path)
+    hass.http.app.router.register_resource(resource)
+    hass.http.app[KEY_ALLOW_CONFIGURED_CORS](resource)
+    return tmp_path
+
+
+async def test_hot_cache_serves_compressed_variants(
+    mock_http_client: TestClient, static_resource: Path
+) -> None:
+    """Test small files are served from memory with their compressed variants."""
+    script = b"console.log('hello');" * 100
+    (static_resource / "app.js").write_bytes(script)
+    (static_resource / "app.js.br").write_bytes(b"brotli")
+    (static_resource / "logo.png").write_bytes(b"\x89PNG" * 100)
+
+    resp = await mock_http_client.get(
+        "/static/app.js",
+        headers={"Accept-Encoding": "gzip, br"},
+        auto_decompress=False,
+    )
+    assert resp.status == HTTPStatus.OK
+    assert resp.headers["Content-Encoding"] == "br"
+    assert resp.headers["Vary"] == "Accept-Encoding"
+    assert resp.headers["Cache-Control"] == CACHE_HEADER
+    assert resp.content_type == "text/javascript"
+    assert await resp.read() == b"brotli"
+
+    # The file has no gzip variant on disk, it is compressed in memory
+    resp = await mock_http_client.get(
+        "/static/app.js", headers={"Accept-Encoding": "gzip"}, auto_decompress=False
+    )
+    assert resp.headers["Content-Encoding"] == "gzip"
+    assert gzip.decompress(await resp.read()) == script
+    gzip_etag = resp.headers["ETag"]
+
+    resp = await mock_http_client.get(
+        "/static/app.js", headers={"Accept-Encoding": "identity"}
+    )
+    assert "Content-Encoding" not in resp.headers
+    assert await resp.read() == script
+    assert resp.headers["ETag"] != gzip_etag
+
+    resp = await mock_http_client.get(
+        "/static/app.js",
+        headers={"Accept-Encoding": "gzip", "If-None-Match": gzip_etag},
+    )
+    assert resp.status == HTTPStatus.NOT_MODIFIED
+
+    # Images are not compressed
+    resp = await mock_http_client.get(
+        "/static/logo.png", headers={"Accept-Encoding": "gzip"}
+    )
+    assert "Content-Encoding" not in resp.headers
+    assert resp.content_type == "image/png"
+    assert await resp.read() == b"\x89PNG" * 100
+
+    # Files are read once
+    with patch.object(Path, "read_bytes") as read_bytes:
+        resp = await mock_http_client.get("/static/app.js")
+        assert await resp.read() == script
+    read_bytes.assert_not_called()
+
+
+async def test_hot_cache_is_size_bounded(
+    mock_http_client: TestClient, static_resource: Path
+) -> None:
+    """Test large files are served from disk and the cache evicts old files."""
+    (static_resource / "large.bin").write_bytes(b"x" * (HOT_CACHE_MAX_FILE_SIZE + 1))
+    (static_resource / "first.bin").write_bytes(b"1" * 1000)
+    (static_resource / "second.bin").write_bytes(b"2" * 1000)
+
+    with patch.object(HOT_CACHE, "max_size", 1500):
+        for name in ("large.bin", "first.bin", "second.bin"):
+            resp = await mock_http_client.get(f"/static/{name}")
+            assert resp.status == HTTPStatus.OK
+            await resp.read()
+
+        assert HOT_CACHE.get(("large.bin", static_resource)) is None
+        assert HOT_CACHE.get(("first.bin", static_resource)) is None
+        assert HOT_CACHE.get(("second.bin", static_resource)) is not None
+        assert HOT_CACHE.size <= 1500
+
+        resp = await mock_http_client.get("/static/large.bin")
+        assert len(await resp.read()) == HOT_CACHE_MAX_FILE_SIZE + 1
+
+
+async def test_hot_cache_revalidates_changed_files(
+    mock_http_client: TestClient,
+    static_resource: Path,
+) -> None:
+    """Test files in memory are reloaded once they changed on disk."""
+    path = static_resource / "config.json"
+    path.write_text('{"version": 1}')
+    resp = await mock_http_client.get("/static/config.json")
+    assert await resp.json() == {"version": 1}
+
+    path.write_text('{"version": 22}')
+    os.utime(path, ns=(0, 0))
+    hot_file = HOT_CACHE.get(("config.json", static_resource))
+    assert hot_file is not None
+    hot_file.validated -= HOT_CACHE_REVALIDATE_INTERVAL
+
+    resp = await mock_http_client.get("/static/config.json")
+    assert await resp.json() == {"version": 22}
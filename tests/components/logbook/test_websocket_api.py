@@ -7,12 +7,14 @@ from typing import Any
 from unittest.mock import ANY, patch
 
 from freezegun import freeze_time
+from freezegun.api import FrozenDateTimeFactory
 import pytest
 
 from homeassistant import core
 from homeassistant.components import logbook, recorder
 from homeassistant.components.automation import ATTR_SOURCE, EVENT_AUTOMATION_TRIGGERED
 from homeassistant.components.logbook import websocket_api
+from homeassistant.components.logbook.processor import EventProcessor
 from homeassistant.components.recorder import Recorder
 from homeassistant.components.recorder.util import get_instance
 from homeassistant.components.script import EVENT_SCRIPT_STARTED
@@ -27,6 +29,7 @@ from homeassistant.const import (
     CONF_ENTITIES,
     CONF_EXCLUDE,
     CONF_INCLUDE,
+    EVENT_CALL_SERVICE,
     EVENT_HOMEASSISTANT_FINAL_WRITE,
     EVENT_HOMEASSISTANT_START,
     STATE_OFF,
@@ -1158,7 +1161,176 @@ async def test_logbook_stream_excluded_entities_inherits_filters_from_recorder(
     ) == listeners_without_writes(init_listeners)
 
 
+async def _async_get_events_and_fetched_periods(
+    websocket_client: Any, msg_id: int, start_time: str
+) -> tuple[list[dict[str, Any]], list]:
+    """Get the events and the periods fetched from the database."""
+    with patch.object(
+        EventProcessor,
+        "_get_events_from_database",
+        autospec=True,
+        side_effect=EventProcessor._get_events_from_database,
+    ) as from_database_mock:
+        await websocket_client.send_json(
+            {"id": msg_id, "type": "logbook/get_events", "start_time": start_time}
+        )
+        msg = await asyncio.wait_for(websocket_client.receive_json(), 2)
+    return msg["result"], [call.args[1:] for call in from_database_mock.mock_calls]
+
+
+async def _async_stream_historical_events(
+    hass: HomeAssistant, websocket_client: Any, msg_id: int, start_time: str
+) -> None:
+    """Stream the historical events of a period and unsubscribe."""
+    await websocket_client.send_json(
+        {"id": msg_id, "type": "logbook/event_stream", "start_time": start_time}
+    )
+    msg = await asyncio.wait_for(websocket_client.receive_json(), 2)
+    assert msg["success"]
+    while "partial" in (msg := await websocket_client.receive_json())["event"]:
+        pass
+    await websocket_client.send_json(
+        {"id": msg_id + 1, "type": "unsubscribe_events", "subscription": msg_id}
+    )
+    msg = await asyncio.wait_for(websocket_client.receive_json(), 2)
+    assert msg["success"]
+
+
 @patch("homeassistant.components.logbook.websocket_api.EVENT_COALESCE_TIME", 0)
+async def test_logbook_stream_caches_events(
+    recorder_mock: Recorder, hass: HomeAssistant, hass_ws_client: WebSocketGenerator
+) -> None:
+    """Test the events fetched by a stream are cached for later requests."""
+    now = dt_util.utcnow()
+    await asyncio.gather(
+        *[
+            async_setup_component(hass, comp, {})
+            for comp in ("homeassistant", "logbook")
+        ]
+    )
+    hass.states.async_set("light.kitchen", STATE_ON)
+    hass.states.async_set("light.kitchen", STATE_OFF)
+    off_state = hass.states.get("light.kitchen")
+    await async_wait_recording_done(hass)
+
+    websocket_client = await hass_ws_client()
+    await _async_stream_historical_events(hass, websocket_client, 1, now.isoformat())
+
+    # Events after the streamed period are fetched from the database
+    hass.states.async_set("light.kitchen", STATE_ON)
+    on_state = hass.states.get("light.kitchen")
+    await async_wait_recording_done(hass)
+
+    events, fetched = await _async_get_events_and_fetched_periods(
+        websocket_client, 3, now.isoformat()
+    )
+    assert [event["state"] for event in events] == ["off", "on"]
+    assert len(fetched) == 1
+    assert (
+        off_state.last_updated_timestamp
+        < fetched[0][0].timestamp()
+        < on_state.last_updated_timestamp
+    )
+
+    # Only periods with the same start are cached
+    later = off_state.last_updated + timedelta(microseconds=1)
+    _, fetched = await _async_get_events_and_fetched_periods(
+        websocket_client, 4, later.isoformat()
+    )
+    assert fetched[0][0] == later
+
+    await hass.services.async_call("recorder", "purge", {"keep_days": 1000})
+    await async_wait_recording_done(hass)
+    cached_events = events
+    events, fetched = await _async_get_events_and_fetched_periods(
+        websocket_client, 5, now.isoformat()
+    )
+    assert events == cached_events
+    assert fetched[0][0] == now
+
+
+async def test_logbook_cached_events_context(
+    recorder_mock: Recorder, hass: HomeAssistant, hass_ws_client: WebSocketGenerator
+) -> None:
+    """Test events after a cached period are augmented with its contexts."""
+    now = dt_util.utcnow()
+    await asyncio.gather(
+        *[
+            async_setup_component(hass, comp, {})
+            for comp in ("homeassistant", "logbook")
+        ]
+    )
+    hass.states.async_set("light.kitchen", STATE_OFF)
+    context = core.Context(user_id="b400facee45711eaa9308bfd3d19e474")
+    hass.bus.async_fire(
+        EVENT_CALL_SERVICE,
+        {ATTR_DOMAIN: "light", "service": "turn_on"},
+        context=context,
+    )
+    await async_wait_recording_done(hass)
+
+    websocket_client = await hass_ws_client()
+    await _async_stream_historical_events(hass, websocket_client, 1, now.isoformat())
+
+    hass.states.async_set("light.kitchen", STATE_ON, context=context)
+    await async_wait_recording_done(hass)
+
+    events, fetched = await _async_get_events_and_fetched_periods(
+        websocket_client, 3, now.isoformat()
+    )
+    assert fetched[0][0] > now
+    assert events[-1]["context_service"] == "turn_on"
+    assert events[-1]["context_domain"] == "light"
+
+    # The same as fetching the whole period from the database
+    hass.data[logbook.DOMAIN].cache.async_clear()
+    from_database, fetched = await _async_get_events_and_fetched_periods(
+        websocket_client, 4, now.isoformat()
+    )
+    assert fetched[0][0] == now
+    assert events == from_database
+
+
+async def test_logbook_event_at_end_of_cached_period(
+    recorder_mock: Recorder, hass: HomeAssistant, freezer: FrozenDateTimeFactory
+) -> None:
+    """Test an event at the end of a cached period is fetched after it."""
+    now = dt_util.utcnow()
+    await asyncio.gather(
+        *[
+            async_setup_component(hass, comp, {})
+            for comp in ("homeassistant", "logbook")
+        ]
+    )
+    freezer.tick()
+    hass.states.async_set("light.kitchen", STATE_OFF)
+    hass.states.async_set("light.kitchen", STATE_ON)
+    end = now + timedelta(seconds=2)
+    freezer.move_to(end)
+    hass.states.async_set("light.kitchen", STATE_OFF)
+    await async_wait_recording_done(hass)
+
+    event_types = websocket_api.async_determine_event_types(hass, None, None)
+    later = end + timedelta(seconds=1)
+    event_processor = EventProcessor(
+        hass, event_types, timestamp=True, include_entity_name=False
+    )
+    events = await get_instance(hass).async_add_executor_job(
+        event_processor.get_events, now, end
+    )
+    # The end of a period is not part of it
+    assert [event["state"] for event in events] == ["on"]
+    event_processor.async_cache_fetched_events(now, end)
+
+    event_processor = EventProcessor(
+        hass, event_types, timestamp=True, include_entity_name=False
+    )
+    events = await get_instance(hass).async_add_executor_job(
+        event_processor.get_events, now, later
+    )
+    assert [event["state"] for event in events] == ["on", "off"]
+
+
 async def test_subscribe_unsubscribe_logbook_stream(
     recorder_mock: Recorder, hass: HomeAssistant, hass_ws_client: WebSocketGenerator
 ) -> None:
@@ -0,0 +1,78 @@
+"""Test state attributes table manager."""
+
+from unittest.mock import patch
+
+from homeassistant.components import recorder
+from homeassistant.components.recorder import Recorder
+from homeassistant.components.recorder.db_schema import StateAttributes
+from homeassistant.const import EVENT_STATE_CHANGED
+from homeassistant.core import Event, HomeAssistant, State
+
+
+def _state_changed_event(old_state: State | None, new_state: State) -> Event:
+    """Create a state changed event."""
+    return Event(
+        EVENT_STATE_CHANGED,
+        {
+            "entity_id": new_state.entity_id,
+            "old_state": old_state,
+            "new_state": new_state,
+        },
+    )
+
+
+async def test_serialize_from_event_reuses_shared_attributes(
+    recorder_mock: Recorder, hass: HomeAssistant
+) -> None:
+    """Test attributes shared between states are only serialized once."""
+    manager = recorder.get_instance(hass).state_attributes_manager
+    state1 = State("sensor.test", "1", {"unit_of_measurement": "W"})
+    state2 = State("sensor.test", "2", state1.attributes)
+    state3 = State("sensor.test", "3", {"unit_of_measurement": "W"})
+
+    with patch.object(
+        StateAttributes,
+        "shared_attrs_bytes_from_event",
+        wraps=StateAttributes.shared_attrs_bytes_from_event,
+    ) as serialize_mock:
+        shared_attrs1 = manager.serialize_from_event(_state_changed_event(None, state1))
+        shared_attrs2 = manager.serialize_from_event(
+            _state_changed_event(state1, state2)
+        )
+        assert serialize_mock.call_count == 1
+
+        shared_attrs3 = manager.serialize_from_event(
+            _state_changed_event(state2, state3)
+        )
+        assert serialize_mock.call_count == 2
+
+    assert shared_attrs1 == b'{"unit_of_measurement":"W"}'
+    assert shared_attrs2 is shared_attrs1
+    assert shared_attrs3 == shared_attrs1
+
+
+async def test_serialize_from_event_respects_state_info(
+    recorder_mock: Recorder, hass: HomeAssistant
+) -> None:
+    """Test the cache is not used when the unrecorded attributes differ."""
+    manager = recorder.get_instance(hass).state_attributes_manager
+    attributes = {"unit_of_measurement": "W", "secret": "x"}
+    state1 = State("sensor.test", "1", attributes)
+    state2 = State(
+        "sensor.test",
+        "2",
+        state1.attributes,
+        state_info={"unrecorded_attributes": frozenset({"secret"})},
+    )
+
+    assert (
+        manager.serialize_from_event(_state_changed_event(None, state1))
+        == b'{"unit_of_measurement":"W","secret":"x"}'
+    )
+    assert (
+        manager.serialize_from_event(_state_changed_event(state1, state2))
+        == b'{"unit_of_measurement":"W"}'
+    )
+
+    manager.reset()
+    assert manager._serialized.get(id(state1.attributes)) is None
@@ -0,0 +1,161 @@
+"""Test the recorder commit scheduler."""
+
+from unittest.mock import patch
+
+import pytest
+
+from homeassistant.components.recorder import CONF_COMMIT_INTERVAL, Recorder
+from homeassistant.components.recorder.commit import (
+    BUSY_BACKLOG,
+    MAX_COMMIT_INTERVAL,
+    CommitScheduler,
+)
+from homeassistant.core import HomeAssistant
+import homeassistant.util.dt as dt_util
+
+from .common import async_recorder_block_till_done, async_wait_recording_done
+
+from tests.typing import RecorderInstanceGenerator
+
+
+@pytest.fixture
+async def mock_recorder_before_hass(
+    async_test_recorder: RecorderInstanceGenerator,
+) -> None:
+    """Set up recorder."""
+
+
+def _commit(
+    scheduler: CommitScheduler,
+    writes: int,
+    duration: float = 0.01,
+    backlog: int = 0,
+    readers: int = 0,
+) -> tuple[float, str]:
+    """Commit a number of events and return the next interval and reason."""
+    scheduler.pending_writes = writes
+    scheduler.committed(100.0, 100.0 + duration, backlog, readers)
+    return scheduler.interval, scheduler.reason
+
+
+def test_commit_interval_adapts_to_load() -> None:
+    """Test the commit interval follows the load of the recorder."""
+    scheduler = CommitScheduler(5)
+
+    assert _commit(scheduler, 1) == (10, "idle")
+    assert _commit(scheduler, 1) == (20, "idle")
+    assert _commit(scheduler, 1) == (MAX_COMMIT_INTERVAL, "idle")
+    assert _commit(scheduler, 1) == (MAX_COMMIT_INTERVAL, "idle")
+    assert _commit(scheduler, 100, readers=1) == (5, "readers")
+    assert _commit(scheduler, 100) == (5, "configured")
+    assert _commit(scheduler, 100, duration=2) == (10, "slow_commit")
+    assert _commit(scheduler, 100, backlog=BUSY_BACKLOG) == (1, "backlog")
+    assert scheduler.as_dict() == {
+        "commit_interval": 1,
+        "commit_interval_reason": "backlog",
+        "max_commit_interval": MAX_COMMIT_INTERVAL,
+        "last_commit_events": 100,
+        "last_commit_duration": 0.01,
+    }
+
+
+def test_commit_due() -> None:
+    """Test a commit is queued once per interval."""
+    scheduler = CommitScheduler(5)
+
+    assert scheduler.async_commit_due(1000.0, 0)
+    scheduler.async_commit_queued(1000.0)
+    assert not scheduler.async_commit_due(1004.0, 0)
+    assert scheduler.async_commit_due(1005.0, 0)
+    # Nothing was queued, the commit is still due
+    assert scheduler.async_commit_due(1006.0, 0)
+    scheduler.async_commit_queued(1006.0)
+    assert not scheduler.async_commit_due(1010.0, 0)
+    _commit(scheduler, 100)
+    # The interval starts over after a commit
+    assert not scheduler.async_commit_due(104.0, 0)
+    assert scheduler.async_commit_due(1011.0, 0)
+
+
+def test_commit_due_when_readers_start() -> None:
+    """Test the interval drops to the configured one once readers start."""
+    scheduler = CommitScheduler(5)
+    _commit(scheduler, 1)
+    _commit(scheduler, 1)
+    _commit(scheduler, 1)
+    assert scheduler.interval == MAX_COMMIT_INTERVAL
+
+    assert scheduler.async_commit_due(1000.0, 0)
+    scheduler.async_commit_queued(1000.0)
+    assert not scheduler.async_commit_due(1005.0, 0)
+    assert scheduler.interval == MAX_COMMIT_INTERVAL
+    # A reader started without a commit in between
+    assert scheduler.async_commit_due(1005.0, 1)
+    assert (scheduler.interval, scheduler.reason) == (5, "readers")
+
+
+def test_commit_every_event() -> None:
+    """Test the interval does not change when every event is committed."""
+    scheduler = CommitScheduler(0)
+
+    assert _commit(scheduler, 1) == (0, "configured")
+
+
+@pytest.mark.parametrize("recorder_config", [{CONF_COMMIT_INTERVAL: 60}])
+async def test_commit_when_transaction_is_full(
+    hass: HomeAssistant, recorder_mock: Recorder
+) -> None:
+    """Test events are committed before the interval once there are enough."""
+    await async_wait_recording_done(hass)
+    committed_writes: list[int] = []
+    scheduler = recorder_mock.commit_scheduler
+    original_committed = scheduler.committed
+
+    def _committed(*args: float) -> None:
+        committed_writes.append(scheduler.pending_writes)
+        original_committed(*args)
+
+    with (
+        patch("homeassistant.components.recorder.core.MAX_COMMIT_WRITES", 3),
+        patch.object(scheduler, "committed", _committed),
+    ):
+        for state in ("1", "2", "3", "4"):
+            hass.states.async_set("sensor.test", state)
+        await async_recorder_block_till_done(hass)
+
+    assert committed_writes == [3]
+    assert scheduler.pending_writes == 1
+
+
+async def test_only_read_jobs_count_as_readers(
+    hass: HomeAssistant, recorder_mock: Recorder
+) -> None:
+    """Test only read executor jobs are counted as readers."""
+    job = recorder_mock.async_add_executor_job(lambda: None)
+    assert recorder_mock._running_read_jobs == 0
+    await job
+
+    job = recorder_mock.async_add_read_executor_job(lambda: None)
+    assert recorder_mock._running_read_jobs == 1
+    await job
+    assert recorder_mock._running_read_jobs == 0
+
+
+async def test_commit_not_queued_does_not_delay_next_commit(
+    hass: HomeAssistant, recorder_mock: Recorder
+) -> None:
+    """Test the interval only starts over when a commit is queued."""
+    await async_wait_recording_done(hass)
+    scheduler = recorder_mock.commit_scheduler
+
+    with (
+        patch.object(scheduler, "async_commit_due", return_value=True),
+        patch.object(scheduler, "async_commit_queued") as queued_mock,
+    ):
+        # Nothing to commit
+        recorder_mock._async_commit_if_due(dt_util.utcnow())
+        assert not queued_mock.called
+
+        with patch.object(recorder_mock, "_async_commit", return_value=True):
+            recorder_mock._async_commit_if_due(dt_util.utcnow())
+        assert queued_mock.called
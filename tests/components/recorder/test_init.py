@@ -395,7 +395,10 @@ async def test_saving_state_with_exception(
     attributes = {"test_attr": 5, "test_attr_10": "nice"}
 
     def _throw_if_state_in_session(*args, **kwargs):
-        for obj in get_instance(hass).event_session:
+        instance = get_instance(hass)
+        if instance.states_manager._pending_inserts:
+            raise OperationalError("insert the state", "fake params", "forced to fail")
+        for obj in instance.event_session:
             if isinstance(obj, States):
                 raise OperationalError(
                     "insert the state", "fake params", "forced to fail"
@@ -438,7 +441,10 @@ async def test_saving_state_with_sqlalchemy_exception(
     attributes = {"test_attr": 5, "test_attr_10": "nice"}
 
     def _throw_if_state_in_session(*args, **kwargs):
-        for obj in get_instance(hass).event_session:
+        instance = get_instance(hass)
+        if instance.states_manager._pending_inserts:
+            raise SQLAlchemyError("insert the state", "fake params", "forced to fail")
+        for obj in instance.event_session:
             if isinstance(obj, States):
                 raise SQLAlchemyError(
                     "insert the state", "fake params", "forced to fail"
@@ -1473,6 +1479,59 @@ async def test_saving_sets_old_state(hass: HomeAssistant, setup_recorder: None)
         assert states_by_state["s4"].old_state_id == states_by_state["s2"].state_id
 
 
+@pytest.mark.parametrize("bulk_insert_states", [True, False])
+async def test_saving_sets_old_state_chain(
+    hass: HomeAssistant, setup_recorder: None, bulk_insert_states: bool
+) -> None:
+    """Test old states are linked with and without bulk inserting states."""
+    instance = recorder.get_instance(hass)
+    instance._bulk_insert_states = bulk_insert_states
+    hass.states.async_set("test.one", "s1", {"attr": 1})
+    await async_wait_recording_done(hass)
+    hass.states.async_set("test.one", "s2", {"attr": 1})
+    hass.states.async_set("test.two", "s3", {"attr": 2})
+    hass.states.async_set("test.one", "s4", {"attr": 2})
+    hass.states.async_set("test.one", "s5", {"attr": 3})
+    await async_wait_recording_done(hass)
+
+    with session_scope(hass=hass, read_only=True) as session:
+        states = list(
+            session.query(
+                StatesMeta.entity_id,
+                States.state_id,
+                States.old_state_id,
+                States.state,
+                StateAttributes.shared_attrs,
+            )
+            .outerjoin(StatesMeta, States.metadata_id == StatesMeta.metadata_id)
+            .outerjoin(
+                StateAttributes, States.attributes_id == StateAttributes.attributes_id
+            )
+        )
+    assert len(states) == 5
+    states_by_state = {state.state: state for state in states}
+
+    assert [states_by_state[f"s{i}"].entity_id for i in range(1, 6)] == [
+        "test.one",
+        "test.one",
+        "test.two",
+        "test.one",
+        "test.one",
+    ]
+    assert [states_by_state[f"s{i}"].shared_attrs for i in range(1, 6)] == [
+        '{"attr":1}',
+        '{"attr":1}',
+        '{"attr":2}',
+        '{"attr":2}',
+        '{"attr":3}',
+    ]
+    assert states_by_state["s1"].old_state_id is None
+    assert states_by_state["s2"].old_state_id == states_by_state["s1"].state_id
+    assert states_by_state["s3"].old_state_id is None
+    assert states_by_state["s4"].old_state_id == states_by_state["s2"].state_id
+    assert states_by_state["s5"].old_state_id == states_by_state["s4"].state_id
+
+
 async def test_saving_state_with_serializable_data(
     hass: HomeAssistant, caplog: pytest.LogCaptureFixture, setup_recorder: None
 ) -> None:
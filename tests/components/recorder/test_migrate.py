@@ -4,10 +4,11 @@ import datetime
 import importlib
 import sqlite3
 import sys
+from typing import cast
 from unittest.mock import ANY, Mock, PropertyMock, call, patch
 
 import pytest
-from sqlalchemy import create_engine, inspect, text
+from sqlalchemy import Table, create_engine, inspect, text
 from sqlalchemy.engine import Engine
 from sqlalchemy.engine.interfaces import ReflectedForeignKeyConstraint
 from sqlalchemy.exc import (
@@ -24,9 +25,12 @@ from homeassistant.components import persistent_notification as pn, recorder
 from homeassistant.components.recorder import db_schema, migration
 from homeassistant.components.recorder.db_schema import (
     SCHEMA_VERSION,
+    TABLE_STATISTICS_ARCHIVE,
+    TABLE_STATISTICS_META,
     Events,
     RecorderRuns,
     States,
+    StatisticsMeta,
 )
 from homeassistant.components.recorder.util import session_scope
 from homeassistant.core import HomeAssistant, State
@@ -1484,3 +1488,37 @@ def test_update_states_table_with_foreign_key_options_unsupported_engine(
         match="_update_states_table_with_foreign_key_options not supported for sqlite",
     ):
         migration._update_states_table_with_foreign_key_options(session_maker, engine)
+
+
+def test_statistics_archive_foreign_key_added_by_migration(hass: HomeAssistant) -> None:
+    """Test statistics_archive gets its foreign key in schema version 49.
+
+    The table is created without the foreign key when the database exists.
+    """
+    engine = create_engine("sqlite://", poolclass=StaticPool)
+    session_maker = scoped_session(sessionmaker(bind=engine, future=True))
+    cast(Table, StatisticsMeta.__table__).create(engine)
+
+    migration.pre_migrate_schema(engine)
+    db_schema.Base.metadata.create_all(engine)
+
+    def _foreign_keys() -> list[ReflectedForeignKeyConstraint]:
+        return inspect(engine).get_foreign_keys(TABLE_STATISTICS_ARCHIVE)
+
+    assert _foreign_keys() == []
+    assert {
+        index["name"] for index in inspect(engine).get_indexes(TABLE_STATISTICS_ARCHIVE)
+    } == {"ix_statistics_archive_metadata_id_start_ts"}
+
+    migration._apply_update(Mock(), hass, engine, session_maker, 49, 48)
+
+    assert [
+        (foreign_key["constrained_columns"], foreign_key["referred_table"])
+        for foreign_key in _foreign_keys()
+    ] == [(["metadata_id"], TABLE_STATISTICS_META)]
+
+    # Migrating again leaves the table alone
+    with patch.object(Table, "drop") as drop_mock:
+        migration._apply_update(Mock(), hass, engine, session_maker, 49, 48)
+    drop_mock.assert_not_called()
+    engine.dispose()
@@ -0,0 +1,303 @@
+"""Test time partitioned recorder tables."""
+
+from collections.abc import Generator
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+from typing import Any
+from unittest.mock import patch
+
+import pytest
+from sqlalchemy import inspect, text
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.engine import Dialect
+from sqlalchemy.orm.session import Session, SessionTransaction
+
+from homeassistant.components.recorder import Recorder
+from homeassistant.components.recorder.const import SupportedDialect
+from homeassistant.components.recorder.db_schema import States
+from homeassistant.components.recorder.partition import (
+    TablePartition,
+    create_future_partitions,
+    disconnect_partition_states,
+    drop_partition,
+    find_expired_partitions,
+    find_table_partitions,
+    select_partition_ids,
+)
+from homeassistant.components.recorder.purge import purge_old_data
+from homeassistant.components.recorder.util import session_scope
+from homeassistant.core import HomeAssistant
+from homeassistant.util import dt as dt_util
+
+from .common import async_wait_recording_done
+
+from tests.typing import RecorderInstanceGenerator
+
+DAY = 86400
+START = dt_util.utc_to_timestamp(datetime(2024, 1, 1, tzinfo=dt_util.UTC))
+STATES_KEY = "RANGE (last_updated_ts)"
+
+
+@pytest.fixture
+async def mock_recorder_before_hass(
+    async_test_recorder: RecorderInstanceGenerator,
+) -> None:
+    """Set up recorder."""
+
+
+class _Result(list[tuple[Any, ...]]):
+    """Rows returned by a statement."""
+
+    def one(self) -> tuple[Any, ...]:
+        """Return the only row."""
+        assert len(self) == 1
+        return self[0]
+
+
+class _PostgreSQLSession:
+    """Session that compiles statements for PostgreSQL instead of running them.
+
+    Queries of the partitions of a table return the rows given for it, other
+    statements return the next rows of results.
+    """
+
+    def __init__(
+        self,
+        partitions: dict[str, list[tuple[str, str, str]]],
+        results: list[list[tuple[Any, ...]]] | None = None,
+    ) -> None:
+        """Initialize the session."""
+        self.dialect: Dialect = postgresql.dialect()
+        self.statements: list[str] = []
+        self._partitions = partitions
+        self._results = results or []
+
+    def get_bind(self) -> Any:
+        """Return the bind, which only needs a dialect."""
+        return self
+
+    def execute(self, statement: Any, params: dict[str, Any] | None = None) -> Any:
+        """Compile a statement and return the partitions it queries."""
+        compiled = statement.compile(dialect=self.dialect)
+        if params is not None:
+            assert set(compiled.params) == set(params)
+            return self._partitions.get(params["table"], [])
+        # Statements without parameters must not contain bind markers
+        assert not compiled.params
+        self.statements.append(str(compiled))
+        return _Result(self._results.pop(0) if self._results else [])
+
+    @contextmanager
+    def begin_nested(self) -> Generator[None]:
+        """Start a savepoint."""
+        yield
+
+
+def _bound(start: str | float, end: str | float) -> str:
+    """Return a range partition bound as rendered by pg_get_expr."""
+    return f"FOR VALUES FROM ({start}) TO ({end})"
+
+
+def test_find_table_partitions() -> None:
+    """Test finding the range partitions of a table."""
+    session = _PostgreSQLSession(
+        {
+            "states": [
+                (
+                    "states_p2",
+                    _bound(f"'{START + DAY}'", f"'{START + 2 * DAY}'"),
+                    STATES_KEY,
+                ),
+                (
+                    "states_p1",
+                    _bound(f"{START}::double precision", START + DAY),
+                    STATES_KEY,
+                ),
+                ("states_old", _bound("MINVALUE", START), STATES_KEY),
+                ("states_default", "DEFAULT", STATES_KEY),
+            ],
+            "events": [("events_p1", _bound(START, START + DAY), "RANGE (event_id)")],
+        }
+    )
+    states_partitions = [
+        TablePartition("states_old", float("-inf"), START),
+        TablePartition("states_p1", START, START + DAY),
+        TablePartition("states_p2", START + DAY, START + 2 * DAY),
+    ]
+
+    assert find_table_partitions(session, "states") == states_partitions
+    assert (
+        find_expired_partitions(session, "states", START + DAY + 1)
+        == states_partitions[:2]
+    )
+    # Not partitioned by its timestamp column
+    assert find_table_partitions(session, "events") == []
+    assert find_table_partitions(session, "statistics_short_term") == []
+
+
+@pytest.mark.parametrize(
+    ("interval", "names"),
+    [
+        (DAY, ["states_p20240103", "states_p20240104"]),
+        (DAY / 2, ["states_p20240103_0000", "states_p20240103_1200"]),
+    ],
+)
+def test_create_future_partitions(interval: float, names: list[str]) -> None:
+    """Test partitions are created ahead with the interval of the last one."""
+    last_start = START + 2 * DAY - interval
+    session = _PostgreSQLSession(
+        {
+            "states": [
+                ("states_default", "DEFAULT", STATES_KEY),
+                ("states_last", _bound(last_start, START + 2 * DAY), STATES_KEY),
+            ]
+        }
+    )
+
+    create_future_partitions(session, START + 2 * DAY + interval + 1)
+
+    start = START + 2 * DAY
+    assert session.statements == [
+        f"CREATE TABLE {names[0]} PARTITION OF states "
+        f"FOR VALUES FROM ({start!r}) TO ({start + interval!r})",
+        f"CREATE TABLE {names[1]} PARTITION OF states "
+        f"FOR VALUES FROM ({start + interval!r}) TO ({start + 2 * interval!r})",
+    ]
+
+
+def test_partition_statements_compile() -> None:
+    """Test the statements run on a partition compile for PostgreSQL."""
+    session = _PostgreSQLSession({}, [[(1,), (2,)], [(5, 7)], []])
+    partition = TablePartition("states_2024", START, START + DAY)
+
+    assert select_partition_ids(session, partition, "attributes_id") == {1, 2}
+    assert disconnect_partition_states(session, partition) == (5, 7)
+    drop_partition(session, partition)
+
+    assert session.statements == [
+        "SELECT DISTINCT attributes_id FROM states_2024 "
+        "WHERE attributes_id IS NOT NULL",
+        "SELECT min(state_id), max(state_id) FROM states_2024",
+        "UPDATE states SET old_state_id = NULL "
+        "WHERE old_state_id IN (SELECT state_id FROM states_2024)",
+        "DROP TABLE states_2024",
+    ]
+
+
+def _create_partition_copy(
+    session: Session, name: str, table: str, column: str, ids: list[int]
+) -> None:
+    """Create a table holding a copy of some rows, standing in for a partition."""
+    session.execute(
+        text(
+            f"CREATE TABLE {name} AS SELECT * FROM {table} "  # noqa: S608
+            f"WHERE {column} IN ({', '.join(map(str, ids))})"
+        )
+    )
+
+
+async def test_purge_drops_expired_partitions(
+    hass: HomeAssistant, recorder_mock: Recorder
+) -> None:
+    """Test purging runs the statements that drop expired partitions."""
+    hass.states.async_set("test.partition", "on", {"attr": 1})
+    hass.states.async_set("test.partition", "off", {"attr": 2})
+    hass.bus.async_fire("test_partition_event", {"data": 1})
+    await async_wait_recording_done(hass)
+
+    def _create_partitions() -> list[int]:
+        with session_scope(session=recorder_mock.get_session()) as session:
+            state_ids = [
+                state_id
+                for (state_id,) in session.query(States.state_id).order_by(
+                    States.state_id
+                )
+            ]
+            event_ids = [
+                event_id
+                for (event_id,) in session.execute(text("SELECT event_id FROM events"))
+            ]
+            _create_partition_copy(
+                session, "states_p1", "states", "state_id", state_ids
+            )
+            _create_partition_copy(
+                session, "events_p1", "events", "event_id", event_ids
+            )
+        return state_ids
+
+    state_ids = await recorder_mock.async_add_executor_job(_create_partitions)
+    assert (
+        recorder_mock.states_manager._last_committed_id["test.partition"]
+        == (state_ids[-1])
+    )
+
+    purge_before = dt_util.utcnow() - timedelta(days=4)
+    states_partition = TablePartition("states_p1", START, START + DAY)
+    events_partition = TablePartition("events_p1", START, START + DAY)
+
+    def _find_expired_partitions(
+        session: Session, table: str, purge_before_ts: float
+    ) -> list[TablePartition]:
+        assert purge_before_ts == purge_before.timestamp()
+        return {"states": [states_partition], "events": [events_partition]}.get(
+            table, []
+        )
+
+    drop_transactions: list[SessionTransaction | None] = []
+
+    def _drop_partition(session: Session, partition: TablePartition) -> None:
+        drop_transactions.append(session.get_transaction())
+        drop_partition(session, partition)
+
+    with (
+        patch.object(recorder_mock, "dialect_name", SupportedDialect.POSTGRESQL),
+        patch(
+            "homeassistant.components.recorder.purge.find_expired_partitions",
+            side_effect=_find_expired_partitions,
+        ),
+        patch(
+            "homeassistant.components.recorder.purge.drop_partition",
+            side_effect=_drop_partition,
+        ),
+    ):
+        await recorder_mock.async_add_executor_job(
+            purge_old_data, recorder_mock, purge_before, False
+        )
+
+    # Each partition is dropped in its own transaction
+    assert len(drop_transactions) == 2
+    assert drop_transactions[0] is not drop_transactions[1]
+    assert not any(transaction.is_active for transaction in drop_transactions)
+
+    def _get_tables_and_old_state_ids() -> tuple[set[str], list[int | None]]:
+        with session_scope(session=recorder_mock.get_session()) as session:
+            tables = set(inspect(session.get_bind()).get_table_names())
+            old_state_ids = [
+                old_state_id
+                for (old_state_id,) in session.query(States.old_state_id).order_by(
+                    States.state_id
+                )
+            ]
+        return tables, old_state_ids
+
+    tables, old_state_ids = await recorder_mock.async_add_executor_job(
+        _get_tables_and_old_state_ids
+    )
+    assert "states_p1" not in tables
+    assert "events_p1" not in tables
+    # The states linking to states in the dropped partition are unlinked
+    assert old_state_ids == [None, None]
+    # The committed state is gone, the next state must not link to it
+    assert "test.partition" not in recorder_mock.states_manager._last_committed_id
+
+
+async def test_purge_without_partitions_on_sqlite(
+    hass: HomeAssistant, recorder_mock: Recorder
+) -> None:
+    """Test partitions are not looked up on databases that cannot have them."""
+    with patch(
+        "homeassistant.components.recorder.purge.find_expired_partitions"
+    ) as find_mock:
+        purge_old_data(recorder_mock, dt_util.utcnow(), repack=False)
+
+    assert not find_mock.called
@@ -0,0 +1,298 @@
+"""Test the recorder read-only database connections."""
+
+import asyncio
+from concurrent.futures import CancelledError
+from pathlib import Path
+import threading
+from unittest.mock import MagicMock, patch
+
+import pytest
+from sqlalchemy import create_engine, text
+from sqlalchemy.exc import OperationalError
+
+from homeassistant.components.recorder import Recorder
+from homeassistant.components.recorder.readers import (
+    READ_QUERY_TIMEOUT,
+    DatabaseReaders,
+    _ReadJob,
+    async_cancel_on_close,
+)
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.recorder import session_scope
+
+from tests.typing import RecorderInstanceGenerator
+
+
+@pytest.fixture
+async def mock_recorder_before_hass(
+    async_test_recorder: RecorderInstanceGenerator,
+) -> None:
+    """Set up recorder."""
+
+
+@pytest.fixture
+async def readers(
+    hass: HomeAssistant, recorder_mock: Recorder, tmp_path: Path
+) -> DatabaseReaders:
+    """Set up read-only connections to a SQLite database with a table."""
+    db_url = f"sqlite:///{tmp_path}/readers.db"
+    engine = create_engine(db_url)
+    with engine.begin() as connection:
+        connection.execute(text("CREATE TABLE numbers (number INTEGER)"))
+        connection.execute(text("INSERT INTO numbers VALUES (1), (2)"))
+    engine.dispose()
+    readers = DatabaseReaders(recorder_mock, create_engine(db_url, future=True))
+    yield readers
+    await hass.async_add_executor_job(readers.close)
+
+
+async def test_read_jobs_run_on_the_database_executor_without_readers(
+    hass: HomeAssistant, recorder_mock: Recorder
+) -> None:
+    """Test read jobs run in the database executor when there are no readers."""
+    thread_id = await recorder_mock.async_add_read_executor_job(threading.get_ident)
+
+    assert thread_id in recorder_mock.recorder_and_worker_thread_ids
+
+
+async def test_read_jobs_use_read_only_sessions(
+    hass: HomeAssistant, recorder_mock: Recorder, readers: DatabaseReaders
+) -> None:
+    """Test read jobs get read-only sessions on their own connections."""
+
+    def _read() -> list[int]:
+        with session_scope(hass=hass, read_only=True) as session:
+            assert session.get_bind() is readers.engine
+            return [row[0] for row in session.execute(text("SELECT * FROM numbers"))]
+
+    with patch.object(recorder_mock, "_readers", readers):
+        assert await recorder_mock.async_add_read_executor_job(_read) == [1, 2]
+        # Other database jobs keep using the connections of the recorder
+        assert (
+            await recorder_mock.async_add_executor_job(
+                lambda: recorder_mock.get_session().get_bind()
+            )
+            is not readers.engine
+        )
+
+
+async def test_cancelled_read_job_stops_its_query(
+    hass: HomeAssistant, readers: DatabaseReaders
+) -> None:
+    """Test cancelling a running read job interrupts its query."""
+    started = threading.Event()
+    errors: list[Exception] = []
+
+    def _read_forever() -> None:
+        with readers.get_session() as session:
+            # The query sets started once it runs
+            session.connection().connection.driver_connection.create_function(
+                "started", 0, started.set
+            )
+            try:
+                session.execute(
+                    text(
+                        "WITH RECURSIVE numbers(number) AS (SELECT 1 UNION ALL"
+                        " SELECT number + 1 FROM numbers WHERE started() IS NULL)"
+                        " SELECT count(*) FROM numbers"
+                    )
+                )
+            except OperationalError as err:
+                errors.append(err)
+
+    future = readers.async_add_executor_job(hass, _read_forever)
+    assert await hass.async_add_executor_job(started.wait, 5)
+    # Readers are not used with SQLite, its connections are interrupted
+    # like the cursors of the other databases are cancelled
+    with patch.object(
+        readers, "_interrupt", lambda dbapi_connection: dbapi_connection.interrupt()
+    ):
+        future.cancel()
+        await hass.async_block_till_done()
+    # The interrupted job gets back to its thread and finishes
+    await hass.async_add_executor_job(readers.close)
+
+    assert len(errors) == 1
+    # The interrupt may also stop the query while it calls started
+    assert "interrupted" in str(errors[0]) or "function raised exception" in str(
+        errors[0]
+    )
+
+
+async def test_cancelled_read_job_stops_before_its_next_query(
+    hass: HomeAssistant, readers: DatabaseReaders
+) -> None:
+    """Test a cancelled read job does not run queries after it was cancelled."""
+    started = threading.Event()
+    cancelled = threading.Event()
+    errors: list[Exception] = []
+
+    def _read_twice() -> None:
+        with readers.get_session() as session:
+            session.execute(text("SELECT 1"))
+            started.set()
+            cancelled.wait(5)
+            try:
+                session.execute(text("SELECT 2"))
+            except CancelledError as err:
+                errors.append(err)
+
+    future = readers.async_add_executor_job(hass, _read_twice)
+    assert await hass.async_add_executor_job(started.wait, 5)
+    future.cancel()
+    await hass.async_block_till_done()
+    cancelled.set()
+    await hass.async_add_executor_job(readers.close)
+
+    assert len(errors) == 1
+
+
+async def test_cancelled_read_job_does_not_start(
+    hass: HomeAssistant, readers: DatabaseReaders
+) -> None:
+    """Test a read job cancelled before it runs is not started."""
+    target = MagicMock()
+    job = _ReadJob()
+    readers._cancel_job(job)
+
+    with pytest.raises(CancelledError):
+        readers._run_job(job, target)
+    target.assert_not_called()
+
+
+async def test_cancelled_read_job_is_interrupted_without_the_lock(
+    hass: HomeAssistant, readers: DatabaseReaders
+) -> None:
+    """Test the query of a cancelled job is interrupted after the lock is released."""
+    job = _ReadJob()
+    job.thread_id = threading.get_ident()
+    dbapi_connection = MagicMock()
+    readers._connections[job.thread_id] = dbapi_connection
+    locked: list[bool] = []
+
+    def _interrupt(connection: MagicMock) -> None:
+        assert connection is dbapi_connection
+        locked.append(readers._lock.locked())
+
+    with patch.object(readers, "_interrupt", _interrupt):
+        readers._cancel_job(job)
+
+    assert job.cancelled
+    assert locked == [False]
+
+
+async def test_cancelled_read_job_keeps_its_thread_until_interrupted(
+    hass: HomeAssistant, readers: DatabaseReaders
+) -> None:
+    """Test a cancelled job does not give up its thread while it is interrupted.
+
+    Another job could run on the connection and have its query stopped instead.
+    """
+    job = _ReadJob()
+    running = threading.Event()
+    interrupting = threading.Event()
+    interrupted = threading.Event()
+
+    def _read() -> None:
+        readers._connections[threading.get_ident()] = MagicMock()
+        running.set()
+        interrupting.wait(5)
+
+    def _interrupt(dbapi_connection: MagicMock) -> None:
+        interrupting.set()
+        interrupted.wait(5)
+
+    def _run() -> None:
+        job_thread = threading.Thread(target=readers._run_job, args=(job, _read))
+        job_thread.start()
+        assert running.wait(5)
+        with patch.object(readers, "_interrupt", _interrupt):
+            cancel_thread = threading.Thread(target=readers._cancel_job, args=(job,))
+            cancel_thread.start()
+            assert interrupting.wait(5)
+            # The job is done but waits for the interrupt to return
+            job_thread.join(0.1)
+            assert job_thread.is_alive()
+            assert job.thread_id == job_thread.ident
+            interrupted.set()
+            cancel_thread.join(5)
+        job_thread.join(5)
+        assert not job_thread.is_alive()
+        assert job.thread_id is None
+        assert not job.interrupting
+
+    await hass.async_add_executor_job(_run)
+
+
+@pytest.mark.parametrize(
+    ("dialect", "version", "expected_statements"),
+    [
+        (
+            "mysql",
+            "10.11.6-MariaDB",
+            [
+                "SET SESSION TRANSACTION READ ONLY",
+                "SELECT VERSION()",
+                f"SET SESSION max_statement_time = {READ_QUERY_TIMEOUT}",
+            ],
+        ),
+        (
+            "mysql",
+            "8.0.36",
+            [
+                "SET SESSION TRANSACTION READ ONLY",
+                "SELECT VERSION()",
+                f"SET SESSION max_execution_time = {READ_QUERY_TIMEOUT * 1000}",
+            ],
+        ),
+        (
+            "postgresql",
+            "16.2",
+            [
+                "SET SESSION CHARACTERISTICS AS TRANSACTION READ ONLY",
+                f"SET statement_timeout = {READ_QUERY_TIMEOUT * 1000}",
+            ],
+        ),
+    ],
+)
+async def test_connections_are_read_only_with_a_timeout(
+    hass: HomeAssistant,
+    readers: DatabaseReaders,
+    dialect: str,
+    version: str,
+    expected_statements: list[str],
+) -> None:
+    """Test new connections are made read-only with a statement timeout."""
+    statements: list[str] = []
+    dbapi_connection = MagicMock(
+        cursor=lambda: MagicMock(
+            execute=statements.append, fetchall=lambda: [[version]]
+        )
+    )
+    with patch.object(readers, "engine") as engine:
+        engine.dialect.name = dialect
+        readers._setup_connection(dbapi_connection, None)
+
+    assert statements[-len(expected_statements) :] == expected_statements
+    assert dbapi_connection.commit.called is (dialect == "postgresql")
+
+
+async def test_cancel_on_close(hass: HomeAssistant) -> None:
+    """Test a database job is cancelled when the websocket closes."""
+    connection = MagicMock(subscriptions={})
+    future = hass.loop.create_future()
+    task = hass.async_create_task(async_cancel_on_close(connection, 5, future))
+    await asyncio.sleep(0)
+
+    connection.subscriptions[5]()
+    with pytest.raises(asyncio.CancelledError):
+        await task
+    assert future.cancelled()
+    assert connection.subscriptions == {}
+
+    future = hass.loop.create_future()
+    task = hass.async_create_task(async_cancel_on_close(connection, 6, future))
+    await asyncio.sleep(0)
+    future.set_result("result")
+    assert await task == "result"
+    assert connection.subscriptions == {}
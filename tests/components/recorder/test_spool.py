@@ -0,0 +1,413 @@
+"""Test spooling recorder events to disk."""
+
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+from homeassistant.components import recorder
+from homeassistant.components.recorder import Recorder
+from homeassistant.components.recorder.db_schema import States, StatesMeta
+from homeassistant.components.recorder.spool import (
+    RecorderSpool,
+    event_from_spool,
+    event_to_spool,
+)
+from homeassistant.components.recorder.util import session_scope
+from homeassistant.const import EVENT_STATE_CHANGED
+from homeassistant.core import Context, Event, EventOrigin, HomeAssistant, State
+
+from .common import async_wait_recording_done
+
+from tests.typing import RecorderInstanceGenerator
+
+
+@pytest.fixture
+async def mock_recorder_before_hass(
+    async_test_recorder: RecorderInstanceGenerator,
+) -> None:
+    """Set up recorder."""
+
+
+def _state_fields(state: State) -> tuple:
+    """Return the fields of a state the recorder records."""
+    return (
+        state.entity_id,
+        state.state,
+        state.attributes,
+        state.last_changed,
+        state.last_reported,
+        state.last_updated,
+        state.last_updated_timestamp,
+        state.state_info,
+    )
+
+
+def _state_changed_event(entity_id: str, state: str) -> Event:
+    """Create a state changed event."""
+    return Event(
+        EVENT_STATE_CHANGED,
+        {
+            "entity_id": entity_id,
+            "old_state": None,
+            "new_state": State(entity_id, state),
+        },
+    )
+
+
+def test_event_round_trip() -> None:
+    """Test events are restored from the spool."""
+    context = Context(user_id="abc")
+    old_state = State("sensor.test", "1", {"unit_of_measurement": "W"})
+    new_state = State(
+        "sensor.test",
+        "2",
+        {"unit_of_measurement": "W", "secret": "x"},
+        last_changed=old_state.last_changed,
+        state_info={"unrecorded_attributes": frozenset({"secret"})},
+    )
+    event = Event(
+        EVENT_STATE_CHANGED,
+        {"entity_id": "sensor.test", "old_state": old_state, "new_state": new_state},
+        EventOrigin.remote,
+        context=context,
+    )
+
+    restored = event_from_spool(event_to_spool(event))
+
+    assert restored.event_type == EVENT_STATE_CHANGED
+    assert restored.origin is EventOrigin.remote
+    assert restored.time_fired_timestamp == event.time_fired_timestamp
+    assert restored.context == context
+    assert restored.data["entity_id"] == "sensor.test"
+    assert _state_fields(restored.data["old_state"]) == _state_fields(old_state)
+    assert _state_fields(restored.data["new_state"]) == _state_fields(new_state)
+
+    event = Event("test_event", {"value": 1}, context=context)
+    restored = event_from_spool(event_to_spool(event))
+    assert restored.event_type == "test_event"
+    assert restored.data == {"value": 1}
+    assert restored.context == context
+
+
+def test_spool_segments(tmp_path: Path) -> None:
+    """Test segments are read back in order and survive a restart."""
+    spool = RecorderSpool(str(tmp_path))
+    assert spool.read_segment() is None
+
+    assert spool.write_segment([Event("first")]) == 1
+    assert spool.write_segment([Event("second"), Event("third")]) == 2
+    assert spool.write_segment([Event("bad", {"value": object()})]) == 0
+    assert spool.has_segments
+
+    segment, events = spool.read_segment()
+    assert [(count, event.event_type) for count, event in events] == [(1, "first")]
+    spool.remove_segment(segment)
+
+    (tmp_path / "000000000099.tmp").write_bytes(b"incomplete")
+    spool = RecorderSpool(str(tmp_path))
+    spool.load()
+    assert not (tmp_path / "000000000099.tmp").exists()
+
+    segment, events = spool.read_segment()
+    assert [(count, event.event_type) for count, event in events] == [
+        (1, "second"),
+        (2, "third"),
+    ]
+    spool.remove_segment(segment)
+    assert not spool.has_segments
+    assert spool.read_segment() is None
+
+    assert spool.write_segment([Event("fourth")]) == 1
+    assert (tmp_path / "000000000002.jsonl").exists()
+
+
+def test_spool_committed_offset(tmp_path: Path) -> None:
+    """Test committed events of a segment are not read again after a restart."""
+    spool = RecorderSpool(str(tmp_path))
+    spool.write_segment([Event("first"), Event("second"), Event("third")])
+    segment, _ = spool.read_segment()
+    spool.mark_committed(segment, 2)
+
+    (tmp_path / "000000000099.committed").write_bytes(b"1")
+    spool = RecorderSpool(str(tmp_path))
+    spool.load()
+    assert not (tmp_path / "000000000099.committed").exists()
+
+    segment, events = spool.read_segment()
+    assert [(count, event.event_type) for count, event in events] == [(3, "third")]
+    spool.remove_segment(segment)
+    assert not list(tmp_path.iterdir())
+
+
+def _get_recorded_states(hass: HomeAssistant) -> list[tuple[str, str]]:
+    """Return the recorded entity_ids and states."""
+    with session_scope(hass=hass, read_only=True) as session:
+        return [
+            (row.entity_id, row.state)
+            for row in session.query(StatesMeta.entity_id, States.state)
+            .outerjoin(StatesMeta, States.metadata_id == StatesMeta.metadata_id)
+            .order_by(States.state_id)
+        ]
+
+
+async def test_spool_backlog(
+    hass: HomeAssistant,
+    async_setup_recorder_instance: RecorderInstanceGenerator,
+    tmp_path: Path,
+) -> None:
+    """Test events are spooled while the backlog is large and recorded after."""
+    with (
+        patch.object(recorder, "SPOOL_DIR", str(tmp_path)),
+        patch.object(recorder.core, "MAX_QUEUE_BACKLOG_MIN_VALUE", 0),
+    ):
+        instance: Recorder = await async_setup_recorder_instance(
+            hass, {recorder.CONF_SPOOL_BACKLOG: True}
+        )
+        await async_wait_recording_done(hass)
+
+        instance._async_check_queue()
+        assert instance._spool_listener is not None
+
+    hass.states.async_set("test.spool", "one")
+    hass.states.async_set("test.spool", "two")
+    await hass.async_block_till_done()
+    assert len(instance._spool_events) == 2
+    assert instance.backlog == 0
+
+    # Write the events to disk, they are recorded once the backlog is processed
+    instance._async_flush_spool()
+    await hass.async_block_till_done(wait_background_tasks=True)
+    await async_wait_recording_done(hass)
+    await async_wait_recording_done(hass)
+
+    assert instance._spool_listener is None
+    assert not list(tmp_path.iterdir())
+
+    hass.states.async_set("test.spool", "three")
+    await async_wait_recording_done(hass)
+
+    states = await instance.async_add_executor_job(_get_recorded_states, hass)
+    assert states == [
+        ("test.spool", "one"),
+        ("test.spool", "two"),
+        ("test.spool", "three"),
+    ]
+
+
+async def test_spool_drained_at_startup(
+    hass: HomeAssistant,
+    async_setup_recorder_instance: RecorderInstanceGenerator,
+    tmp_path: Path,
+) -> None:
+    """Test events spooled before a restart are recorded at startup."""
+    spool = RecorderSpool(str(tmp_path))
+    spool.write_segment([_state_changed_event("test.spool", "spooled")])
+
+    with patch.object(recorder, "SPOOL_DIR", str(tmp_path)):
+        instance = await async_setup_recorder_instance(
+            hass, {recorder.CONF_SPOOL_BACKLOG: True}
+        )
+        await async_wait_recording_done(hass)
+
+    states = await instance.async_add_executor_job(_get_recorded_states, hass)
+    assert states == [("test.spool", "spooled")]
+    assert not list(tmp_path.iterdir())
+
+
+async def test_spool_drain_commits_in_segment(
+    hass: HomeAssistant,
+    async_setup_recorder_instance: RecorderInstanceGenerator,
+    tmp_path: Path,
+) -> None:
+    """Test commits while draining a segment are recorded next to it."""
+    spool = RecorderSpool(str(tmp_path))
+    spool.write_segment(
+        [
+            _state_changed_event("test.committed", "one"),
+            _state_changed_event("test.committed", "two"),
+        ]
+    )
+    # The first event was committed before a restart
+    spool.mark_committed(0, 1)
+    mark_committed = RecorderSpool.mark_committed
+
+    with (
+        patch.object(recorder, "SPOOL_DIR", str(tmp_path)),
+        patch.object(
+            RecorderSpool, "mark_committed", autospec=True, side_effect=mark_committed
+        ) as mock_mark_committed,
+    ):
+        instance = await async_setup_recorder_instance(
+            hass, {recorder.CONF_SPOOL_BACKLOG: True, recorder.CONF_COMMIT_INTERVAL: 0}
+        )
+        await async_wait_recording_done(hass)
+
+    states = await instance.async_add_executor_job(_get_recorded_states, hass)
+    assert states == [("test.committed", "two")]
+    assert [call.args[1:] for call in mock_mark_committed.call_args_list] == [(0, 2)]
+    assert not list(tmp_path.iterdir())
+
+
+async def test_spool_keeps_memory_guard(
+    hass: HomeAssistant,
+    async_setup_recorder_instance: RecorderInstanceGenerator,
+    tmp_path: Path,
+) -> None:
+    """Test the recorder still stops when memory runs out while spooling."""
+    with (
+        patch.object(recorder, "SPOOL_DIR", str(tmp_path)),
+        patch.object(recorder.core, "MAX_QUEUE_BACKLOG_MIN_VALUE", 0),
+        patch.object(recorder.core.Recorder, "_available_memory", return_value=0),
+    ):
+        instance: Recorder = await async_setup_recorder_instance(
+            hass, {recorder.CONF_SPOOL_BACKLOG: True}
+        )
+        await async_wait_recording_done(hass)
+
+        instance._async_check_queue()
+
+    assert instance._spool_listener is not None
+    assert instance._event_listener is None
+    assert instance._queue_watcher is None
+
+
+async def test_spool_write_error(
+    hass: HomeAssistant,
+    async_setup_recorder_instance: RecorderInstanceGenerator,
+    tmp_path: Path,
+) -> None:
+    """Test events are queued in memory again when the spool cannot be written."""
+    with (
+        patch.object(recorder, "SPOOL_DIR", str(tmp_path)),
+        patch.object(recorder.core, "MAX_QUEUE_BACKLOG_MIN_VALUE", 0),
+    ):
+        instance: Recorder = await async_setup_recorder_instance(
+            hass, {recorder.CONF_SPOOL_BACKLOG: True}
+        )
+        await async_wait_recording_done(hass)
+
+        instance._async_check_queue()
+        assert instance._spool_listener is not None
+
+        hass.states.async_set("test.spool", "one")
+        await hass.async_block_till_done()
+        with patch.object(RecorderSpool, "write_segment", side_effect=OSError):
+            instance._async_flush_spool()
+            await hass.async_block_till_done(wait_background_tasks=True)
+
+        # Spooling is not started again
+        instance._async_check_queue()
+
+    hass.states.async_set("test.spool", "two")
+    await async_wait_recording_done(hass)
+    await async_wait_recording_done(hass)
+
+    assert instance._spool_listener is None
+    assert not instance._spool_events
+    states = await instance.async_add_executor_job(_get_recorded_states, hass)
+    assert states == [("test.spool", "one"), ("test.spool", "two")]
+
+
+async def test_spool_write_error_after_segments(
+    hass: HomeAssistant,
+    async_setup_recorder_instance: RecorderInstanceGenerator,
+    tmp_path: Path,
+) -> None:
+    """Test events kept in memory are recorded after the segments on disk."""
+    with (
+        patch.object(recorder, "SPOOL_DIR", str(tmp_path)),
+        patch.object(recorder.core, "MAX_QUEUE_BACKLOG_MIN_VALUE", 0),
+        patch.object(recorder.core, "SPOOL_DRAIN_MAX_BACKLOG", 0),
+    ):
+        instance: Recorder = await async_setup_recorder_instance(
+            hass, {recorder.CONF_SPOOL_BACKLOG: True}
+        )
+        await async_wait_recording_done(hass)
+
+        instance._async_check_queue()
+        hass.states.async_set("test.spool", "one")
+        await hass.async_block_till_done()
+        instance._async_flush_spool()
+        await hass.async_block_till_done(wait_background_tasks=True)
+        assert len(list(tmp_path.iterdir())) == 1
+
+        hass.states.async_set("test.spool", "two")
+        await hass.async_block_till_done()
+        with patch.object(RecorderSpool, "write_segment", side_effect=OSError):
+            instance._async_flush_spool()
+            await hass.async_block_till_done(wait_background_tasks=True)
+        hass.states.async_set("test.spool", "three")
+        await hass.async_block_till_done()
+
+        # Kept in memory until the segment on disk has been recorded
+        assert len(instance._spool_events) == 2
+        await async_wait_recording_done(hass)
+        states = await instance.async_add_executor_job(_get_recorded_states, hass)
+        assert states == []
+
+    instance._async_flush_spool()
+    await hass.async_block_till_done(wait_background_tasks=True)
+    await async_wait_recording_done(hass)
+    await async_wait_recording_done(hass)
+
+    assert instance._spool_listener is None
+    assert not instance._spool_events
+    states = await instance.async_add_executor_job(_get_recorded_states, hass)
+    assert states == [
+        ("test.spool", "one"),
+        ("test.spool", "two"),
+        ("test.spool", "three"),
+    ]
+
+
+@pytest.mark.parametrize("enable_statistics", [True])
+async def test_spool_holds_back_statistics(
+    hass: HomeAssistant,
+    async_setup_recorder_instance: RecorderInstanceGenerator,
+    tmp_path: Path,
+) -> None:
+    """Test statistics are compiled after the spooled events are recorded."""
+    recorded_at_compile: list[tuple[str, str]] = []
+
+    def _compile_statistics(instance: Recorder, start, fire_events: bool) -> bool:
+        recorded_at_compile.extend(_get_recorded_states(hass))
+        return True
+
+    with (
+        patch.object(recorder, "SPOOL_DIR", str(tmp_path)),
+        patch.object(recorder.core, "MAX_QUEUE_BACKLOG_MIN_VALUE", 0),
+        patch.object(recorder.core, "SPOOL_DRAIN_MAX_BACKLOG", 0),
+        patch(
+            "homeassistant.components.recorder.statistics.compile_statistics",
+            side_effect=_compile_statistics,
+        ) as compile_statistics,
+    ):
+        instance: Recorder = await async_setup_recorder_instance(
+            hass, {recorder.CONF_SPOOL_BACKLOG: True}
+        )
+        await async_wait_recording_done(hass)
+
+        instance._async_check_queue()
+        hass.states.async_set("test.spool", "one")
+        await hass.async_block_till_done()
+        instance._async_flush_spool()
+        await hass.async_block_till_done(wait_background_tasks=True)
+
+        instance.async_periodic_statistics()
+        await async_wait_recording_done(hass)
+        assert not compile_statistics.called
+        assert len(instance._spool_tasks) == 1
+
+    with patch(
+        "homeassistant.components.recorder.statistics.compile_statistics",
+        side_effect=_compile_statistics,
+    ) as compile_statistics:
+        instance._async_flush_spool()
+        await hass.async_block_till_done(wait_background_tasks=True)
+        await async_wait_recording_done(hass)
+        await async_wait_recording_done(hass)
+
+    assert compile_statistics.call_count == 1
+    assert not instance._spool_tasks
+    assert recorded_at_compile == [("test.spool", "one")]
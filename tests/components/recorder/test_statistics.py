@@ -1,7 +1,8 @@
 """The tests for sensor recorder platform."""
 
-from datetime import timedelta
-from typing import Any
+from datetime import datetime, timedelta
+import threading
+from typing import Any, Literal
 from unittest.mock import ANY, Mock, patch
 
 import pytest
@@ -9,20 +10,24 @@ from sqlalchemy import select
 
 from homeassistant.components import recorder
 from homeassistant.components.recorder import Recorder, history, statistics
-from homeassistant.components.recorder.db_schema import StatisticsShortTerm
+from homeassistant.components.recorder.db_schema import Statistics, StatisticsShortTerm
 from homeassistant.components.recorder.models import (
+    StatisticMetaData,
+    StatisticResult,
     datetime_to_timestamp_or_none,
     process_timestamp,
 )
 from homeassistant.components.recorder.statistics import (
     STATISTIC_UNIT_TO_UNIT_CONVERTER,
     PlatformCompiledStatistics,
+    ReducedStatisticsCache,
     _generate_max_mean_min_statistic_in_sub_period_stmt,
     _generate_statistics_at_time_stmt,
     _generate_statistics_during_period_stmt,
     async_add_external_statistics,
     async_import_statistics,
     async_list_statistic_ids,
+    get_hourly_statistics_rollup,
     get_last_short_term_statistics,
     get_last_statistics,
     get_latest_short_term_statistics_with_session,
@@ -1293,6 +1298,116 @@ async def test_daily_statistics_sum(
     assert stats == {}
 
 
+def test_reduced_statistics_cache_set_during_clear() -> None:
+    """Test reduced statistics fetched before a clear are not cached."""
+    cache = ReducedStatisticsCache()
+    generation = cache.generation
+    reduced = Mock()
+
+    cache.set("key", generation, reduced)
+    assert cache.get("key") is reduced
+
+    # A set waits while the cache is being cleared, then sees the new generation
+    with cache._lock:
+        thread = threading.Thread(target=cache.set, args=("key", generation, reduced))
+        thread.start()
+        cache.generation += 1
+        cache._reduced.clear()
+    thread.join()
+    assert cache.get("key") is None
+
+    cache.set("key", cache.generation, reduced)
+    cache.clear()
+    assert cache.get("key") is None
+
+
+@pytest.mark.parametrize("enable_missing_statistics", [True])
+@pytest.mark.parametrize("timezone", ["America/Regina", "Europe/Vienna", "UTC"])
+@pytest.mark.freeze_time("2022-10-01 00:00:00+00:00")
+async def test_reduced_statistics_cache(
+    hass: HomeAssistant,
+    setup_recorder: None,
+    timezone: str,
+) -> None:
+    """Test statistics reduced to days are cached once the days are compiled."""
+    await hass.config.async_set_time_zone(timezone)
+    await async_wait_recording_done(hass)
+    today = dt_util.start_of_local_day()
+    day1 = today - timedelta(days=3)
+    day2 = today - timedelta(days=2)
+    external_metadata: StatisticMetaData = {
+        "has_mean": False,
+        "has_sum": True,
+        "name": "Total imported energy",
+        "source": "test",
+        "statistic_id": "test:total_energy_import",
+        "unit_of_measurement": "kWh",
+    }
+    async_add_external_statistics(
+        hass,
+        external_metadata,
+        [
+            {"start": day1, "state": 0, "sum": 2},
+            {"start": day1 + timedelta(hours=1), "state": 1, "sum": 3},
+            {"start": day2, "state": 2, "sum": 4},
+            {"start": today, "state": 3, "sum": 5},
+        ],
+    )
+    await async_wait_recording_done(hass)
+
+    def _statistics_during_period(
+        types: set[Literal["change", "sum"]],
+    ) -> tuple[dict[str, list[dict[str, Any]]], datetime]:
+        with patch.object(
+            statistics,
+            "_generate_statistics_during_period_stmt",
+            wraps=statistics._generate_statistics_during_period_stmt,
+        ) as generate_stmt_mock:
+            stats = statistics_during_period(
+                hass,
+                day1,
+                statistic_ids={"test:total_energy_import"},
+                period="day",
+                types=types,
+            )
+        return stats, generate_stmt_mock.call_args.args[0]
+
+    expected = {
+        "test:total_energy_import": [
+            {"start": day.timestamp(), "end": (day + timedelta(days=1)).timestamp(), "sum": _sum}
+            for day, _sum in ((day1, 3.0), (day2, 4.0), (today, 5.0))
+        ]
+    }  # fmt: skip
+
+    stats, fetched_from = _statistics_during_period({"sum"})
+    assert stats == expected
+    assert fetched_from == day1
+
+    # Only the statistics of today are fetched, the rest is cached
+    stats, fetched_from = _statistics_during_period({"change"})
+    assert stats == {
+        "test:total_energy_import": [
+            {"start": row["start"], "end": row["end"], "change": change}
+            for row, change in zip(
+                expected["test:total_energy_import"], (3.0, 1.0, 1.0), strict=True
+            )
+        ]
+    }
+    assert fetched_from == today
+    stats, fetched_from = _statistics_during_period({"sum"})
+    assert stats == expected
+    assert fetched_from == today
+
+    # Importing statistics clears the cache
+    async_add_external_statistics(
+        hass, external_metadata, [{"start": day2, "state": 2, "sum": 10}]
+    )
+    await async_wait_recording_done(hass)
+    stats, fetched_from = _statistics_during_period({"sum"})
+    assert stats["test:total_energy_import"][1]["sum"] == 10.0
+    assert fetched_from == day1
+
+
 @pytest.mark.parametrize("timezone", ["America/Regina", "Europe/Vienna", "UTC"])
 @pytest.mark.freeze_time("2022-10-01 00:00:00+00:00")
 async def test_weekly_statistics_mean(
@@ -2561,6 +2676,137 @@ async def test_recorder_platform_with_statistics(
     recorder_platform.validate_statistics.assert_called_once_with(hass)
 
 
+async def test_compile_hourly_statistics_from_rollup(
+    hass: HomeAssistant,
+    setup_recorder: None,
+) -> None:
+    """Test hourly statistics are rolled up from the compiled 5-minute statistics."""
+    instance = recorder.get_instance(hass)
+    meta_mean: StatisticMetaData = {
+        "has_mean": True,
+        "has_sum": False,
+        "name": None,
+        "source": "some_domain",
+        "statistic_id": "some_domain:mean",
+        "unit_of_measurement": "W",
+    }
+    meta_sum: StatisticMetaData = {
+        **meta_mean,
+        "has_mean": False,
+        "has_sum": True,
+        "statistic_id": "some_domain:sum",
+    }
+
+    def _mock_compile_statistics(
+        hass: HomeAssistant, session: Any, start: datetime, end: datetime
+    ) -> PlatformCompiledStatistics:
+        value = start.minute / 5 + 1
+        platform_stats: list[StatisticResult] = [
+            {
+                "meta": meta_mean,
+                "stat": {"start": start, "mean": value, "min": -value, "max": value * 2},
+            },
+            {
+                "meta": meta_sum,
+                "stat": {"start": start, "last_reset": start, "state": value, "sum": value * 3},
+            },
+        ]  # fmt: skip
+        if start.minute == 25:
+            # A statistic which is only compiled for some periods
+            platform_stats.append(
+                {
+                    "meta": {**meta_mean, "statistic_id": "some_domain:sometimes"},
+                    "stat": {"start": start, "mean": 1.0, "min": 0.0, "max": 2.0},
+                }
+            )
+        return PlatformCompiledStatistics(
+            platform_stats,
+            get_metadata_with_session(
+                instance,
+                session,
+                statistic_ids={stat["meta"]["statistic_id"] for stat in platform_stats},
+            ),
+        )
+
+    await _setup_mock_domain(
+        hass, Mock(compile_statistics=Mock(wraps=_mock_compile_statistics))
+    )
+    await async_recorder_block_till_done(hass)
+
+    def _get_hourly_statistics(start: datetime) -> list[tuple]:
+        with session_scope(hass=hass, read_only=True) as session:
+            return [
+                tuple(row)
+                for row in session.execute(
+                    select(
+                        Statistics.metadata_id,
+                        Statistics.mean,
+                        Statistics.min,
+                        Statistics.max,
+                        Statistics.last_reset_ts,
+                        Statistics.state,
+                        Statistics.sum,
+                    )
+                    .filter(Statistics.start_ts == start.timestamp())
+                    .order_by(Statistics.metadata_id)
+                )
+            ]
+
+    def _get_summary_from_database(start: datetime) -> list[tuple]:
+        with session_scope(hass=hass, read_only=True) as session:
+            summary = statistics._compile_hourly_statistics_summary(
+                session, start.timestamp(), (start + timedelta(hours=1)).timestamp()
+            )
+        return [
+            (
+                metadata_id,
+                *(
+                    stat.get(key)
+                    for key in ("mean", "min", "max", "last_reset_ts", "state", "sum")
+                ),
+            )
+            for metadata_id, stat in sorted(summary.items())
+        ]
+
+    zero = get_start_time(dt_util.utcnow()).replace(minute=0) + timedelta(hours=1)
+    with patch.object(
+        statistics,
+        "_compile_hourly_statistics_summary",
+        wraps=statistics._compile_hourly_statistics_summary,
+    ) as summary_mock:
+        for minutes in range(0, 60, 5):
+            do_adhoc_statistics(hass, start=zero + timedelta(minutes=minutes))
+        await async_wait_recording_done(hass)
+    assert not summary_mock.called
+
+    hourly = await instance.async_add_executor_job(_get_hourly_statistics, zero)
+    assert len(hourly) == 3
+    assert hourly == await instance.async_add_executor_job(
+        _get_summary_from_database, zero
+    )
+    assert hourly[0][1:4] == (pytest.approx(6.5), -12.0, 24.0)
+    assert hourly[1][4:] == (zero.replace(minute=55).timestamp(), 12.0, 36.0)
+
+    # Short term statistics changed other than by compiling them are
+    # summarized from the database
+    next_hour = zero + timedelta(hours=1)
+    with patch.object(
+        statistics,
+        "_compile_hourly_statistics_summary",
+        wraps=statistics._compile_hourly_statistics_summary,
+    ) as summary_mock:
+        for minutes in range(0, 60, 5):
+            if minutes == 30:
+                await async_wait_recording_done(hass)
+                get_hourly_statistics_rollup(hass).clear()
+            do_adhoc_statistics(hass, start=next_hour + timedelta(minutes=minutes))
+        await async_wait_recording_done(hass)
+    assert summary_mock.called
+    assert await instance.async_add_executor_job(
+        _get_hourly_statistics, next_hour
+    ) == await instance.async_add_executor_job(_get_summary_from_database, next_hour)
+
+
 async def test_recorder_platform_without_statistics(
     hass: HomeAssistant,
     setup_recorder: None,
@@ -0,0 +1,391 @@
+"""Test the archive of old hourly statistics."""
+
+from datetime import datetime, timedelta
+from unittest.mock import patch
+
+from freezegun.api import FrozenDateTimeFactory
+import pytest
+from sqlalchemy import func, select
+
+from homeassistant.components import recorder
+from homeassistant.components.recorder import Recorder
+from homeassistant.components.recorder.db_schema import Statistics, StatisticsArchive
+from homeassistant.components.recorder.statistics import (
+    async_add_external_statistics,
+    async_change_statistics_unit,
+    async_import_statistics,
+    get_last_statistics,
+    get_reduced_statistics_cache,
+    statistic_during_period,
+)
+from homeassistant.components.recorder.statistics_archive import (
+    ArchivedStatistic,
+    decode_block,
+    encode_block,
+)
+from homeassistant.components.recorder.tasks import ArchiveStatisticsTask
+from homeassistant.components.recorder.util import session_scope
+from homeassistant.core import HomeAssistant
+import homeassistant.util.dt as dt_util
+
+from .common import (
+    async_recorder_block_till_done,
+    async_wait_recording_done,
+    statistics_during_period,
+)
+
+from tests.typing import RecorderInstanceGenerator
+
+START = datetime(2024, 1, 30, tzinfo=dt_util.UTC)
+ARCHIVE_BEFORE = datetime(2024, 3, 1, tzinfo=dt_util.UTC)
+STATISTIC_ID = "test:total_energy_import"
+
+
+@pytest.fixture
+async def mock_recorder_before_hass(
+    async_test_recorder: RecorderInstanceGenerator,
+) -> None:
+    """Set up recorder."""
+
+
+def test_encode_decode_block() -> None:
+    """Test statistics survive encoding and are compressed."""
+    rows = [
+        ArchivedStatistic(
+            1704067200.0 + hour * 3600,
+            hour * 0.1 - 3.7,
+            None if hour % 5 else -1e-300,
+            1e300,
+            None,
+            float(hour // 24),
+            hour * 1.25,
+        )
+        for hour in range(744)
+    ]
+    # A gap in the statistics
+    del rows[100:110]
+
+    data = encode_block(rows)
+
+    assert decode_block(data) == rows
+    assert len(data) < len(rows) * len(ArchivedStatistic._fields) * 8 / 4
+    assert decode_block(encode_block(rows[:1])) == rows[:1]
+
+
+def _add_statistics(hass: HomeAssistant, start: datetime, hours: int) -> None:
+    """Add hourly sum statistics of an external statistic."""
+    async_add_external_statistics(
+        hass,
+        {
+            "has_mean": True,
+            "has_sum": True,
+            "name": "Total imported energy",
+            "source": "test",
+            "statistic_id": STATISTIC_ID,
+            "unit_of_measurement": "kWh",
+        },
+        [
+            {
+                "start": start + timedelta(hours=hour),
+                "mean": hour % 7,
+                "min": hour % 7 - 1,
+                "max": hour % 7 + 1,
+                "state": hour % 3,
+                "sum": hour * 0.5,
+            }
+            for hour in range(hours)
+        ],
+    )
+
+
+async def _archive(hass: HomeAssistant, archive_before: datetime) -> None:
+    """Archive statistics and wait for it to finish."""
+    recorder.get_instance(hass).queue_task(ArchiveStatisticsTask(archive_before))
+    await async_recorder_block_till_done(hass)
+    await async_wait_recording_done(hass)
+    get_reduced_statistics_cache(hass).clear()
+
+
+def _count_rows(hass: HomeAssistant) -> tuple[int, int]:
+    """Return the number of hourly statistics and archived blocks."""
+    with session_scope(hass=hass, read_only=True) as session:
+        return (
+            session.execute(select(func.count(Statistics.id))).scalar_one(),
+            session.execute(select(func.count(StatisticsArchive.id))).scalar_one(),
+        )
+
+
+def _query(hass: HomeAssistant) -> list:
+    """Return the statistics of the statistic in several ways."""
+    return [
+        *(
+            statistics_during_period(
+                hass,
+                START - timedelta(days=1),
+                START + timedelta(days=60),
+                {STATISTIC_ID},
+                period,
+                None,
+                {"change", "max", "mean", "min", "state", "sum"},
+            )
+            for period in ("hour", "day", "month")
+        ),
+        # The change of the first statistic depends on the sum before it
+        statistics_during_period(
+            hass,
+            ARCHIVE_BEFORE,
+            None,
+            {STATISTIC_ID},
+            "day",
+            None,
+            {"change"},
+        ),
+        statistic_during_period(
+            hass, START, ARCHIVE_BEFORE + timedelta(days=5), STATISTIC_ID, None, None
+        ),
+        statistic_during_period(
+            hass,
+            START + timedelta(days=10),
+            START + timedelta(days=20),
+            STATISTIC_ID,
+            None,
+            None,
+        ),
+        statistic_during_period(hass, None, None, STATISTIC_ID, None, None),
+        *(
+            get_last_statistics(
+                hass,
+                number_of_stats,
+                STATISTIC_ID,
+                True,
+                {"last_reset", "max", "mean", "min", "state", "sum"},
+            )
+            for number_of_stats in (1, 24 * 10, 24 * 41)
+        ),
+    ]
+
+
+@pytest.mark.usefixtures("recorder_mock")
+async def test_archive_statistics(
+    hass: HomeAssistant, freezer: FrozenDateTimeFactory
+) -> None:
+    """Test archived statistics are read like statistics in the table."""
+    freezer.move_to(START + timedelta(days=60))
+    _add_statistics(hass, START, 24 * 40)
+    await async_wait_recording_done(hass)
+    expected = await hass.async_add_executor_job(_query, hass)
+    assert expected[0][STATISTIC_ID]
+
+    await _archive(hass, ARCHIVE_BEFORE)
+
+    # January and February are archived, March is left in the table
+    assert _count_rows(hass) == (24 * 9, 2)
+    assert await hass.async_add_executor_job(_query, hass) == expected
+
+    # Archiving again does not change anything
+    await _archive(hass, ARCHIVE_BEFORE)
+    assert _count_rows(hass) == (24 * 9, 2)
+    assert await hass.async_add_executor_job(_query, hass) == expected
+
+
+@pytest.mark.usefixtures("recorder_mock")
+async def test_import_into_archived_month(
+    hass: HomeAssistant, freezer: FrozenDateTimeFactory
+) -> None:
+    """Test statistics imported into an archived month replace archived ones."""
+    freezer.move_to(START + timedelta(days=60))
+    _add_statistics(hass, START, 24 * 40)
+    await async_wait_recording_done(hass)
+    await _archive(hass, ARCHIVE_BEFORE)
+
+    async_add_external_statistics(
+        hass,
+        {
+            "has_mean": True,
+            "has_sum": True,
+            "name": "Total imported energy",
+            "source": "test",
+            "statistic_id": STATISTIC_ID,
+            "unit_of_measurement": "kWh",
+        },
+        [{"start": START + timedelta(days=5), "mean": 100, "sum": 1000}],
+    )
+    await async_wait_recording_done(hass)
+    assert _count_rows(hass) == (24 * 9 + 1, 2)
+
+    def _hour(hass: HomeAssistant) -> list:
+        return statistics_during_period(
+            hass,
+            START + timedelta(days=5) - timedelta(hours=1),
+            START + timedelta(days=5) + timedelta(hours=2),
+            {STATISTIC_ID},
+            "hour",
+            None,
+            {"mean", "sum"},
+        )[STATISTIC_ID]
+
+    expected = [
+        {"mean": 119 % 7, "sum": 119 * 0.5},
+        {"mean": 100, "sum": 1000},
+        {"mean": 121 % 7, "sum": 121 * 0.5},
+    ]
+    rows = await hass.async_add_executor_job(_hour, hass)
+    assert [{"mean": row["mean"], "sum": row["sum"]} for row in rows] == expected
+
+    # The imported statistic is among the last statistics
+    last_stats = await hass.async_add_executor_job(
+        get_last_statistics, hass, 24 * 40, STATISTIC_ID, True, {"mean", "sum"}
+    )
+    assert len(last_stats[STATISTIC_ID]) == 24 * 40
+    assert {"mean": 100, "sum": 1000} in [
+        {"mean": row["mean"], "sum": row["sum"]} for row in last_stats[STATISTIC_ID]
+    ]
+
+    await _archive(hass, ARCHIVE_BEFORE)
+    assert _count_rows(hass) == (24 * 9, 2)
+    rows = await hass.async_add_executor_job(_hour, hass)
+    assert [{"mean": row["mean"], "sum": row["sum"]} for row in rows] == expected
+
+
+@pytest.mark.usefixtures("recorder_mock")
+async def test_statistics_imported_next_to_archived_statistics(
+    hass: HomeAssistant, freezer: FrozenDateTimeFactory
+) -> None:
+    """Test statistics imported after archiving are merged with archived ones."""
+    freezer.move_to(START + timedelta(days=60))
+    _add_statistics(hass, START, 24 * 40)
+    await async_wait_recording_done(hass)
+    await _archive(hass, ARCHIVE_BEFORE)
+
+    async_add_external_statistics(
+        hass,
+        {
+            "has_mean": True,
+            "has_sum": True,
+            "name": "Total imported energy",
+            "source": "test",
+            "statistic_id": STATISTIC_ID,
+            "unit_of_measurement": "kWh",
+        },
+        [
+            # Older than the archived statistics
+            {
+                "start": START - timedelta(days=40),
+                "mean": 2,
+                "min": 1,
+                "max": 3,
+                "sum": -5,
+            },
+            # Replaces an archived statistic
+            {
+                "start": START + timedelta(days=5),
+                "mean": 100,
+                "min": -50,
+                "max": 200,
+                "sum": 1000,
+            },
+        ],
+    )
+    await async_wait_recording_done(hass)
+    assert _count_rows(hass) == (24 * 9 + 2, 2)
+    merged = await hass.async_add_executor_job(_query, hass)
+
+    # Archiving the imported statistics does not change anything
+    await _archive(hass, ARCHIVE_BEFORE)
+    assert _count_rows(hass) == (24 * 9, 3)
+    assert await hass.async_add_executor_job(_query, hass) == merged
+
+    # The imported statistics are counted once and the older one is included
+    whole_period = merged[-4]
+    assert whole_period["max"] == 200
+    assert whole_period["min"] == -50
+    assert whole_period["mean"] == pytest.approx(
+        (2 + 100 + sum(hour % 7 for hour in range(24 * 40)) - 120 % 7) / (24 * 40 + 1)
+    )
+    since_older = await hass.async_add_executor_job(
+        statistic_during_period,
+        hass,
+        START - timedelta(days=40, hours=-1),
+        None,
+        STATISTIC_ID,
+        {"change"},
+        None,
+    )
+    assert since_older["change"] == (24 * 40 - 1) * 0.5 + 5
+
+
+@pytest.mark.usefixtures("recorder_mock")
+async def test_archived_statistics_are_adjusted_converted_and_cleared(
+    hass: HomeAssistant, freezer: FrozenDateTimeFactory
+) -> None:
+    """Test archived statistics are changed with the statistics in the table."""
+    freezer.move_to(START + timedelta(days=60))
+    metadata = {
+        "has_mean": False,
+        "has_sum": True,
+        "name": None,
+        "source": "recorder",
+        "statistic_id": "sensor.total_energy_import",
+        "unit_of_measurement": "kWh",
+    }
+    async_import_statistics(
+        hass,
+        metadata,
+        [
+            {"start": START + timedelta(hours=hour), "sum": float(hour)}
+            for hour in range(24 * 40)
+        ],
+    )
+    await async_wait_recording_done(hass)
+    await _archive(hass, ARCHIVE_BEFORE)
+
+    recorder.get_instance(hass).async_adjust_statistics(
+        "sensor.total_energy_import", START + timedelta(hours=2), 10, "kWh"
+    )
+    async_change_statistics_unit(
+        hass,
+        "sensor.total_energy_import",
+        new_unit_of_measurement="Wh",
+        old_unit_of_measurement="kWh",
+    )
+    await async_wait_recording_done(hass)
+    get_reduced_statistics_cache(hass).clear()
+
+    stats = await hass.async_add_executor_job(
+        statistics_during_period,
+        hass,
+        START,
+        START + timedelta(hours=4),
+        {"sensor.total_energy_import"},
+        "hour",
+        None,
+        {"sum"},
+    )
+    assert [row["sum"] for row in stats["sensor.total_energy_import"]] == [
+        0,
+        1000,
+        12000,
+        13000,
+    ]
+
+    recorder.get_instance(hass).async_clear_statistics(["sensor.total_energy_import"])
+    await async_wait_recording_done(hass)
+    assert _count_rows(hass) == (0, 0)
+
+
+@pytest.mark.parametrize("enable_nightly_purge", [True])
+@pytest.mark.parametrize(
+    "recorder_config", [{recorder.CONF_ARCHIVE_STATISTICS_DAYS: 30}]
+)
+async def test_nightly_archive_task(
+    hass: HomeAssistant, recorder_mock: Recorder, freezer: FrozenDateTimeFactory
+) -> None:
+    """Test old statistics are archived at night when configured."""
+    freezer.move_to(datetime(2024, 4, 20, 12, tzinfo=dt_util.UTC))
+
+    with patch.object(recorder_mock, "queue_task") as queue_task:
+        recorder_mock.async_nightly_tasks(dt_util.utcnow())
+
+    assert ArchiveStatisticsTask(ARCHIVE_BEFORE) in [
+        call.args[0] for call in queue_task.mock_calls
+    ]
@@ -128,3 +128,29 @@ async def test_recorder_system_health_crashed_recorder_runs_table(
         "database_engine": SupportedDialect.SQLITE.value,
         "database_version": ANY,
     }
+
+
+@pytest.mark.skip_on_db_engine(["mysql", "postgresql"])
+@pytest.mark.usefixtures("skip_by_db_engine")
+async def test_recorder_system_health_commit_interval(
+    async_setup_recorder_instance: RecorderInstanceGenerator,
+    hass: HomeAssistant,
+    recorder_db_url: str,
+) -> None:
+    """Test recorder system health shows the commit interval decisions."""
+    assert await async_setup_component(hass, "system_health", {})
+    await async_setup_recorder_instance(hass, {"commit_interval": 5})
+    await async_wait_recording_done(hass)
+    info = await get_system_health_info(hass, "recorder")
+    assert info == {
+        "current_recorder_run": ANY,
+        "oldest_recorder_run": ANY,
+        "estimated_db_size": ANY,
+        "database_engine": SupportedDialect.SQLITE.value,
+        "database_version": ANY,
+        "commit_interval": ANY,
+        "commit_interval_reason": ANY,
+        "max_commit_interval": 30,
+        "last_commit_events": ANY,
+        "last_commit_duration": ANY,
+    }
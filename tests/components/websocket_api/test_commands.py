@@ -11,16 +11,27 @@ import voluptuous as vol
 
 from homeassistant import loader
 from homeassistant.components.device_automation import toggle_entity
-from homeassistant.components.websocket_api import const
+from homeassistant.components.websocket_api import const, messages
 from homeassistant.components.websocket_api.auth import (
     TYPE_AUTH,
     TYPE_AUTH_OK,
     TYPE_AUTH_REQUIRED,
 )
+from homeassistant.components.websocket_api.commands import (
+    _MIN_PENDING_PRUNE_SIZE,
+    _EntitySubscription,
+)
 from homeassistant.components.websocket_api.const import FEATURE_COALESCE_MESSAGES, URL
 from homeassistant.config_entries import ConfigEntryState
-from homeassistant.const import SIGNAL_BOOTSTRAP_INTEGRATIONS
-from homeassistant.core import Context, HomeAssistant, State, SupportsResponse, callback
+from homeassistant.const import EVENT_STATE_CHANGED, SIGNAL_BOOTSTRAP_INTEGRATIONS
+from homeassistant.core import (
+    Context,
+    Event,
+    HomeAssistant,
+    State,
+    SupportsResponse,
+    callback,
+)
 from homeassistant.exceptions import HomeAssistantError, ServiceValidationError
 from homeassistant.helpers import device_registry as dr
 from homeassistant.helpers.dispatcher import async_dispatcher_send
@@ -1262,6 +1273,132 @@ async def test_subscribe_unsubscribe_entities_specific_entities(
     }
 
 
+async def test_subscribe_entities_serializes_state_diff_once(
+    hass: HomeAssistant, websocket_client: MockHAClientWebSocket
+) -> None:
+    """Test the state diff of an event is serialized once for all subscriptions."""
+    listeners_before = hass.bus.async_listeners().get(EVENT_STATE_CHANGED, 0)
+    for msg_id, entity_ids in ((7, ["light.kitchen"]), (8, ["light.hall"]), (9, [])):
+        await websocket_client.send_json(
+            {"id": msg_id, "type": "subscribe_entities", "entity_ids": entity_ids}
+        )
+        msg = await websocket_client.receive_json()
+        assert msg["success"]
+        msg = await websocket_client.receive_json()
+        assert msg["event"] == {"a": {}}
+    assert (
+        hass.bus.async_listeners().get(EVENT_STATE_CHANGED, 0) == listeners_before + 1
+    )
+
+    with patch(
+        "homeassistant.components.websocket_api.messages.partial_state_diff_message",
+        wraps=messages.partial_state_diff_message,
+    ) as partial_state_diff_message:
+        hass.states.async_set("light.kitchen", "on")
+        received = {
+            msg["id"]: msg["event"]
+            for msg in (
+                await websocket_client.receive_json(),
+                await websocket_client.receive_json(),
+            )
+        }
+
+    assert partial_state_diff_message.call_count == 1
+    assert received == {
+        7: {"a": {"light.kitchen": {"a": {}, "c": ANY, "lc": ANY, "s": "on"}}},
+        9: {"a": {"light.kitchen": {"a": {}, "c": ANY, "lc": ANY, "s": "on"}}},
+    }
+
+    for msg_id in (7, 8, 9):
+        await websocket_client.send_json(
+            {"id": msg_id + 10, "type": "unsubscribe_events", "subscription": msg_id}
+        )
+        msg = await websocket_client.receive_json()
+        assert msg["success"]
+    assert hass.bus.async_listeners().get(EVENT_STATE_CHANGED, 0) == listeners_before
+
+
+async def test_subscribe_entities_conflate(
+    hass: HomeAssistant, websocket_client: MockHAClientWebSocket
+) -> None:
+    """Test queued state diffs of an entity are merged when conflating."""
+    hass.states.async_set("light.kitchen", "off", {"brightness": 10})
+    await websocket_client.send_json(
+        {"id": 7, "type": "subscribe_entities", "conflate": True}
+    )
+    msg = await websocket_client.receive_json()
+    assert msg["success"]
+    msg = await websocket_client.receive_json()
+    assert msg["event"]["a"]["light.kitchen"]["s"] == "off"
+
+    # The writer can not send messages until the event loop is yielded to
+    hass.states.async_set("light.kitchen", "on", {"brightness": 50})
+    hass.states.async_set("light.kitchen", "on", {"brightness": 100})
+    hass.states.async_set("light.hall", "on")
+    hass.states.async_set("light.kitchen", "on", {"brightness": 100, "color": "red"})
+
+    msg = await websocket_client.receive_json()
+    assert msg["event"] == {
+        "c": {
+            "light.kitchen": {
+                "+": {
+                    "s": "on",
+                    "a": {"brightness": 100, "color": "red"},
+                    "c": ANY,
+                    "lc": ANY,
+                }
+            }
+        }
+    }
+    msg = await websocket_client.receive_json()
+    assert msg["event"] == {
+        "a": {"light.hall": {"s": "on", "a": {}, "c": ANY, "lc": ANY}}
+    }
+
+    # A diff is not merged into one which was sent already
+    hass.states.async_set("light.kitchen", "off", {"brightness": 100, "color": "red"})
+    msg = await websocket_client.receive_json()
+    assert msg["event"] == {
+        "c": {"light.kitchen": {"+": {"s": "off", "c": ANY, "lc": ANY}}}
+    }
+
+
+async def test_subscribe_entities_conflate_drops_sent_messages(
+    hass: HomeAssistant,
+) -> None:
+    """Test a conflating subscription forgets the entities of sent messages."""
+    sent: list[bytearray] = []
+    subscription = _EntitySubscription(sent.append, None, None, Mock(), b"7", {})
+
+    def _change(entity_id: str, state: str) -> None:
+        event = Event(
+            EVENT_STATE_CHANGED,
+            {
+                "entity_id": entity_id,
+                "old_state": hass.states.get(entity_id),
+                "new_state": State(entity_id, state),
+            },
+        )
+        hass.states.async_set(entity_id, state)
+        subscription.send_conflated(event, messages.partial_state_diff_message(event))
+
+    for number in range(_MIN_PENDING_PRUNE_SIZE):
+        _change(f"light.number_{number}", "on")
+    # The writer empties the messages it sent
+    for message in sent[1:]:
+        message.clear()
+    _change("light.number_0", "off")
+    _change("light.other", "on")
+
+    # The queued messages are kept
+    assert subscription.pending == {
+        "light.number_0": (sent[0], None),
+        "light.other": (sent[-1], None),
+    }
+    assert subscription.pending_prune_size == _MIN_PENDING_PRUNE_SIZE
+    assert json_loads(sent[0])["event"]["a"]["light.number_0"]["s"] == "off"
+
+
 async def test_subscribe_unsubscribe_entities_with_filter(
     hass: HomeAssistant,
     websocket_client: MockHAClientWebSocket,
@@ -14,12 +14,23 @@ from homeassistant.components.websocket_api import (
     http,
     websocket_command,
 )
+from homeassistant.components.websocket_api.auth import (
+    TYPE_AUTH,
+    TYPE_AUTH_OK,
+    TYPE_AUTH_REQUIRED,
+)
 from homeassistant.components.websocket_api.connection import ActiveConnection
+from homeassistant.components.websocket_api.http import URL
 from homeassistant.core import HomeAssistant, callback
+from homeassistant.setup import async_setup_component
 from homeassistant.util.dt import utcnow
 
 from tests.common import async_fire_time_changed
-from tests.typing import MockHAClientWebSocket, WebSocketGenerator
+from tests.typing import (
+    ClientSessionGenerator,
+    MockHAClientWebSocket,
+    WebSocketGenerator,
+)
 
 
 @pytest.fixture
@@ -523,3 +534,66 @@ async def test_binary_message(
     assert "Received binary message for non-existing handler 0" in caplog.text
     assert "Received binary message for non-existing handler 3" in caplog.text
     assert "Received binary message for non-existing handler 10" in caplog.text
+
+
+@pytest.mark.parametrize("coalesce", [False, True])
+async def test_bytearray_message_changed_until_sent(
+    hass: HomeAssistant, hass_ws_client: WebSocketGenerator, coalesce: bool
+) -> None:
+    """Test a queued bytearray message is sent as changed and emptied once sent."""
+    sent: list[bytearray] = []
+
+    @callback
+    @websocket_command({"type": "send_bytearray_messages"})
+    def send_bytearray_messages(
+        hass: HomeAssistant, connection: ActiveConnection, msg: dict[str, Any]
+    ) -> None:
+        first = bytearray(b'{"id":1}')
+        second = bytearray(b'{"id":2}')
+        connection.send_message(first)
+        connection.send_message(second)
+        first[:] = b'{"id":1,"changed":true}'
+        sent.extend((first, second))
+
+    async_register_command(hass, send_bytearray_messages)
+    websocket_client = await hass_ws_client(hass)
+    if coalesce:
+        await websocket_client.send_json(
+            {
+                "id": 5,
+                "type": "supported_features",
+                "features": {const.FEATURE_COALESCE_MESSAGES: 1},
+            }
+        )
+        assert (await websocket_client.receive_json())["success"]
+
+    await websocket_client.send_json({"id": 6, "type": "send_bytearray_messages"})
+    assert await websocket_client.receive_json() == {"id": 1, "changed": True}
+    assert await websocket_client.receive_json() == {"id": 2}
+    assert sent == [bytearray(), bytearray()]
+
+
+async def test_permessage_deflate(
+    hass: HomeAssistant,
+    hass_client_no_auth: ClientSessionGenerator,
+    hass_access_token: str,
+) -> None:
+    """Test messages are compressed when the client offers permessage-deflate."""
+    for entity in range(100):
+        hass.states.async_set(f"light.test_{entity}", "on", {"brightness": entity})
+    assert await async_setup_component(hass, "websocket_api", {})
+    await hass.async_block_till_done()
+    client = await hass_client_no_auth()
+
+    async with client.ws_connect(URL, compress=15) as ws:
+        assert ws.compress == 15
+        assert not ws.client_notakeover
+        assert (await ws.receive_json())["type"] == TYPE_AUTH_REQUIRED
+        await ws.send_json({"type": TYPE_AUTH, "access_token": hass_access_token})
+        assert (await ws.receive_json())["type"] == TYPE_AUTH_OK
+
+        await ws.send_json({"id": 1, "type": "subscribe_entities"})
+        assert (await ws.receive_json())["success"]
+        msg = await ws.receive_json()
+        assert len(msg["event"]["a"]) == 100
+        assert msg["event"]["a"]["light.test_99"]["a"] == {"brightness": 99}
@@ -7,9 +7,12 @@ from homeassistant.components.websocket_api.messages import (
     _state_diff_event,
     cached_event_message,
     message_to_json_bytes,
+    message_with_id,
+    partial_state_diff_message,
 )
 from homeassistant.const import EVENT_STATE_CHANGED
 from homeassistant.core import Context, Event, HomeAssistant, State, callback
+from homeassistant.util.json import json_loads
 
 from tests.common import async_capture_events
 
@@ -83,6 +86,20 @@ async def test_cached_event_message_with_different_idens(hass: HomeAssistant) ->
     assert cache_info.currsize == 1
 
 
+async def test_state_diff_message_with_id(hass: HomeAssistant) -> None:
+    """Test the id is appended to a state diff message serialized without it."""
+    events = async_capture_events(hass, EVENT_STATE_CHANGED)
+    hass.states.async_set("light.window", "on")
+    await hass.async_block_till_done()
+
+    partial_message = partial_state_diff_message(events[0])
+
+    assert json_loads(message_with_id(partial_message, b"5")) == {
+        **json_loads(partial_message),
+        "id": 5,
+    }
+
+
 async def test_state_diff_event(hass: HomeAssistant) -> None:
     """Test building state_diff_message."""
     state_change_events = async_capture_events(hass, EVENT_STATE_CHANGED)
@@ -30,6 +30,7 @@ from homeassistant.helpers.event import (
     TrackTemplate,
     TrackTemplateResult,
     async_call_later,
+    async_get_template_render_stats,
     async_track_device_registry_updated_event,
     async_track_entity_registry_updated_event,
     async_track_point_in_time,
@@ -1959,6 +1960,146 @@ async def test_track_template_result_with_wildcard(hass: HomeAssistant) -> None:
     assert "cover.office_skylight=open" in specific_runs[0]
 
 
+async def test_track_template_result_shares_renders(hass: HomeAssistant) -> None:
+    """Test identical templates are rendered once per state change."""
+    hass.states.async_set("sensor.power", 10)
+    template_str = "{{ states('sensor.power') | float(0) * factor }}"
+    templates = [Template(template_str, hass) for _ in range(3)]
+    random_template = Template("{{ [states('sensor.power')] | random }}", hass)
+    results: list[list[float]] = [[], [], [], []]
+
+    for idx, (template, variables) in enumerate(
+        (
+            # Variables not referenced by the template do not prevent sharing
+            (templates[0], {"factor": 2, "this": "sensor.a"}),
+            (templates[1], {"factor": 2, "this": "sensor.b"}),
+            (templates[2], {"factor": 3, "this": "sensor.c"}),
+            (random_template, None),
+        )
+    ):
+
+        @callback
+        def _listener(
+            event: Event[EventStateChangedData] | None,
+            updates: list[TrackTemplateResult],
+            idx: int = idx,
+        ) -> None:
+            results[idx].append(updates.pop().result)
+
+        async_track_template_result(
+            hass, [TrackTemplate(template, variables)], _listener
+        )
+    await hass.async_block_till_done()
+
+    renders = [template._renders for template in (*templates, random_template)]
+    hass.states.async_set("sensor.power", 20)
+    await hass.async_block_till_done()
+
+    assert results[:3] == [[40.0], [40.0], [60.0]]
+    assert results[3] == [20]
+    # The second template reuses the render of the first one
+    assert [
+        template._renders > count
+        for template, count in zip((*templates, random_template), renders, strict=True)
+    ] == [True, False, True, True]
+
+
+async def test_track_template_result_render_sharing_limits(
+    hass: HomeAssistant,
+) -> None:
+    """Test renders are not shared when they may differ and stats are kept."""
+    hass.states.async_set("sensor.power", 10)
+    template_strs = [
+        "{{ states('sensor.power') }} {{ now().year }}",
+        "{{ states('sensor.power') }} {{ area_entities('kitchen') }}",
+        "{{ states('sensor.power') }}",
+    ]
+    templates = [
+        Template(template_str, hass) for template_str in template_strs for _ in range(2)
+    ]
+    infos = [
+        async_track_template_result(
+            hass, [TrackTemplate(template, None)], callback(lambda *args: None)
+        )
+        for template in templates
+    ]
+    await hass.async_block_till_done()
+
+    renders = [template._renders for template in templates]
+    hass.states.async_set("sensor.power", 20)
+    await hass.async_block_till_done()
+
+    assert [
+        template._renders > count
+        for template, count in zip(templates, renders, strict=True)
+    ] == [True, True, True, True, True, False]
+
+    stats = async_get_template_render_stats(hass)
+    # Only the renders after the trackers were set up are counted
+    assert stats["{{ states('sensor.power') }}"].renders == 1
+    assert stats["{{ states('sensor.power') }}"].shared_renders == 1
+    assert stats["{{ states('sensor.power') }}"].render_time > 0
+
+    for info in infos:
+        info.async_remove()
+
+
+@pytest.mark.parametrize(
+    "template_str",
+    [
+        "{% include 'other' %}",
+        "{% import 'macros' as macros with context %}{{ macros.power() }}",
+        "{% from 'macros' import power with context %}{{ power() }}",
+        "{{ utcnow() }}",
+        "{{ 'light.kitchen' | area_name }}",
+        "{{ [1, 2] | random }}",
+    ],
+)
+async def test_template_render_key_not_shared(
+    hass: HomeAssistant, template_str: str
+) -> None:
+    """Test templates whose render does not only depend on the states."""
+    assert Template(template_str, hass).async_render_key({"this": None}) is None
+
+
+async def test_track_template_result_no_sharing_when_replayed(
+    hass: HomeAssistant,
+) -> None:
+    """Test a render replayed after the rate limit is not shared."""
+    template_str = "{{ states | count }}"
+    limited = Template(template_str, hass)
+    unlimited = Template(template_str, hass)
+    limited_results: list[int] = []
+
+    limited_info = async_track_template_result(
+        hass,
+        [TrackTemplate(limited, None, 0.1)],
+        callback(lambda event, updates: limited_results.append(updates[0].result)),
+    )
+    unlimited_info = async_track_template_result(
+        hass, [TrackTemplate(unlimited, None)], callback(lambda *args: None)
+    )
+    await hass.async_block_till_done()
+    hass.states.async_set("sensor.one", "any")
+    await hass.async_block_till_done()
+    hass.states.async_set("sensor.two", "any")
+    await hass.async_block_till_done()
+    renders = limited._renders
+
+    next_time = dt_util.utcnow() + timedelta(seconds=0.125)
+    with patch(
+        "homeassistant.helpers.ratelimit.time.time", return_value=next_time.timestamp()
+    ):
+        async_fire_time_changed(hass, next_time)
+        await hass.async_block_till_done()
+
+    assert limited._renders > renders
+    assert limited_results == [1, 2]
+
+    limited_info.async_remove()
+    unlimited_info.async_remove()
+
+
 async def test_track_template_result_with_group(hass: HomeAssistant) -> None:
     """Test tracking template with a group."""
     hass.states.async_set("sensor.power_1", 0)
@@ -2,10 +2,13 @@
 
 from __future__ import annotations
 
+import base64
 from collections.abc import Iterable
 from datetime import datetime, timedelta
+import hashlib
 import json
 import logging
+import marshal
 import math
 import random
 from types import MappingProxyType
@@ -22,6 +25,7 @@ from homeassistant import config_entries
 from homeassistant.components import group
 from homeassistant.const import (
     ATTR_UNIT_OF_MEASUREMENT,
+    EVENT_HOMEASSISTANT_FINAL_WRITE,
     STATE_ON,
     STATE_UNAVAILABLE,
     UnitOfArea,
@@ -320,6 +324,77 @@ async def test_import(hass: HomeAssistant) -> None:
         ).async_render()
 
 
+def _bytecode_cache_key(source: str) -> str:
+    """Return the bytecode cache key of a template compiled with hass."""
+    return hashlib.sha1(f":{source}".encode(), usedforsecurity=False).hexdigest()
+
+
+async def test_bytecode_cache_saved(
+    hass: HomeAssistant, hass_storage: dict[str, Any]
+) -> None:
+    """Test templates compiled during the run are saved at the final write."""
+    await template.async_load_bytecode_cache(hass)
+    assert template.Template("{{ 'saved' }}", hass).async_render() == "saved"
+
+    hass.bus.async_fire(EVENT_HOMEASSISTANT_FINAL_WRITE)
+    await hass.async_block_till_done()
+
+    data = hass_storage[template.BYTECODE_STORAGE_KEY]["data"]
+    assert data["version"] == template._bytecode_cache_version()
+    assert _bytecode_cache_key("{{ 'saved' }}") in data["code"]
+
+
+async def test_bytecode_cache_loaded(
+    hass: HomeAssistant, hass_storage: dict[str, Any]
+) -> None:
+    """Test templates compiled during the last run are not compiled again."""
+    code = template._NO_HASS_ENV.compile("{{ 'from cache' }}")
+    hass_storage[template.BYTECODE_STORAGE_KEY] = {
+        "version": template.BYTECODE_STORAGE_VERSION,
+        "key": template.BYTECODE_STORAGE_KEY,
+        "data": {
+            "version": template._bytecode_cache_version(),
+            "code": {
+                _bytecode_cache_key(
+                    "{% if true %}compiled{% endif %}"
+                ): base64.b64encode(marshal.dumps(code)).decode()
+            },
+        },
+    }
+    await template.async_load_bytecode_cache(hass)
+
+    # The template is not parsed for its first render
+    with patch.object(
+        template.TemplateEnvironment, "parse", side_effect=AssertionError
+    ):
+        assert (
+            template.Template("{% if true %}compiled{% endif %}", hass).async_render()
+            == "from cache"
+        )
+
+
+async def test_bytecode_cache_other_version(
+    hass: HomeAssistant, hass_storage: dict[str, Any]
+) -> None:
+    """Test templates compiled by another version are discarded."""
+    code = template._NO_HASS_ENV.compile("{{ 'from cache' }}")
+    hass_storage[template.BYTECODE_STORAGE_KEY] = {
+        "version": template.BYTECODE_STORAGE_VERSION,
+        "key": template.BYTECODE_STORAGE_KEY,
+        "data": {
+            "version": "0.0.0",
+            "code": {
+                _bytecode_cache_key("{{ 'recompiled' }}"): base64.b64encode(
+                    marshal.dumps(code)
+                ).decode()
+            },
+        },
+    }
+    await template.async_load_bytecode_cache(hass)
+
+    assert template.Template("{{ 'recompiled' }}", hass).async_render() == "recompiled"
+
+
 async def test_import_change(hass: HomeAssistant) -> None:
     """Test that a change in HassLoader results in updated imports."""
     await template.async_load_custom_templates(hass)
@@ -5607,6 +5682,101 @@ async def test_render_to_info_with_exception(hass: HomeAssistant) -> None:
     assert info.entities == {"test_domain.object"}
 
 
+@pytest.mark.parametrize(
+    "template_str",
+    [
+        "{{ states('sensor.temperature') }}",
+        "{{ states('sensor.missing') }}",
+        "{{ states('sensor.temperature') | float(0) > 20 }}",
+        "{{ states('sensor.temperature') | float(0) <= 20 }}",
+        "{{ 15 < states('sensor.temperature') | int(0) < 25 }}",
+        "{{ states('sensor.missing') | float(0) == 0 }}",
+        "{{ states('sensor.name') | float(0) != 0 }}",
+        "{{ is_state('sensor.name', 'kitchen') }}",
+        "{{ is_state('sensor.name', ['hall', 'kitchen']) }}",
+        "{{ is_state('sensor.missing', 'kitchen') }}",
+        "{{ not is_state('sensor.name', 'hall') and 1 or 2 }}",
+        "{{ state_attr('sensor.temperature', 'unit_of_measurement') }}",
+        "{{ is_state_attr('sensor.temperature', 'unit_of_measurement', '°C') }}",
+        "{{ state_attr('sensor.missing', 'unit_of_measurement') }}",
+        "{{ (states('sensor.temperature') | float(0) + states('sensor.humidity')"
+        " | float(0)) / 2 }}",
+        "{{ (states('sensor.temperature') | float(0) * 9 // 5 - -32) | round(1) }}",
+        "{{ states('sensor.name') | float }}",
+        "{{ 1 / 0 }}",
+    ],
+)
+async def test_fast_render(hass: HomeAssistant, template_str: str) -> None:
+    """Test templates rendered without the sandbox render like Jinja does."""
+    hass.states.async_set("sensor.temperature", "21.5", {"unit_of_measurement": "°C"})
+    hass.states.async_set("sensor.humidity", "60")
+    hass.states.async_set("sensor.name", "kitchen")
+
+    tpl = template.Template(template_str, hass)
+    tpl.async_render_to_info()
+    # The fast render is compiled when the template is rendered again
+    assert tpl._fast_render is None
+    info = tpl.async_render_to_info()
+    assert tpl._fast_render is not None
+
+    with patch(
+        "homeassistant.helpers.template._compile_fast_render", return_value=None
+    ):
+        jinja_tpl = template.Template(template_str, hass)
+        jinja_tpl.async_render_to_info()
+        jinja_info = jinja_tpl.async_render_to_info()
+    assert jinja_tpl._fast_render is None
+
+    if jinja_info.exception:
+        assert type(info.exception.__cause__) is type(jinja_info.exception.__cause__)
+    else:
+        assert info.exception is None
+        assert info.result() == jinja_info.result()
+    assert info.entities == jinja_info.entities
+    assert info.domains == jinja_info.domains
+    assert info.all_states is jinja_info.all_states
+
+
+@pytest.mark.parametrize(
+    "template_str",
+    [
+        "{{ value }}",
+        "{{ states('sensor.' ~ 'name') }}",
+        "{{ states.sensor.name.state }}",
+        "{{ states('sensor.name') | lower }}",
+        "{% if is_state('sensor.name', 'kitchen') %}yes{% endif %}",
+        "The state is {{ states('sensor.name') }}",
+        "{{ 'kitchen' in states('sensor.name') }}",
+        "{{ states('sensor.name', rounded=True) }}",
+    ],
+)
+async def test_fast_render_unsupported(hass: HomeAssistant, template_str: str) -> None:
+    """Test templates of other shapes are rendered by Jinja."""
+    tpl = template.Template(template_str, hass)
+    tpl.async_render({"value": 1})
+    tpl.async_render({"value": 1})
+    assert tpl._fast_render is None
+
+
+async def test_fast_render_shadowed_by_variables(hass: HomeAssistant) -> None:
+    """Test variables shadowing the state functions are respected."""
+    hass.states.async_set("sensor.name", "kitchen")
+    tpl = template.Template("{{ states('sensor.name') }}", hass)
+    assert tpl.async_render() == "kitchen"
+    assert tpl.async_render() == "kitchen"
+    assert tpl._fast_render is not None
+    assert tpl.async_render({"states": {"sensor.name": "hall"}.get}) == "hall"
+
+
+async def test_fast_render_limited(hass: HomeAssistant) -> None:
+    """Test limited templates are rendered by Jinja."""
+    tpl = template.Template("{{ states('sensor.name') }}", hass)
+    for _ in range(2):
+        with pytest.raises(TemplateError):
+            tpl.async_render(limited=True)
+    assert tpl._fast_render is None
+
+
 async def test_lru_increases_with_many_entities(hass: HomeAssistant) -> None:
     """Test that the template internal LRU cache increases with many entities."""
     # We do not actually want to record 4096 entities so we mock the entity count
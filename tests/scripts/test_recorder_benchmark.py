@@ -0,0 +1,74 @@
+"""Test the recorder benchmark script."""
+
+import json
+
+import pytest
+
+from homeassistant.scripts import recorder_benchmark
+
+
+def test_generate_workload() -> None:
+    """Test the synthetic workload is spread over the entities."""
+    items = list(
+        recorder_benchmark.generate_workload(
+            recorder_benchmark.Workload(
+                entities=2,
+                state_changes=4,
+                attribute_churn=1,
+                events_per_state_change=0.5,
+            )
+        )
+    )
+
+    assert [(entity_id, state) for entity_id, state, _ in items] == [
+        ("sensor.benchmark_0", "0"),
+        ("sensor.benchmark_1", "0"),
+        ("recorder_benchmark_event", None),
+        ("sensor.benchmark_0", "1"),
+        ("sensor.benchmark_1", "1"),
+        ("recorder_benchmark_event", None),
+    ]
+    # Every state change and event has new attributes or data
+    assert [data["revision"] for _, _, data in items] == [1, 1, 1, 2, 2, 2]
+
+    items = list(
+        recorder_benchmark.generate_workload(
+            recorder_benchmark.Workload(entities=2, state_changes=4, attribute_churn=0)
+        )
+    )
+    assert len(items) == 4
+    assert {data["revision"] for _, _, data in items} == {0}
+
+
+def test_run_recorder_benchmark(capsys: pytest.CaptureFixture[str]) -> None:
+    """Test the benchmark records the workload to a SQLite database."""
+    assert (
+        recorder_benchmark.run(
+            [
+                "--entities",
+                "10",
+                "--state-changes",
+                "200",
+                "--events-per-state-change",
+                "0.5",
+                "--commit-interval",
+                "1",
+                "--json",
+            ]
+        )
+        == 0
+    )
+
+    report = json.loads(capsys.readouterr().out)
+    assert report["dialect"] == "sqlite"
+    assert report["state_changes"] == 200
+    assert report["events"] == 100
+    assert report["commits"] >= 1
+    assert set(report["commit_latency"]) == {"p50", "p90", "p99", "p100"}
+    assert set(report["cache_hit_rates"]) == {
+        "states_meta",
+        "state_attributes",
+        "event_types",
+        "event_data",
+    }
+    assert report["database_size_after"] > report["database_size_before"]
@@ -1378,6 +1378,14 @@ def test_state_domain() -> None:
     assert state.domain == "some_domain"
 
 
+def test_state_domain_is_shared() -> None:
+    """Test states of the same domain share the domain string."""
+    state1 = ha.State("light.bowl", "on")
+    state2 = ha.State("light.frog", "on")
+    assert state1.domain == "light"
+    assert state1.domain is state2.domain
+
+
 def test_state_object_id() -> None:
     """Test object ID."""
     state = ha.State("domain.hello", "world")